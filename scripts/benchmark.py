@@ -0,0 +1,307 @@
+"""
+Banco de pruebas de rendimiento del paquete algorithms
+Mide tiempo, memoria pico y operaciones sobre familias de grafos con semilla
+
+Uso:
+    python scripts/benchmark.py                       # barrido por defecto
+    python scripts/benchmark.py --tamanos 10 1000 --ks 1 3 --salida bench.json
+    python scripts/benchmark.py --operaciones dijkstra todos_los_pares --backends python numpy
+    python scripts/benchmark.py --operaciones compute_paralelo --tamanos 2000 --ks 2 --workers 1 2 4 8
+
+Cada caso se ejecuta en un proceso nuevo, así la memoria pico (RSS) medida
+corresponde solo a ese caso. El resultado es un JSON comparable entre versiones.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from algorithms import backends
+from algorithms.k_paths import KPaths
+from algorithms.shortest_path import floyd_warshall
+from algorithms.stats import Estadisticas
+from algorithms.utils import (generate_barabasi_albert, generate_erdos_renyi,
+                              generate_grid, generate_random_geometric)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+FAMILIAS = ("aleatorio", "rejilla", "geometrico", "barabasi")
+OPERACIONES = ("dijkstra", "floyd_warshall", "todos_los_pares", "find_k_shortest_paths", "compute",
+               "compute_tensor", "compute_paralelo")
+# compute_paralelo mide la escalabilidad con --workers; es costoso y no entra
+# en el barrido por defecto
+POR_DEFECTO = OPERACIONES[:-1]
+# Operaciones que dependen del backend de caminos mínimos (algorithms.backends)
+CON_BACKEND = ("dijkstra", "todos_los_pares", "compute", "compute_tensor")
+
+# Tamaño máximo por operación: por encima el caso se omite (O(n²) o peor).
+# compute y compute_tensor con k > 1 son O(n³): con k=3 tardan ~1 min en 200
+# nodos y horas en 1000
+LIMITES = {
+    "dijkstra": 100_000,
+    "floyd_warshall": 2_000,
+    "todos_los_pares": 2_000,
+    "find_k_shortest_paths": 100_000,
+    "compute": 200,
+    "compute_tensor": 200,
+    "compute_paralelo": 2_000,
+}
+
+
+def generar_grafo(familia, n, grado, semilla):
+    """
+    Genera un grafo no dirigido reproducible en formato CSR
+
+    Args:
+        familia: "aleatorio" (Erdős–Rényi), "rejilla" (malla 2-D),
+            "geometrico" (tipo carreteras) o "barabasi" (Barabási–Albert)
+        n: Número de nodos (en la rejilla se redondea a un cuadrado)
+        grado: Grado medio aproximado (no aplica a la rejilla)
+        semilla: Semilla del generador
+
+    Returns:
+        CSRGraph
+    """
+    if familia == "aleatorio":
+        return generate_erdos_renyi(n, min(1.0, grado / max(n - 1, 1)), seed=semilla)
+    if familia == "rejilla":
+        lado = max(2, int(round(np.sqrt(n))))
+        return generate_grid(lado, lado, seed=semilla)
+    if familia == "geometrico":
+        return generate_random_geometric(n, avg_degree=grado, seed=semilla)[0]
+    if familia == "barabasi":
+        return generate_barabasi_albert(n, max(1, int(round(grado / 2))), seed=semilla)
+    raise ValueError(f"Familia desconocida: {familia}")
+
+
+def ejecutar_caso(caso):
+    """
+    Ejecuta un caso de benchmark en el proceso actual
+
+    Args:
+        caso: Diccionario con familia, n, grado, k, operacion, metodo,
+            backend (None = elección automática), workers (solo en
+            compute_paralelo) y semilla
+
+    Returns:
+        Diccionario con el caso, el tiempo, la memoria pico y las operaciones
+    """
+    grafo = generar_grafo(caso["familia"], caso["n"], caso["grado"], caso["semilla"])
+    n = grafo.num_nodos
+    origen, destino = elegir_par(grafo, caso["semilla"])
+    operacion = caso["operacion"]
+    operaciones = {}
+    estadisticas = Estadisticas()
+
+    nombre_backend = caso.get("backend")
+    backend = None
+    backend_usado = None
+    if operacion == "dijkstra":
+        backend = backends.elegir(grafo, "distancias", nombre_backend)
+    elif operacion == "todos_los_pares":
+        backend = backends.elegir(grafo, "todos_los_pares", nombre_backend)
+
+    inicio = time.perf_counter()
+    if operacion == "dijkstra":
+        distancias, _ = backend.distancias(grafo, origen, stats=estadisticas)
+        operaciones["alcanzados"] = int(np.isfinite(distancias).sum())
+    elif operacion == "floyd_warshall":
+        dist, _ = floyd_warshall(grafo)
+        operaciones["pares_conectados"] = int(np.isfinite(dist).sum())
+    elif operacion == "todos_los_pares":
+        dist = backend.todos_los_pares(grafo)
+        operaciones["pares_conectados"] = int(np.isfinite(dist).sum())
+    elif operacion == "find_k_shortest_paths":
+        kpaths = KPaths(caso["metodo"], cache=None, estadisticas=estadisticas)
+        kpaths.cargar_grafo(grafo)
+        caminos = kpaths.find_k_shortest_paths(origen, destino, caso["k"])
+        operaciones["caminos"] = len(caminos)
+        operaciones["nodos_en_caminos"] = sum(len(c) for _, c in caminos)
+    elif operacion == "compute":
+        kpaths = KPaths(caso["metodo"], cache=None, estadisticas=estadisticas,
+                        backend=nombre_backend)
+        matriz_k = kpaths.compute(grafo, caso["k"])
+        backend_usado = kpaths.backend_usado
+        operaciones["pares_conectados"] = int(np.isfinite(np.array(matriz_k)).sum())
+    elif operacion == "compute_tensor":
+        # Todos los k de 1 a caso["k"] en una pasada
+        kpaths = KPaths(caso["metodo"], cache=None, estadisticas=estadisticas,
+                        backend=nombre_backend)
+        costos = kpaths.compute_tensor(grafo, caso["k"])
+        backend_usado = kpaths.backend_usado
+        operaciones["pares_conectados"] = int(np.isfinite(costos[:, :, -1]).sum())
+    elif operacion == "compute_paralelo":
+        # Filas con Yen repartidas entre caso["workers"] procesos (1 = secuencial)
+        kpaths = KPaths(caso["metodo"], cache=None, estadisticas=estadisticas)
+        matriz_k = kpaths.compute(grafo, caso["k"], workers=caso["workers"])
+        operaciones["pares_conectados"] = int(np.isfinite(np.array(matriz_k)).sum())
+    tiempo = time.perf_counter() - inicio
+    if backend is not None:
+        backend_usado = backend.nombre
+    contadores = estadisticas.como_dict()
+    tiempos_fase = contadores.pop("tiempos")
+    operaciones.update((nombre, valor) for nombre, valor in contadores.items() if valor)
+
+    resultado = dict(caso)
+    resultado.update({
+        "n": n,
+        "aristas": grafo.num_aristas,
+        "origen": origen,
+        "destino": destino,
+        "backend_usado": backend_usado,
+        "tiempo_s": tiempo,
+        "tiempos_fase": tiempos_fase,
+        "rss_pico_kb": rss_pico_kb(),
+        "operaciones": operaciones,
+    })
+    return resultado
+
+
+def elegir_par(grafo, semilla):
+    """
+    Elige un par (origen, destino) reproducible y conectado: el origen entre
+    los nodos con aristas y el destino entre los alcanzables desde él
+    """
+    rng = np.random.default_rng(semilla + 1)
+    con_aristas = np.flatnonzero(np.diff(grafo.offsets))
+    if len(con_aristas) == 0:
+        return 0, 0
+    origen = int(rng.choice(con_aristas))
+    kpaths = KPaths(cache=None)
+    kpaths.cargar_grafo(grafo)
+    alcanzables = sorted(set(kpaths.arbol_minimo(origen)[0]) - {origen})
+    return origen, int(rng.choice(alcanzables))
+
+
+def rss_pico_kb():
+    """Memoria residente pico del proceso en KB (None si no se puede medir)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta bytes, Linux kilobytes
+    return pico // 1024 if sys.platform == "darwin" else pico
+
+
+def version_codigo():
+    """Commit actual del repositorio, si está disponible"""
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        return salida.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def generar_casos(args):
+    """Produce los casos del barrido (omitiendo los que superan LIMITES)"""
+    for familia in args.familias:
+        for n in args.tamanos:
+            for grado in args.grados:
+                for operacion in args.operaciones:
+                    if n > LIMITES[operacion]:
+                        continue
+                    ks = args.ks if operacion in ("find_k_shortest_paths", "compute",
+                                                  "compute_tensor", "compute_paralelo") else [1]
+                    if operacion == "compute_paralelo":
+                        # Con k=1 y un proceso compute usa el backend de todos
+                        # los pares: los tiempos no serían comparables
+                        ks = [k for k in ks if k > 1]
+                    for k in ks:
+                        usa_backend = operacion in CON_BACKEND and (
+                            operacion not in ("compute", "compute_tensor") or k == 1)
+                        for backend in args.backends if usa_backend else ["auto"]:
+                            for workers in (args.workers if operacion == "compute_paralelo"
+                                            else [None]):
+                                yield {
+                                    "familia": familia,
+                                    "n": n,
+                                    "grado": grado,
+                                    "k": k,
+                                    "operacion": operacion,
+                                    "metodo": args.metodo,
+                                    "backend": None if backend == "auto" else backend,
+                                    "workers": workers,
+                                    "semilla": args.semilla,
+                                }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del paquete algorithms")
+    parser.add_argument("--familias", nargs="+", default=list(FAMILIAS), choices=FAMILIAS)
+    parser.add_argument("--tamanos", nargs="+", type=int,
+                        default=[10, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--grados", nargs="+", type=float, default=[3.0, 8.0],
+                        help="Grado medio de los grafos (densidad)")
+    parser.add_argument("--ks", nargs="+", type=int, default=[1, 3, 10])
+    parser.add_argument("--operaciones", nargs="+", default=list(POR_DEFECTO),
+                        choices=OPERACIONES)
+    parser.add_argument("--metodo", default="yen", help="Motor de KPaths")
+    parser.add_argument("--backends", nargs="+", default=["auto"],
+                        choices=["auto"] + backends.disponibles(),
+                        help="Backends de caminos mínimos a comparar (auto = elección automática)")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4],
+                        help="Procesos a comparar en compute_paralelo")
+    parser.add_argument("--semilla", type=int, default=2024)
+    parser.add_argument("--timeout", type=float, default=600,
+                        help="Segundos máximos por caso")
+    parser.add_argument("--salida", help="Archivo JSON de salida (por defecto stdout)")
+    parser.add_argument("--caso", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.caso:
+        # Proceso hijo: ejecutar un único caso e imprimir su resultado
+        print(json.dumps(ejecutar_caso(json.loads(args.caso))))
+        return
+
+    resultados = []
+    for caso in generar_casos(args):
+        etiqueta = (f"{caso['operacion']} {caso['familia']} n={caso['n']} grado={caso['grado']} "
+                    f"k={caso['k']} backend={caso['backend'] or 'auto'}")
+        if caso["workers"] is not None:
+            etiqueta += f" workers={caso['workers']}"
+        print(f"→ {etiqueta}", file=sys.stderr)
+        try:
+            proceso = subprocess.run([sys.executable, __file__, "--caso", json.dumps(caso)],
+                                     capture_output=True, text=True, timeout=args.timeout)
+        except subprocess.TimeoutExpired:
+            resultados.append(dict(caso, error="timeout"))
+            continue
+        if proceso.returncode != 0:
+            lineas = proceso.stderr.strip().splitlines()
+            resultados.append(dict(caso, error=lineas[-1] if lineas else "error"))
+            continue
+        resultados.append(json.loads(proceso.stdout))
+
+    reporte = {
+        "version": version_codigo(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "semilla": args.semilla,
+        "resultados": resultados,
+    }
+    texto = json.dumps(reporte, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+        print(f"\n✓ Resultados guardados en {args.salida}", file=sys.stderr)
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
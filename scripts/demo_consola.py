@@ -38,13 +38,14 @@ def demo_basica():
     print(" CÁLCULO DE MATRICES K-CAMINOS ".center(70))
     print("="*70)
     
+    # Las tres matrices salen de una sola pasada: tensor (n, n, 3)
+    tensor = kpaths.compute(matriz, [1, 2, 3])
     for k in [1, 2, 3]:
         print(f"\n{'─'*70}")
         print(f" K = {k} ".center(70, '─'))
         print(f"{'─'*70}")
         
-        matriz_k = kpaths.compute(matriz, k)
-        print_matrix(matriz_k, f"Matriz de {k}-Caminos")
+        print_matrix(tensor[:, :, k - 1], f"Matriz de {k}-Caminos")
         
     # Buscar caminos específicos
     print("\n" + "="*70)
@@ -108,19 +109,23 @@ def demo_comparacion():
     
     kpaths = KPaths()
     
+    # Una sola pasada calcula k = 1, 2 y 3 para todos los pares, con sus caminos
+    costos, caminos = kpaths.compute_tensor(matriz, 3, caminos=True)
+    
     origen, destino = 0, 5
     print(f"\nAnálisis de caminos de Nodo {origen} a Nodo {destino}:")
     print("="*70 + "\n")
     
     for k in [1, 2, 3]:
         print(f"K = {k}:")
-        caminos = kpaths.find_k_shortest_paths(origen, destino, k)
+        camino = [int(n) for n in caminos[origen, destino, k - 1] if n >= 0]
+        anterior = [int(n) for n in caminos[origen, destino, k - 2] if n >= 0] if k > 1 else None
         
-        if len(caminos) >= k:
-            costo, camino = caminos[k-1]
+        # Con menos de k caminos el tensor repite el último
+        if camino and camino != anterior:
             camino_str = " → ".join([f"N{n}" for n in camino])
             print(f"  {k}° camino más corto: {camino_str}")
-            print(f"  Costo: {costo}")
+            print(f"  Costo: {costos[origen, destino, k - 1]:g}")
         else:
             print(f"  No existe un {k}° camino")
         print()
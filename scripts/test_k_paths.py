@@ -3,14 +3,65 @@ Script de prueba para verificar el funcionamiento del algoritmo K-Paths
 Prueba la implementación modular con diferentes casos de grafos
 """
 
+import io
+import json
+import random
+import subprocess
 import sys
 import os
+import tempfile
 
 # Agregar el directorio src al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import numpy as np
+
+from algorithms import backends
+from algorithms.alt import IndiceALT
+from algorithms.contraction import JerarquiaContraccion
+from algorithms.csr import as_csr
+from algorithms.graph_io import csv_to_csr, load_csr, save_csr
 from algorithms.k_paths import KPaths
-from algorithms.utils import print_matrix
+from algorithms.shortest_path import bidirectional_dijkstra, dijkstra
+from algorithms.stats import Estadisticas
+from algorithms.utils import (generate_barabasi_albert, generate_erdos_renyi, generate_grid,
+                              generate_random_geometric, generate_random_matrix, print_matrix)
+
+
+# Grafo dirigido de referencia: 3 → 1 existe pero 1 → 3 no
+MATRIZ_DIRIGIDA = [
+    [0, 4, 2, 0, 0],
+    [4, 0, 1, 0, 0],
+    [2, 1, 0, 8, 11],
+    [0, 5, 8, 0, 2],
+    [0, 0, 10, 2, 0]
+]
+
+
+def costos_por_par(grafo, k, metodo="yen"):
+    """
+    Matriz del k-ésimo costo calculada par a par con find_k_shortest_paths,
+    sin árboles compartidos ni caché: la referencia de los demás modos
+    """
+    kpaths = KPaths(metodo, cache=None)
+    kpaths.cargar_grafo(grafo)
+    n = kpaths.num_nodos
+    matriz_k = [[float("inf")] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                caminos = kpaths.find_k_shortest_paths(i, j, k)
+                if caminos:
+                    matriz_k[i][j] = caminos[min(k, len(caminos)) - 1][0]
+    return matriz_k
+
+
+def ejecutar_cli(*argumentos, entrada=None):
+    """Ejecuta src/cli.py en un proceso aparte y retorna (código, stdout, stderr)"""
+    cli = os.path.join(os.path.dirname(__file__), '..', 'src', 'cli.py')
+    proceso = subprocess.run([sys.executable, cli, *argumentos], input=entrada,
+                             capture_output=True, text=True, timeout=60)
+    return proceso.returncode, proceso.stdout, proceso.stderr
 
 
 def test_caso_1():
@@ -143,6 +194,634 @@ def test_caso_4():
     print("\n✓ Test Caso 4 completado")
 
 
+def test_caso_5():
+    """Test de actualización incremental tras cambiar pesos de aristas"""
+    print("\n" + "="*70)
+    print(" TEST CASO 5: Actualización Incremental ".center(70))
+    print("="*70 + "\n")
+    
+    matriz = [
+        [0, 4, 2, 0, 0],
+        [4, 0, 1, 5, 0],
+        [2, 1, 0, 8, 10],
+        [0, 5, 8, 0, 2],
+        [0, 0, 10, 2, 0]
+    ]
+    
+    kpaths = KPaths()
+    kpaths.compute(matriz, 2, incremental=True)
+    
+    # Encarecer 1-3, eliminar 2-4 y agregar 0-3
+    cambios = [(1, 3, 9), (2, 4, 0), (0, 3, 3)]
+    matriz_k = kpaths.actualizar_aristas(cambios)
+    print_matrix(matriz_k, "Matriz K=2 (incremental)")
+    
+    for u, v, peso in cambios:
+        matriz[u][v] = peso
+        matriz[v][u] = peso
+    esperada = KPaths().compute(matriz, 2)
+    assert matriz_k == esperada, "La actualización incremental no coincide"
+    
+    print("\n✓ Test Caso 5 completado")
+
+
+def test_caso_6():
+    """Test de consultas por lotes agrupadas por origen"""
+    print("\n" + "="*70)
+    print(" TEST CASO 6: Consultas por Lotes ".center(70))
+    print("="*70 + "\n")
+    
+    matriz = [
+        [0, 4, 2, 0, 0],
+        [4, 0, 1, 5, 0],
+        [2, 1, 0, 8, 10],
+        [0, 5, 8, 0, 2],
+        [0, 0, 10, 2, 0]
+    ]
+    
+    consultas = [(0, 4, 3), (3, 1, 1), (0, 3, 2), (0, 4, 1), (2, 2, 1)]
+    kpaths = KPaths(cache=None)
+    kpaths.cargar_grafo(matriz)
+    resultados = kpaths.consultar_lote(consultas)
+    
+    referencia = KPaths(cache=None)
+    referencia.cargar_grafo(matriz)
+    for (origen, destino, k), caminos in zip(consultas, resultados):
+        print(f"  {origen} → {destino} (k={k}): {caminos}")
+        esperados = referencia.find_k_shortest_paths(origen, destino, k)
+        assert [c for c, _ in caminos] == [c for c, _ in esperados], "El lote no coincide"
+    
+    por_bloques = [r for bloque in kpaths.consultar_lote(consultas, bloque=2) for r in bloque]
+    assert por_bloques == resultados, "Los bloques no coinciden con el lote completo"
+    
+    print("\n✓ Test Caso 6 completado")
+
+
+def test_caso_7():
+    """Test de backends de caminos mínimos: todos deben coincidir"""
+    print("\n" + "="*70)
+    print(" TEST CASO 7: Backends de Caminos Mínimos ".center(70))
+    print("="*70 + "\n")
+    
+    # Grafo dirigido: 3 → 1 existe pero 1 → 3 no
+    matriz = [
+        [0, 4, 2, 0, 0],
+        [4, 0, 1, 0, 0],
+        [2, 1, 0, 8, 11],
+        [0, 5, 8, 0, 2],
+        [0, 0, 10, 2, 0]
+    ]
+    
+    esperada = KPaths(cache=None, backend="python").compute(matriz, k=1)
+    for nombre in backends.disponibles():
+        backend = backends.obtener(nombre)
+        print(f"  {nombre}: par 0 → 4 = {backend.par(matriz, 0, 4)}")
+        assert backend.par(matriz, 0, 4) == (12, [0, 2, 3, 4]), f"Par incorrecto en {nombre}"
+        assert list(backend.distancias(matriz, 1)[0]) == [3, 0, 1, 9, 11]
+        assert KPaths(cache=None, backend=nombre).compute(matriz, k=1) == esperada
+    
+    print(f"  Automático (todos los pares): {backends.elegir(matriz, 'todos_los_pares').nombre}")
+    try:
+        backends.obtener("inexistente")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Un backend desconocido debe fallar")
+    
+    print("\n✓ Test Caso 7 completado")
+
+
+def test_caso_8():
+    """Test del tensor de varios k calculado en una sola pasada"""
+    print("\n" + "="*70)
+    print(" TEST CASO 8: Tensor de K-Caminos ".center(70))
+    print("="*70 + "\n")
+    
+    matriz = [
+        [0, 4, 2, 0, 0],
+        [4, 0, 1, 5, 0],
+        [2, 1, 0, 8, 10],
+        [0, 5, 8, 0, 2],
+        [0, 0, 10, 2, 0]
+    ]
+    
+    costos, caminos = KPaths(cache=None).compute_tensor(matriz, 3, caminos=True)
+    print(f"  Forma: {costos.shape} {costos.dtype}, caminos: {caminos.shape} {caminos.dtype}")
+    assert costos.shape == (5, 5, 3) and costos.dtype == np.float32
+    assert caminos.dtype == np.int32
+    
+    for k in [1, 2, 3]:
+        esperada = KPaths(cache=None).compute(matriz, k)
+        assert costos[:, :, k - 1].tolist() == esperada, f"La capa k={k} no coincide"
+    
+    referencia = KPaths(cache=None)
+    referencia.cargar_grafo(matriz)
+    for k, (costo, camino) in enumerate(referencia.find_k_shortest_paths(0, 4, 3), 1):
+        print(f"  0 → 4 (k={k}): {caminos[0, 4, k - 1].tolist()}")
+        assert [int(n) for n in caminos[0, 4, k - 1] if n >= 0] == camino
+        assert costos[0, 4, k - 1] == costo
+    
+    # Una secuencia de k selecciona capas del mismo cálculo
+    assert np.array_equal(KPaths(cache=None).compute(matriz, [3, 1]), costos[:, :, [0, 2]])
+    
+    print("\n✓ Test Caso 8 completado")
+
+
+def test_caso_9():
+    """Test de compute con un árbol por origen frente a la búsqueda par a par"""
+    print("\n" + "="*70)
+    print(" TEST CASO 9: Compute frente a Yen Par a Par ".center(70))
+    print("="*70 + "\n")
+    
+    grafos = {
+        "no dirigido": generate_erdos_renyi(14, 0.3, seed=3),
+        "dirigido": MATRIZ_DIRIGIDA,
+    }
+    for nombre, grafo in grafos.items():
+        for k in [2, 3]:
+            esperada = costos_por_par(grafo, k)
+            assert KPaths(cache=None).compute(grafo, k) == esperada, \
+                f"compute no coincide con Yen par a par ({nombre}, k={k})"
+            print(f"  {nombre}, k={k}: coincide")
+    
+    print("\n✓ Test Caso 9 completado")
+
+
+def test_caso_10():
+    """Test del cálculo en paralelo: debe coincidir con el secuencial"""
+    print("\n" + "="*70)
+    print(" TEST CASO 10: Cálculo en Paralelo ".center(70))
+    print("="*70 + "\n")
+    
+    grafos = {
+        "no dirigido": generate_erdos_renyi(14, 0.3, seed=3),
+        "dirigido": MATRIZ_DIRIGIDA,
+    }
+    for nombre, grafo in grafos.items():
+        esperada = costos_por_par(grafo, 2)
+        assert KPaths(cache=None).compute(grafo, 2, workers=2) == esperada, \
+            f"El cálculo en paralelo no coincide ({nombre})"
+        print(f"  {nombre}, workers=2: coincide")
+    
+    print("\n✓ Test Caso 10 completado")
+
+
+def test_caso_11():
+    """Test del motor "lazy" (árbol inverso perezoso): debe coincidir con "yen" """
+    print("\n" + "="*70)
+    print(" TEST CASO 11: Motor Lazy frente a Yen ".center(70))
+    print("="*70 + "\n")
+    
+    grafos = {
+        "no dirigido": generate_erdos_renyi(14, 0.3, seed=3),
+        "dirigido": MATRIZ_DIRIGIDA,
+    }
+    for nombre, grafo in grafos.items():
+        for k in [2, 4]:
+            esperada = costos_por_par(grafo, k)
+            assert costos_por_par(grafo, k, metodo="lazy") == esperada, \
+                f"find_k_shortest_paths con lazy no coincide ({nombre}, k={k})"
+            assert KPaths("lazy", cache=None).compute(grafo, k) == esperada, \
+                f"compute con lazy no coincide ({nombre}, k={k})"
+            print(f"  {nombre}, k={k}: coincide")
+    
+    print("\n✓ Test Caso 11 completado")
+
+
+def test_caso_12():
+    """Test de la caché de resultados: aciertos e invalidación al cambiar el grafo"""
+    print("\n" + "="*70)
+    print(" TEST CASO 12: Caché de Resultados ".center(70))
+    print("="*70 + "\n")
+    
+    matriz = [
+        [0, 4, 2, 0, 0],
+        [4, 0, 1, 5, 0],
+        [2, 1, 0, 8, 10],
+        [0, 5, 8, 0, 2],
+        [0, 0, 10, 2, 0]
+    ]
+    modificada = [fila[:] for fila in matriz]
+    modificada[2][4] = modificada[4][2] = 3
+    
+    kpaths = KPaths()
+    primera = kpaths.compute(matriz, 2)
+    aciertos = kpaths.cache.aciertos
+    assert kpaths.compute(matriz, 2) == primera
+    assert kpaths.cache.aciertos == aciertos + 1, "La consulta repetida debe salir de la caché"
+    
+    # Otra huella: la entrada anterior no debe reutilizarse
+    nueva = kpaths.compute(modificada, 2)
+    assert nueva == costos_por_par(modificada, 2), "La caché devolvió un resultado obsoleto"
+    assert nueva != primera
+    print(f"  compute: {kpaths.cache.estadisticas()}")
+    
+    kpaths.cargar_grafo(matriz)
+    caminos = kpaths.find_k_shortest_paths(0, 4, 3)
+    aciertos = kpaths.cache.aciertos
+    assert kpaths.find_k_shortest_paths(0, 4, 2) == caminos[:2]
+    assert kpaths.cache.aciertos == aciertos + 1, "Un k menor debe salir de la caché"
+    
+    kpaths.cargar_grafo(modificada)
+    referencia = KPaths(cache=None)
+    referencia.cargar_grafo(modificada)
+    assert kpaths.find_k_shortest_paths(0, 4, 3) == referencia.find_k_shortest_paths(0, 4, 3), \
+        "La caché devolvió caminos del grafo anterior"
+    print(f"  find_k_shortest_paths: {kpaths.cache.estadisticas()}")
+    
+    print("\n✓ Test Caso 12 completado")
+
+
+def test_caso_13():
+    """Test del generador iter_shortest_paths frente a find_k_shortest_paths"""
+    print("\n" + "="*70)
+    print(" TEST CASO 13: Generador de Caminos ".center(70))
+    print("="*70 + "\n")
+    
+    grafo = generate_erdos_renyi(14, 0.3, seed=3)
+    kpaths = KPaths(cache=None)
+    kpaths.cargar_grafo(grafo)
+    for origen, destino in [(0, 5), (3, 11), (13, 1)]:
+        esperados = kpaths.find_k_shortest_paths(origen, destino, 6)
+        generador = kpaths.iter_shortest_paths(origen, destino)
+        obtenidos = [next(generador) for _ in range(len(esperados))]
+        print(f"  {origen} → {destino}: {[c for c, _ in obtenidos]}")
+        assert obtenidos == esperados, f"El generador no coincide en {origen} → {destino}"
+    
+    # Sin camino el generador termina sin producir nada
+    kpaths.cargar_grafo([[0, 1], [0, 0]])
+    assert list(kpaths.iter_shortest_paths(1, 0)) == []
+    
+    print("\n✓ Test Caso 13 completado")
+
+
+def test_caso_14():
+    """Test de Dijkstra bidireccional y de Dijkstra con destino frente al completo"""
+    print("\n" + "="*70)
+    print(" TEST CASO 14: Dijkstra Bidireccional y con Destino ".center(70))
+    print("="*70 + "\n")
+    
+    grafos = {
+        "no dirigido": as_csr(generate_erdos_renyi(14, 0.3, seed=3)),
+        # Con un nodo aislado para cubrir los pares sin camino
+        "dirigido": as_csr([fila + [0] for fila in MATRIZ_DIRIGIDA] + [[0] * 6]),
+    }
+    for nombre, grafo in grafos.items():
+        n = grafo.num_nodos
+        for origen in range(n):
+            completas, _ = dijkstra(grafo, origen)
+            for destino in range(n):
+                distancia, camino = bidirectional_dijkstra(grafo, origen, destino)
+                assert distancia == completas[destino], \
+                    f"Bidireccional incorrecto en {origen} → {destino} ({nombre})"
+                if camino is None:
+                    assert distancia == float("inf")
+                else:
+                    assert camino[0] == origen and camino[-1] == destino
+                    assert sum(grafo.peso(u, v) for u, v in zip(camino, camino[1:])) == distancia
+                
+                # Con destino solo quedan distancias exactas o infinitas
+                parciales, predecesores = dijkstra(grafo, origen, target=destino)
+                assert parciales[destino] == completas[destino]
+                for v in range(n):
+                    assert parciales[v] in (completas[v], float("inf")), \
+                        f"Distancia provisional en {v} al parar en {destino} ({nombre})"
+                    if parciales[v] == float("inf"):
+                        assert predecesores[v] == -1
+        print(f"  {nombre}: {n * n} pares coinciden")
+    
+    print("\n✓ Test Caso 14 completado")
+
+
+def test_caso_15():
+    """Test del índice ALT: mismos caminos que Yen y guardado/carga"""
+    print("\n" + "="*70)
+    print(" TEST CASO 15: Índice ALT ".center(70))
+    print("="*70 + "\n")
+    
+    grafo = generate_erdos_renyi(14, 0.3, seed=3)
+    referencia = KPaths(cache=None)
+    referencia.cargar_grafo(grafo)
+    kpaths = KPaths(cache=None)
+    kpaths.cargar_grafo(grafo)
+    indice = kpaths.preparar_alt(num_landmarks=4, semilla=1)
+    
+    pares = [(0, 5), (3, 11), (13, 1), (7, 2)]
+    for origen, destino in pares:
+        assert indice.cota(origen, destino) <= dijkstra(grafo, origen)[0][destino], \
+            f"La cota ALT supera la distancia en {origen} → {destino}"
+        assert kpaths.find_k_shortest_paths(origen, destino, 4) == \
+            referencia.find_k_shortest_paths(origen, destino, 4), \
+            f"ALT no coincide con Yen en {origen} → {destino}"
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        # Sin extensión: cargar debe leer exactamente el archivo escrito
+        ruta = os.path.join(directorio, "indice")
+        indice.guardar(ruta)
+        cargado = IndiceALT.cargar(ruta, grafo)
+        print(f"  Guardado en {os.listdir(directorio)}, {len(cargado)} landmarks")
+        try:
+            IndiceALT.cargar(ruta, MATRIZ_DIRIGIDA)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Un índice de otro grafo debe rechazarse")
+    
+    assert np.array_equal(cargado.landmarks, indice.landmarks)
+    assert np.array_equal(cargado.desde, indice.desde)
+    assert np.array_equal(cargado.hacia, indice.hacia)
+    otro = KPaths(cache=None)
+    otro.cargar_grafo(grafo)
+    otro.usar_alt(cargado)
+    for origen, destino in pares:
+        assert otro.find_k_shortest_paths(origen, destino, 4) == \
+            referencia.find_k_shortest_paths(origen, destino, 4), \
+            f"El índice cargado no coincide con Yen en {origen} → {destino}"
+    
+    print("\n✓ Test Caso 15 completado")
+
+
+def test_caso_16():
+    """Test de la jerarquía de contracción: distancias, caminos y guardado/carga"""
+    print("\n" + "="*70)
+    print(" TEST CASO 16: Jerarquía de Contracción ".center(70))
+    print("="*70 + "\n")
+    
+    grafos = {
+        "no dirigido": generate_erdos_renyi(14, 0.3, seed=3),
+        "dirigido": [fila + [0] for fila in MATRIZ_DIRIGIDA] + [[0] * 6],
+    }
+    for nombre, grafo in grafos.items():
+        referencia = KPaths(cache=None)
+        referencia.cargar_grafo(grafo)
+        kpaths = KPaths(cache=None)
+        kpaths.cargar_grafo(grafo)
+        jerarquia = kpaths.preparar_contraccion()
+        n = kpaths.num_nodos
+        for origen in range(n):
+            completas, _ = dijkstra(grafo, origen)
+            for destino in range(n):
+                distancia, camino = jerarquia.consulta(origen, destino)
+                assert distancia == completas[destino], \
+                    f"CH incorrecta en {origen} → {destino} ({nombre})"
+                if camino is not None:
+                    assert camino[0] == origen and camino[-1] == destino
+                # Entre caminos de igual costo el orden puede diferir: se comparan costos
+                caminos = kpaths.find_k_shortest_paths(origen, destino, 3)
+                esperados = referencia.find_k_shortest_paths(origen, destino, 3)
+                assert [c for c, _ in caminos] == [c for c, _ in esperados], \
+                    f"Los caminos con CH no coinciden con Yen en {origen} → {destino} ({nombre})"
+                for costo, camino in caminos:
+                    assert sum(kpaths.grafo.peso(u, v)
+                               for u, v in zip(camino, camino[1:])) == costo
+        print(f"  {nombre}: {n * n} pares coinciden")
+        
+        with tempfile.TemporaryDirectory() as directorio:
+            # Sin extensión: cargar debe leer exactamente el archivo escrito
+            ruta = os.path.join(directorio, "grafo.ch")
+            jerarquia.guardar(ruta)
+            cargada = JerarquiaContraccion.cargar(ruta, grafo)
+        assert np.array_equal(cargada.rango, jerarquia.rango)
+        for origen in range(n):
+            for destino in range(n):
+                assert cargada.consulta(origen, destino) == jerarquia.consulta(origen, destino), \
+                    f"La jerarquía cargada no coincide en {origen} → {destino} ({nombre})"
+    
+    print("\n✓ Test Caso 16 completado")
+
+
+def test_caso_17():
+    """Test del formato binario CSR: guardado, carga con mmap y lista de aristas"""
+    print("\n" + "="*70)
+    print(" TEST CASO 17: Formato Binario CSR ".center(70))
+    print("="*70 + "\n")
+    
+    grafo = generate_erdos_renyi(14, 0.3, seed=3)
+    esperada = costos_por_par(grafo, 2)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "grafo.csr")
+        save_csr(grafo, ruta)
+        for mmap in [True, False]:
+            cargado = load_csr(ruta, mmap=mmap)
+            print(f"  mmap={mmap}: {cargado.num_nodos} nodos, {cargado.num_aristas} aristas")
+            assert np.array_equal(cargado.offsets, grafo.offsets)
+            assert np.array_equal(cargado.targets, grafo.targets)
+            assert np.array_equal(cargado.weights, grafo.weights)
+            assert cargado.huella() == grafo.huella()
+            assert KPaths(cache=None).compute(cargado, 2) == esperada, \
+                f"Los k caminos del grafo cargado no coinciden (mmap={mmap})"
+            del cargado
+        
+        otro = os.path.join(directorio, "otro.csr")
+        with open(otro, "wb") as archivo:
+            archivo.write(b"no es un grafo")
+        try:
+            load_csr(otro)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Un archivo que no es CSR debe rechazarse")
+    
+    # La lista de aristas da el mismo grafo que la matriz
+    aristas = io.StringIO("origen,destino,peso\n" + "".join(
+        f"{u},{v},{peso}\n" for u, fila in enumerate(MATRIZ_DIRIGIDA)
+        for v, peso in enumerate(fila) if peso))
+    assert csv_to_csr(aristas).huella() == as_csr(MATRIZ_DIRIGIDA).huella()
+    
+    print("\n✓ Test Caso 17 completado")
+
+
+def test_caso_18():
+    """Test de cambios en un solo sentido sobre un grafo dirigido de pesos simétricos"""
+    print("\n" + "="*70)
+    print(" TEST CASO 18: Actualización Incremental Dirigida ".center(70))
+    print("="*70 + "\n")
+    
+    matriz = [
+        [0, 4, 2, 0, 0],
+        [4, 0, 1, 5, 0],
+        [2, 1, 0, 8, 10],
+        [0, 5, 8, 0, 2],
+        [0, 0, 10, 2, 0]
+    ]
+    
+    kpaths = KPaths()
+    kpaths.compute(matriz, 2, incremental=True)
+    
+    # Encarecer 1 → 3 y eliminar 2 → 4 sin tocar 3 → 1 ni 4 → 2
+    lotes = [[(1, 3, 9), (2, 4, 0)], [(0, 3, 3)]]
+    for cambios in lotes:
+        matriz_k = kpaths.actualizar_aristas(cambios, no_dirigido=False)
+        for u, v, peso in cambios:
+            matriz[u][v] = peso
+        print_matrix(matriz_k, f"Matriz K=2 tras {cambios}")
+        assert matriz_k == KPaths(cache=None).compute(matriz, 2), \
+            f"La actualización dirigida no coincide tras {cambios}"
+    assert kpaths.grafo.peso(3, 1) == 5 and kpaths.grafo.peso(4, 2) == 10, \
+        "Un cambio en un solo sentido no debe copiarse al sentido contrario"
+    
+    print("\n✓ Test Caso 18 completado")
+
+
+def test_caso_19():
+    """Test de las estadísticas: contadores, tiempos por fase y callback"""
+    print("\n" + "="*70)
+    print(" TEST CASO 19: Estadísticas de Ejecución ".center(70))
+    print("="*70 + "\n")
+    
+    matriz = [
+        [0, 1, 4],
+        [1, 0, 2],
+        [4, 2, 0]
+    ]
+    
+    eventos = []
+    est = Estadisticas(callback=lambda evento, datos: eventos.append((evento, datos)))
+    kpaths = KPaths(estadisticas=est)
+    kpaths.cargar_grafo(matriz)
+    caminos = kpaths.find_k_shortest_paths(0, 2, 3)
+    print(f"  {caminos}\n  {est}")
+    assert caminos == [(3, [0, 1, 2]), (4, [0, 2])]
+    
+    # Una búsqueda bidireccional para el primer camino y tres spur
+    assert est.busquedas == 4 and est.busquedas_spur == 3
+    assert est.candidatos == 1 and est.candidatos_duplicados == 0
+    busquedas = [datos["tipo"] for evento, datos in eventos if evento == "busqueda"]
+    assert busquedas == ["bidireccional", "spur", "spur", "spur"]
+    assert sum(datos["nodos_fijados"] for evento, datos in eventos
+               if evento == "busqueda") == est.nodos_fijados
+    fases = {datos["nombre"] for evento, datos in eventos if evento == "fase"}
+    assert fases == {"primer_camino", "spur"} == set(est.tiempos)
+    
+    # Un acierto de la caché no hace ninguna búsqueda
+    contadores = est.como_dict()
+    numero_eventos = len(eventos)
+    assert kpaths.find_k_shortest_paths(0, 2, 2) == caminos
+    assert est.como_dict() == contadores and len(eventos) == numero_eventos
+    
+    # Dos búsquedas spur que llegan al mismo candidato: se cuenta como duplicado
+    est = Estadisticas()
+    kpaths = KPaths(cache=None, estadisticas=est)
+    kpaths.cargar_grafo([
+        [0, 1, 0, 5],
+        [1, 0, 1, 3],
+        [0, 1, 0, 1],
+        [5, 3, 1, 0]
+    ])
+    assert len(kpaths.find_k_shortest_paths(0, 3, 4)) == 3
+    assert est.candidatos == 3 and est.candidatos_duplicados == 1
+    
+    # Fases de compute
+    est.reiniciar()
+    KPaths(cache=None, estadisticas=est).compute(matriz, 2)
+    print(f"  Fases de compute: {sorted(est.tiempos)}")
+    assert {"carga", "filas", "salida"} <= set(est.tiempos)
+    
+    print("\n✓ Test Caso 19 completado")
+
+
+def test_caso_20():
+    """Test de los generadores de grafos: forma, conexidad y reproducibilidad"""
+    print("\n" + "="*70)
+    print(" TEST CASO 20: Generadores de Grafos ".center(70))
+    print("="*70 + "\n")
+    
+    generadores = {
+        "erdos_renyi": lambda semilla: generate_erdos_renyi(2000, 0.005, seed=semilla),
+        "erdos_renyi_conexo": lambda semilla: generate_erdos_renyi(300, 0.002, seed=semilla,
+                                                                   connected=True),
+        "rejilla": lambda semilla: generate_grid(7, 9, seed=semilla),
+        "geometrico": lambda semilla: generate_random_geometric(2000, avg_degree=6.0,
+                                                                seed=semilla)[0],
+        "geometrico_conexo": lambda semilla: generate_random_geometric(
+            300, avg_degree=2.0, seed=semilla, connected=True)[0],
+        "barabasi": lambda semilla: generate_barabasi_albert(500, 3, seed=semilla),
+    }
+    for nombre, generar in generadores.items():
+        grafo = generar(7)
+        n = grafo.num_nodos
+        aristas = grafo.num_aristas // 2
+        print(f"  {nombre}: {n} nodos, {aristas} aristas")
+        assert grafo.es_simetrico(), f"{nombre} no es simétrico"
+        filas = np.repeat(np.arange(n), np.diff(grafo.offsets))
+        assert not np.any(filas == grafo.targets), f"{nombre} tiene lazos"
+        assert generar(7).huella() == grafo.huella(), f"{nombre} no es reproducible"
+        assert generar(8).huella() != grafo.huella()
+        if nombre.endswith("conexo") or nombre in ("rejilla", "barabasi"):
+            alcanzados = np.isfinite(dijkstra(grafo, 0)[0]).sum()
+            assert alcanzados == n, f"{nombre} no es conexo"
+    
+    # Número de aristas esperado
+    assert generadores["rejilla"](7).num_aristas // 2 == 2 * 7 * 9 - 7 - 9
+    esperadas = 0.005 * 2000 * 1999 / 2
+    assert abs(generadores["erdos_renyi"](7).num_aristas / 2 - esperadas) < 0.05 * esperadas
+    grado_medio = generadores["geometrico"](7).num_aristas / 2000
+    assert 0.8 * 6.0 < grado_medio <= 6.0, "Grado medio geométrico fuera de rango"
+    # Cada nodo nuevo aporta 3 aristas (menos las repetidas, que se funden)
+    assert 0.9 * 3 * 497 <= generadores["barabasi"](7).num_aristas // 2 <= 3 * 497
+    
+    # Sin semilla generate_random_matrix sigue usando el módulo random
+    random.seed(3)
+    primera = generate_random_matrix(12)
+    random.seed(3)
+    assert generate_random_matrix(12) == primera
+    assert generate_random_matrix(12, seed=5) == generate_random_matrix(12, seed=5)
+    
+    print("\n✓ Test Caso 20 completado")
+
+
+def test_caso_21():
+    """Test de la línea de comandos: salida JSON y códigos de salida"""
+    print("\n" + "="*70)
+    print(" TEST CASO 21: Línea de Comandos ".center(70))
+    print("="*70 + "\n")
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "grafo.json")
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(MATRIZ_DIRIGIDA, archivo)
+        referencia = KPaths(cache=None)
+        referencia.cargar_grafo(MATRIZ_DIRIGIDA)
+        
+        codigo, salida, _ = ejecutar_cli("compute", ruta, "-k", "2")
+        assert codigo == 0
+        datos = json.loads(salida)
+        esperada = costos_por_par(MATRIZ_DIRIGIDA, 2)
+        assert datos["k"] == 2
+        assert datos["matriz"] == [[None if c == float("inf") else c for c in fila]
+                                   for fila in esperada]
+        print(f"  compute: {datos['matriz'][0]}")
+        
+        codigo, salida, _ = ejecutar_cli("par", ruta, "0", "4", "-k", "3")
+        assert codigo == 0
+        datos = json.loads(salida)
+        assert [(c["costo"], c["camino"]) for c in datos["caminos"]] == \
+            referencia.find_k_shortest_paths(0, 4, 3)
+        print(f"  par: {datos['caminos']}")
+        
+        codigo, salida, _ = ejecutar_cli("lote", ruta, entrada="origen,destino,k\n0,4,2\n1,3\n")
+        assert codigo == 0
+        lineas = [json.loads(linea) for linea in salida.splitlines()]
+        assert [(consulta["origen"], consulta["destino"], consulta["k"])
+                for consulta in lineas] == [(0, 4, 2), (1, 3, 1)]
+        assert [(c["costo"], c["camino"]) for c in lineas[0]["caminos"]] == \
+            referencia.find_k_shortest_paths(0, 4, 2)
+        print(f"  lote: {len(lineas)} consultas")
+        
+        # Nodos fuera de rango: error claro y código 1, sin salida parcial
+        for argumentos, entrada in [(("par", ruta, "-1", "3"), None),
+                                    (("par", ruta, "0", "5"), None),
+                                    (("lote", ruta), "0,4\n7,1\n")]:
+            codigo, salida, error = ejecutar_cli(*argumentos, entrada=entrada)
+            print(f"  {argumentos[0]} {entrada or argumentos[2:]!r}: {error.strip()}")
+            assert codigo == 1 and salida == "" and "fuera de rango" in error
+        
+        codigo, _, error = ejecutar_cli("par", os.path.join(directorio, "no_existe.json"), "0", "1")
+        assert codigo == 1 and error.startswith("error:")
+    
+    print("\n✓ Test Caso 21 completado")
+
+
 def ejecutar_todos_los_tests():
     """Ejecuta todos los tests"""
     print("\n" + "="*70)
@@ -155,6 +834,23 @@ def ejecutar_todos_los_tests():
         test_caso_2()
         test_caso_3()
         test_caso_4()
+        test_caso_5()
+        test_caso_6()
+        test_caso_7()
+        test_caso_8()
+        test_caso_9()
+        test_caso_10()
+        test_caso_11()
+        test_caso_12()
+        test_caso_13()
+        test_caso_14()
+        test_caso_15()
+        test_caso_16()
+        test_caso_17()
+        test_caso_18()
+        test_caso_19()
+        test_caso_20()
+        test_caso_21()
         
         print("\n" + "="*70)
         print(" ✓ TODOS LOS TESTS COMPLETADOS EXITOSAMENTE ".center(70))
@@ -0,0 +1,147 @@
+"""
+Índice ALT (A*, landmarks y desigualdad triangular)
+
+Se eligen unos pocos nodos de referencia (landmarks) y se guardan las
+distancias desde y hacia cada uno. Por la desigualdad triangular, para
+cualquier par (v, t) y landmark L:
+
+    d(v, t) >= d(v, L) - d(t, L)        d(v, t) >= d(L, t) - d(L, v)
+
+El máximo de estas cotas es un potencial consistente para A*. Prohibir
+aristas o nodos solo alarga los caminos, así que las cotas siguen siendo
+válidas en las búsquedas spur de Yen.
+"""
+
+import numpy as np
+
+from .csr import as_csr
+from .shortest_path import dijkstra
+
+# Error relativo máximo al redondear a float32
+_EPS32 = float(np.finfo(np.float32).eps)
+
+
+class IndiceALT:
+    """Distancias a landmarks para calcular cotas inferiores de d(v, t)"""
+
+    def __init__(self, landmarks, desde, hacia, huella, exacto):
+        """
+        Args:
+            landmarks: Nodos de referencia
+            desde: Matriz L x n (float32) con d(landmark, v)
+            hacia: Matriz L x n (float32) con d(v, landmark)
+            huella: Huella del grafo con el que se construyó
+            exacto: Si las distancias son enteros representables sin error
+                en float32 (si no, las cotas se reducen con un margen)
+        """
+        self.landmarks = np.asarray(landmarks, dtype=np.int64)
+        self.desde = np.asarray(desde, dtype=np.float32)
+        self.hacia = np.asarray(hacia, dtype=np.float32)
+        self.huella = huella
+        self.exacto = bool(exacto)
+
+    @classmethod
+    def construir(cls, grafo, num_landmarks=8, semilla=None):
+        """
+        Preprocesa el grafo eligiendo landmarks por el criterio del más
+        lejano: el primero al azar y cada siguiente el nodo más alejado de
+        los ya elegidos (los nodos inalcanzables se eligen primero, así cada
+        componente recibe al menos uno). Cuesta 2·L búsquedas de Dijkstra.
+
+        Args:
+            grafo: CSRGraph o matriz de adyacencia
+            num_landmarks: Número de landmarks (L)
+            semilla: Semilla para elegir el primer landmark
+
+        Returns:
+            IndiceALT
+        """
+        grafo = as_csr(grafo)
+        n = grafo.num_nodos
+        transpuesto = grafo.transpuesto()
+        num_landmarks = max(1, min(num_landmarks, n))
+        rng = np.random.default_rng(semilla)
+
+        landmarks = []
+        desde = np.empty((num_landmarks, n))
+        hacia = np.empty((num_landmarks, n))
+        cercania = np.full(n, np.inf)  # distancia al landmark más cercano
+        siguiente = int(rng.integers(n))
+        for l in range(num_landmarks):
+            landmarks.append(siguiente)
+            desde[l] = dijkstra(grafo, siguiente)[0]
+            hacia[l] = dijkstra(transpuesto, siguiente)[0]
+            np.minimum(cercania, desde[l] + hacia[l], out=cercania)
+            cercania[landmarks] = -1
+            siguiente = int(np.argmax(cercania))
+
+        finitas = np.concatenate([desde[np.isfinite(desde)], hacia[np.isfinite(hacia)]])
+        exacto = (grafo.weights.dtype.kind in "iu"
+                  and (len(finitas) == 0 or finitas.max() < 2 ** 24))
+        return cls(landmarks, desde, hacia, grafo.huella(), exacto)
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def potencial(self, destino):
+        """
+        Cota inferior de d(v, destino) para todos los nodos v
+
+        Returns:
+            Lista de n valores; infinito si v no puede llegar a destino
+        """
+        desde = self.desde.astype(np.float64)
+        hacia = self.hacia.astype(np.float64)
+        cotas = np.maximum(self._cotas(hacia, hacia[:, destino:destino + 1]),
+                           self._cotas(desde[:, destino:destino + 1], desde))
+        with np.errstate(invalid="ignore"):
+            cota = np.fmax.reduce(cotas, axis=0)
+        cota = np.nan_to_num(cota, nan=0.0, posinf=np.inf)
+        return np.maximum(cota, 0.0).tolist()
+
+    def cota(self, origen, destino):
+        """Cota inferior de d(origen, destino)"""
+        return self.potencial(destino)[origen]
+
+    def _cotas(self, mayor, menor):
+        """
+        Diferencias mayor - menor por landmark, reducidas con el margen de
+        redondeo de float32 si hace falta. inf - inf (landmark inalcanzable
+        para ambos nodos) no aporta información y queda como NaN.
+        """
+        with np.errstate(invalid="ignore"):
+            diferencia = mayor - menor
+            if not self.exacto:
+                margen = _EPS32 * (np.abs(mayor) + np.abs(menor))
+                diferencia = np.where(np.isfinite(diferencia),
+                                      diferencia - margen, diferencia)
+        return diferencia
+
+    def guardar(self, ruta):
+        """
+        Guarda el índice en formato .npz junto al grafo. Se escribe en `ruta`
+        tal cual (np.savez con un nombre añadiría ".npz" si falta y cargar
+        no encontraría el archivo con la misma ruta).
+        """
+        with open(ruta, "wb") as archivo:
+            np.savez(archivo, landmarks=self.landmarks, desde=self.desde, hacia=self.hacia,
+                     huella=np.array(self.huella), exacto=np.array(self.exacto))
+
+    @classmethod
+    def cargar(cls, ruta, grafo=None):
+        """
+        Carga un índice guardado con guardar()
+
+        Args:
+            ruta: Archivo .npz
+            grafo: Si se indica, se comprueba que sea el grafo del índice
+
+        Returns:
+            IndiceALT
+        """
+        with np.load(ruta) as datos:
+            indice = cls(datos["landmarks"], datos["desde"], datos["hacia"],
+                         str(datos["huella"]), bool(datos["exacto"]))
+        if grafo is not None and as_csr(grafo).huella() != indice.huella:
+            raise ValueError("El índice ALT no corresponde a este grafo")
+        return indice
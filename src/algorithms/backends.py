@@ -0,0 +1,249 @@
+"""
+Registro de implementaciones (backends) de caminos mínimos
+
+Cada backend ofrece las mismas cuatro operaciones sobre un CSRGraph:
+
+    distancias(grafo, origen, stats=None)    -> (dist, pred) arreglos de n elementos
+    par(grafo, origen, destino, stats=None)  -> (distancia, camino o None)
+    todos_los_pares(grafo)                   -> matriz (n, n) de distancias
+    k_caminos(grafo, origen, destino, k)     -> [(costo, camino), ...]
+
+`stats` (Estadisticas) solo lo usa el backend python; los demás lo ignoran.
+
+Backends incluidos:
+    "python"  Dijkstra con heapq sobre listas (el mejor en grafos dispersos)
+    "numpy"   Dijkstra denso con argmin vectorizado y Floyd-Warshall
+              vectorizado (el mejor en grafos densos)
+    "scipy"   scipy.sparse.csgraph, si SciPy está instalado (código C)
+
+elegir() escoge el backend según la operación, el tamaño y la densidad del
+grafo. Se puede forzar uno por llamada (parámetro `nombre`), para todo el
+proceso (usar()) o con la variable de entorno KPATHS_BACKEND. registrar()
+añade implementaciones propias.
+"""
+
+import os
+
+import numpy as np
+
+from .csr import as_csr
+from .shortest_path import bidirectional_dijkstra, dijkstra, floyd_warshall
+
+OPERACIONES = ("distancias", "par", "todos_los_pares", "k_caminos")
+
+# Grado medio a partir del cual el Dijkstra denso de NumPy supera al de heapq
+GRADO_NUMPY = 64
+# Floyd-Warshall vectorizado supera a n Dijkstras hasta este tamaño, o en
+# grafos de al menos esta densidad (m / n²); es O(n³), así que por encima de
+# MAX_NODOS_FLOYD solo se usa si se pide
+NODOS_FLOYD = 500
+DENSIDAD_FLOYD = 0.05
+MAX_NODOS_FLOYD = 1_500
+# Por debajo de este tamaño la conversión a SciPy cuesta más de lo que ahorra
+MIN_NODOS_SCIPY = 64
+
+
+def _camino(pred, origen, destino):
+    """Reconstruye el camino origen -> destino desde un arreglo de predecesores"""
+    camino = [destino]
+    while camino[-1] != origen:
+        anterior = int(pred[camino[-1]])
+        if anterior < 0:
+            return None
+        camino.append(anterior)
+    camino.reverse()
+    return camino
+
+
+class BackendPython:
+    """Dijkstra con heapq sobre las listas del CSR"""
+
+    nombre = "python"
+
+    @staticmethod
+    def disponible():
+        return True
+
+    def distancias(self, grafo, origen, stats=None):
+        dist, pred = dijkstra(grafo, origen, stats=stats)
+        return np.asarray(dist, dtype=np.float64), np.asarray(pred, dtype=np.int64)
+
+    def par(self, grafo, origen, destino, stats=None):
+        return bidirectional_dijkstra(grafo, origen, destino, stats=stats)
+
+    def todos_los_pares(self, grafo):
+        grafo = as_csr(grafo)
+        return np.array([dijkstra(grafo, origen)[0] for origen in range(grafo.num_nodos)],
+                        dtype=np.float64).reshape(grafo.num_nodos, grafo.num_nodos)
+
+    def k_caminos(self, grafo, origen, destino, k):
+        from .k_paths import KPaths
+        kpaths = KPaths(cache=None)
+        kpaths.cargar_grafo(grafo)
+        return kpaths.find_k_shortest_paths(origen, destino, k)
+
+
+class BackendNumpy(BackendPython):
+    """
+    Dijkstra denso: en cada paso se fija el nodo abierto más cercano con un
+    argmin sobre un arreglo de n distancias y se relajan sus aristas de una
+    vez. Cuesta O(n²) en operaciones vectorizadas, sin importar m, así que
+    gana en grafos densos. Todos los pares usa Floyd-Warshall vectorizado.
+    Los k caminos se calculan con KPaths (como en el backend python).
+    """
+
+    nombre = "numpy"
+
+    def _dijkstra(self, grafo, origen, destino=None):
+        grafo = as_csr(grafo)
+        offsets, targets, weights = grafo.offsets, grafo.targets, grafo.weights
+        n = grafo.num_nodos
+        dist = np.full(n, np.inf)
+        pred = np.full(n, -1, dtype=np.int64)
+        abiertos = np.full(n, np.inf)  # distancia de los nodos aún no fijados
+        dist[origen] = abiertos[origen] = 0
+        for _ in range(n):
+            u = int(np.argmin(abiertos))
+            actual = abiertos[u]
+            if actual == np.inf or u == destino:
+                break
+            abiertos[u] = np.inf
+            vecinos = targets[offsets[u]:offsets[u + 1]]
+            nuevas = actual + weights[offsets[u]:offsets[u + 1]]
+            # Con pesos positivos un nodo ya fijado nunca mejora
+            mejora = nuevas < dist[vecinos]
+            vecinos, nuevas = vecinos[mejora], nuevas[mejora]
+            dist[vecinos] = abiertos[vecinos] = nuevas
+            pred[vecinos] = u
+        return dist, pred
+
+    def distancias(self, grafo, origen, stats=None):
+        return self._dijkstra(grafo, origen)
+
+    def par(self, grafo, origen, destino, stats=None):
+        dist, pred = self._dijkstra(grafo, origen, destino)
+        if dist[destino] == np.inf:
+            return float("inf"), None
+        return dist[destino].item(), _camino(pred, origen, destino)
+
+    def todos_los_pares(self, grafo):
+        return floyd_warshall(grafo)[0]
+
+
+class BackendScipy(BackendPython):
+    """scipy.sparse.csgraph (Dijkstra y Johnson en C); k caminos con KPaths"""
+
+    nombre = "scipy"
+
+    @staticmethod
+    def disponible():
+        try:
+            import scipy.sparse.csgraph  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def _matriz(grafo):
+        from scipy.sparse import csr_matrix
+        grafo = as_csr(grafo)
+        n = grafo.num_nodos
+        return csr_matrix((grafo.weights, grafo.targets, grafo.offsets), shape=(n, n))
+
+    def distancias(self, grafo, origen, stats=None):
+        from scipy.sparse.csgraph import dijkstra as dijkstra_scipy
+        dist, pred = dijkstra_scipy(self._matriz(grafo), indices=origen,
+                                    return_predecessors=True)
+        return dist, np.where(pred < 0, -1, pred).astype(np.int64)
+
+    def par(self, grafo, origen, destino, stats=None):
+        dist, pred = self.distancias(grafo, origen)
+        if dist[destino] == np.inf:
+            return float("inf"), None
+        return dist[destino].item(), _camino(pred, origen, destino)
+
+    def todos_los_pares(self, grafo):
+        from scipy.sparse.csgraph import shortest_path
+        return shortest_path(self._matriz(grafo), method="auto")
+
+
+_BACKENDS = {}
+_preferido = None
+
+
+def registrar(backend):
+    """
+    Añade (o reemplaza) un backend en el registro
+
+    Args:
+        backend: Objeto con atributo `nombre`, método disponible() y las
+            operaciones de OPERACIONES
+    """
+    _BACKENDS[backend.nombre] = backend
+
+
+def disponibles():
+    """Nombres de los backends registrados que pueden usarse en este entorno"""
+    return [nombre for nombre, backend in _BACKENDS.items() if backend.disponible()]
+
+
+def obtener(nombre):
+    """
+    Backend por nombre
+
+    Raises:
+        ValueError: Si no está registrado o le falta una dependencia
+    """
+    backend = _BACKENDS.get(nombre)
+    if backend is None:
+        raise ValueError(f"Backend desconocido: {nombre!r} (registrados: {sorted(_BACKENDS)})")
+    if not backend.disponible():
+        raise ValueError(f"El backend {nombre!r} no está disponible (¿falta instalar SciPy?)")
+    return backend
+
+
+def usar(nombre):
+    """Fija el backend de todo el proceso; None vuelve a la elección automática"""
+    global _preferido
+    if nombre is not None:
+        obtener(nombre)  # valida el nombre
+    _preferido = nombre
+
+
+def elegir(grafo, operacion, nombre=None):
+    """
+    Backend para una operación sobre un grafo
+
+    Orden de prioridad: `nombre`, el fijado con usar(), la variable de
+    entorno KPATHS_BACKEND y, si no hay ninguno, la elección automática.
+
+    Args:
+        grafo: CSRGraph o matriz de adyacencia
+        operacion: Una de OPERACIONES
+        nombre: Backend a usar en esta llamada (None = automático)
+    """
+    if operacion not in OPERACIONES:
+        raise ValueError(f"Operación desconocida: {operacion!r}")
+    nombre = nombre or _preferido or os.environ.get("KPATHS_BACKEND") or None
+    if nombre is not None:
+        return obtener(nombre)
+
+    grafo = as_csr(grafo)
+    n = grafo.num_nodos
+    m = grafo.num_aristas
+    if operacion == "k_caminos":
+        # Yen depende de las máscaras de KPaths: ningún backend lo acelera
+        return _BACKENDS["python"]
+    if n >= MIN_NODOS_SCIPY and "scipy" in _BACKENDS and _BACKENDS["scipy"].disponible():
+        return _BACKENDS["scipy"]
+    if operacion == "todos_los_pares":
+        floyd = n <= NODOS_FLOYD or (n <= MAX_NODOS_FLOYD and m >= DENSIDAD_FLOYD * n * n)
+        return _BACKENDS["numpy" if floyd else "python"]
+    if operacion == "distancias" and m >= GRADO_NUMPY * n:
+        return _BACKENDS["numpy"]
+    # Un solo par: el Dijkstra bidireccional suele visitar una fracción del grafo
+    return _BACKENDS["python"]
+
+
+for _backend in (BackendPython(), BackendNumpy(), BackendScipy()):
+    registrar(_backend)
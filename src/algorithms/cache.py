@@ -0,0 +1,86 @@
+"""
+Caché LRU acotada para resultados de consultas sobre grafos
+"""
+
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """Caché con expulsión del elemento menos usado recientemente"""
+
+    def __init__(self, max_entradas=256, max_tamano=1_000_000):
+        """
+        Args:
+            max_entradas: Número máximo de resultados guardados
+            max_tamano: Suma máxima de los tamaños declarados al guardar
+                (p. ej. número de celdas o de nodos en caminos)
+        """
+        self.max_entradas = max_entradas
+        self.max_tamano = max_tamano
+        self.tamano = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self._datos = OrderedDict()
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __contains__(self, clave):
+        """Indica si la clave está guardada (sin contar acierto ni fallo)"""
+        return clave in self._datos
+
+    def claves(self):
+        """Lista de las claves guardadas, de la menos a la más usada recientemente"""
+        return list(self._datos)
+
+    def obtener(self, clave):
+        """
+        Busca un resultado y lo marca como usado recientemente
+
+        Returns:
+            El valor guardado o None si no está
+        """
+        entrada = self._datos.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[0]
+
+    def guardar(self, clave, valor, tamano=1):
+        """
+        Guarda un resultado, expulsando los menos usados si se superan los
+        límites. Un valor más grande que max_tamano no se guarda.
+        """
+        if tamano > self.max_tamano:
+            return
+        anterior = self._datos.pop(clave, None)
+        if anterior is not None:
+            self.tamano -= anterior[1]
+        self._datos[clave] = (valor, tamano)
+        self.tamano += tamano
+
+        while len(self._datos) > self.max_entradas or self.tamano > self.max_tamano:
+            _, (_, tamano_expulsado) = self._datos.popitem(last=False)
+            self.tamano -= tamano_expulsado
+            self.expulsiones += 1
+
+    def limpiar(self):
+        """Vacía la caché (las estadísticas se conservan)"""
+        self._datos.clear()
+        self.tamano = 0
+
+    def estadisticas(self):
+        """
+        Returns:
+            Diccionario con aciertos, fallos, expulsiones, entradas y tamaño
+        """
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "expulsiones": self.expulsiones,
+            "entradas": len(self._datos),
+            "tamano": self.tamano,
+        }
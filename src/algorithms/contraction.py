@@ -0,0 +1,311 @@
+"""
+Jerarquías de contracción (Contraction Hierarchies) para consultas punto a punto
+
+Preprocesamiento: los nodos se contraen uno a uno en orden de importancia.
+Al contraer v, cada par de vecinos (u, x) cuyo camino mínimo pasa por v
+recibe un atajo u -> x con el costo de u -> v -> x, salvo que una búsqueda
+local encuentre un camino testigo igual de corto que no use v. El orden de
+contracción es el rango de cada nodo.
+
+Consulta: Dijkstra bidireccional en el que cada lado solo sube de rango
+(hacia adelante desde el origen, hacia atrás desde el destino). Ambas
+búsquedas exploran una fracción mínima del grafo. Los atajos del camino
+se desempaquetan recursivamente hasta las aristas originales.
+"""
+
+import heapq
+
+import numpy as np
+
+from .csr import _como_pesos, as_csr
+
+
+class JerarquiaContraccion:
+    """Índice de jerarquías de contracción de un grafo estático"""
+
+    def __init__(self, rango, arriba, abajo, huella):
+        """
+        Args:
+            rango: Orden de contracción de cada nodo
+            arriba: Tupla CSR (offsets, destinos, pesos, medios) de las
+                aristas u -> x con rango[x] > rango[u]
+            abajo: Tupla CSR (offsets, origenes, pesos, medios) con, para
+                cada v, las aristas u -> v con rango[u] > rango[v]
+            huella: Huella del grafo con el que se construyó
+        En ambos casos medios[i] es el nodo contraído que reemplaza el atajo,
+        o -1 si la arista es original.
+        """
+        self.rango = np.asarray(rango, dtype=np.int64)
+        self.arriba = _como_arreglos(arriba)
+        self.abajo = _como_arreglos(abajo)
+        self.huella = huella
+        self.num_nodos = len(self.rango)
+        self._listas = None
+        self._medios = None
+
+    @classmethod
+    def construir(cls, grafo, limite_testigos=64):
+        """
+        Contrae todos los nodos del grafo
+
+        El orden se elige con una cola de prioridad perezosa por diferencia
+        de aristas (atajos agregados menos aristas eliminadas) más el número
+        de vecinos ya contraídos, que reparte la contracción por el grafo.
+
+        Args:
+            grafo: CSRGraph o matriz de adyacencia
+            limite_testigos: Nodos máximos que fija cada búsqueda de testigos.
+                Si se alcanza sin encontrar testigo se agrega el atajo (más
+                atajos de los necesarios, nunca resultados incorrectos)
+
+        Returns:
+            JerarquiaContraccion
+        """
+        grafo = as_csr(grafo)
+        n = grafo.num_nodos
+        offsets, targets, weights = grafo.listas()
+        salientes = [{} for _ in range(n)]
+        entrantes = [{} for _ in range(n)]
+        for u in range(n):
+            for idx in range(offsets[u], offsets[u + 1]):
+                if weights[idx] > 0:
+                    salientes[u][targets[idx]] = weights[idx]
+                    entrantes[targets[idx]][u] = weights[idx]
+
+        def prioridad(v, atajos):
+            return (len(atajos) - len(salientes[v]) - len(entrantes[v])
+                    + contraidos[v])
+
+        contraidos = [0] * n  # vecinos ya contraídos de cada nodo
+        cola = []
+        for v in range(n):
+            atajos = _buscar_atajos(v, salientes, entrantes, limite_testigos)
+            cola.append((prioridad(v, atajos), v))
+        heapq.heapify(cola)
+
+        rango = [0] * n
+        medios = {}  # (u, x) -> nodo contraído por el que pasa el atajo
+        arriba = [[] for _ in range(n)]
+        abajo = [[] for _ in range(n)]
+        siguiente = 0
+        while cola:
+            _, v = heapq.heappop(cola)
+            # La prioridad guardada puede estar desactualizada: recalcularla
+            atajos = _buscar_atajos(v, salientes, entrantes, limite_testigos)
+            actual = prioridad(v, atajos)
+            if cola and actual > cola[0][0]:
+                heapq.heappush(cola, (actual, v))
+                continue
+
+            rango[v] = siguiente
+            siguiente += 1
+            for x, peso in salientes[v].items():
+                arriba[v].append((x, peso, medios.get((v, x), -1)))
+                del entrantes[x][v]
+                contraidos[x] += 1
+            for u, peso in entrantes[v].items():
+                abajo[v].append((u, peso, medios.get((u, v), -1)))
+                del salientes[u][v]
+                contraidos[u] += 1
+            salientes[v] = {}
+            entrantes[v] = {}
+
+            for u, x, peso in atajos:
+                if peso < salientes[u].get(x, np.inf):
+                    salientes[u][x] = peso
+                    entrantes[x][u] = peso
+                    medios[(u, x)] = v
+
+        return cls(rango, _a_csr(arriba), _a_csr(abajo), grafo.huella())
+
+    def listas(self):
+        """Arreglos de ambos sentidos como listas de Python (se cachean)"""
+        if self._listas is None:
+            self._listas = tuple(tuple(arreglo.tolist() for arreglo in lado)
+                                 for lado in (self.arriba, self.abajo))
+        return self._listas
+
+    def distancia(self, origen, destino):
+        """Distancia mínima de origen a destino (inf si no hay camino)"""
+        return self._buscar(origen, destino)[0]
+
+    def consulta(self, origen, destino):
+        """
+        Camino mínimo de origen a destino
+
+        Returns:
+            distancia: Distancia mínima (inf si no hay camino)
+            camino: Lista [origen, ..., destino] con aristas originales, como
+                la de reconstruir_camino, o None si no existe
+        """
+        mejor, encuentro, padres = self._buscar(origen, destino)
+        if encuentro is None:
+            return mejor, None
+
+        subida = []
+        nodo = encuentro
+        while nodo is not None:
+            subida.append(nodo)
+            nodo = padres[0][nodo]
+        subida.reverse()
+        bajada = [encuentro]
+        nodo = padres[1][encuentro]
+        while nodo is not None:
+            bajada.append(nodo)
+            nodo = padres[1][nodo]
+
+        camino = [origen]
+        tramo = subida + bajada[1:]
+        for a, b in zip(tramo, tramo[1:]):
+            self._desempaquetar(a, b, camino)
+        return mejor, camino
+
+    def _buscar(self, origen, destino):
+        """
+        Búsqueda bidireccional hacia arriba en la jerarquía
+
+        Returns:
+            mejor: Distancia mínima
+            encuentro: Nodo de mayor rango del camino (None si no hay camino)
+            padres: Predecesores de la búsqueda hacia adelante y sucesores
+                de la búsqueda hacia atrás
+        """
+        lados = self.listas()
+        distancias = ({origen: 0}, {destino: 0})
+        padres = ({origen: None}, {destino: None})
+        colas = ([(0, origen)], [(0, destino)])
+        mejor, encuentro = np.inf, None
+
+        while colas[0] or colas[1]:
+            if colas[0] and (not colas[1] or colas[0][0][0] <= colas[1][0][0]):
+                lado = 0
+            else:
+                lado = 1
+            dist, u = heapq.heappop(colas[lado])
+            propias, otras = distancias[lado], distancias[1 - lado]
+            if dist > propias[u]:
+                continue
+            if dist >= mejor:
+                # Ningún nodo pendiente de este lado puede mejorar el camino
+                colas[lado].clear()
+                continue
+            if u in otras and dist + otras[u] < mejor:
+                mejor, encuentro = dist + otras[u], u
+
+            offsets, vecinos, pesos, _ = lados[lado]
+            for idx in range(offsets[u], offsets[u + 1]):
+                v = vecinos[idx]
+                nueva_dist = dist + pesos[idx]
+                if nueva_dist < propias.get(v, np.inf):
+                    propias[v] = nueva_dist
+                    padres[lado][v] = u
+                    heapq.heappush(colas[lado], (nueva_dist, v))
+
+        return mejor, encuentro, padres
+
+    def _desempaquetar(self, a, b, camino):
+        """Agrega a camino los nodos de la arista a -> b sin atajos (sin a)"""
+        if self._medios is None:
+            self._medios = {}
+            for lado, sentido in zip(self.listas(), (True, False)):
+                offsets, vecinos, _, medios = lado
+                for u in range(self.num_nodos):
+                    for idx in range(offsets[u], offsets[u + 1]):
+                        if medios[idx] >= 0:
+                            clave = (u, vecinos[idx]) if sentido else (vecinos[idx], u)
+                            self._medios[clave] = medios[idx]
+
+        pila = [(a, b)]
+        while pila:
+            x, y = pila.pop()
+            medio = self._medios.get((x, y), -1)
+            if medio < 0:
+                camino.append(y)
+            else:
+                pila.append((medio, y))
+                pila.append((x, medio))
+
+    def guardar(self, ruta):
+        """
+        Guarda el índice en formato .npz junto al grafo, en `ruta` tal cual
+        (como IndiceALT.guardar)
+        """
+        arreglos = {"rango": self.rango, "huella": np.array(self.huella)}
+        for nombre, lado in (("arriba", self.arriba), ("abajo", self.abajo)):
+            for campo, arreglo in zip(("offsets", "vecinos", "pesos", "medios"), lado):
+                arreglos[f"{nombre}_{campo}"] = arreglo
+        with open(ruta, "wb") as archivo:
+            np.savez(archivo, **arreglos)
+
+    @classmethod
+    def cargar(cls, ruta, grafo=None):
+        """
+        Carga un índice guardado con guardar()
+
+        Args:
+            ruta: Archivo .npz
+            grafo: Si se indica, se comprueba que sea el grafo del índice
+
+        Returns:
+            JerarquiaContraccion
+        """
+        with np.load(ruta) as datos:
+            lados = [tuple(datos[f"{nombre}_{campo}"]
+                           for campo in ("offsets", "vecinos", "pesos", "medios"))
+                     for nombre in ("arriba", "abajo")]
+            indice = cls(datos["rango"], lados[0], lados[1], str(datos["huella"]))
+        if grafo is not None and as_csr(grafo).huella() != indice.huella:
+            raise ValueError("La jerarquía de contracción no corresponde a este grafo")
+        return indice
+
+
+def _buscar_atajos(v, salientes, entrantes, limite_testigos):
+    """
+    Atajos necesarios al contraer v
+
+    Returns:
+        Lista de (u, x, peso) para cada par de vecinos sin camino testigo
+    """
+    salida = salientes[v]
+    atajos = []
+    if not salida:
+        return atajos
+    max_salida = max(salida.values())
+
+    for u, peso_uv in entrantes[v].items():
+        # Dijkstra local desde u sin pasar por v, acotado en costo y nodos
+        limite = peso_uv + max_salida
+        distancias = {u: 0}
+        cola = [(0, u)]
+        fijados = 0
+        while cola and fijados < limite_testigos:
+            dist, a = heapq.heappop(cola)
+            if dist > distancias[a]:
+                continue
+            fijados += 1
+            for b, peso in salientes[a].items():
+                nueva_dist = dist + peso
+                if b != v and nueva_dist <= limite and nueva_dist < distancias.get(b, np.inf):
+                    distancias[b] = nueva_dist
+                    heapq.heappush(cola, (nueva_dist, b))
+
+        for x, peso_vx in salida.items():
+            if x != u and distancias.get(x, np.inf) > peso_uv + peso_vx:
+                atajos.append((u, x, peso_uv + peso_vx))
+    return atajos
+
+
+def _a_csr(listas):
+    """Convierte listas de (vecino, peso, medio) por nodo en arreglos CSR"""
+    offsets = np.zeros(len(listas) + 1, dtype=np.int64)
+    np.cumsum([len(aristas) for aristas in listas], out=offsets[1:])
+    aristas = [arista for lista in listas for arista in lista]
+    vecinos, pesos, medios = zip(*aristas) if aristas else ((), (), ())
+    return offsets, vecinos, pesos, medios
+
+
+def _como_arreglos(lado):
+    """Normaliza una tupla (offsets, vecinos, pesos, medios) a NumPy"""
+    offsets, vecinos, pesos, medios = lado
+    return (np.asarray(offsets, dtype=np.int64), np.asarray(vecinos, dtype=np.int32),
+            _como_pesos(pesos), np.asarray(medios, dtype=np.int32))
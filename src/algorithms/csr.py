@@ -0,0 +1,293 @@
+"""
+Representación dispersa (CSR) de grafos ponderados
+
+Un grafo CSR guarda, para cada nodo, el rango de sus aristas salientes dentro
+de dos arreglos contiguos (destinos y pesos). Recorrer los vecinos de un nodo
+cuesta O(grado) en lugar de O(n) como en la matriz de adyacencia.
+"""
+
+import hashlib
+from bisect import bisect_left
+
+import numpy as np
+
+
+class CSRGraph:
+    """Grafo dirigido ponderado en formato Compressed Sparse Row"""
+
+    def __init__(self, offsets, targets, weights):
+        """
+        Args:
+            offsets: Arreglo de n + 1 enteros; las aristas del nodo u ocupan
+                las posiciones offsets[u]:offsets[u + 1]
+            targets: Nodo destino de cada arista (ordenados dentro de cada fila)
+            weights: Peso de cada arista (se conserva el tipo entero o real)
+        """
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.weights = _como_pesos(weights)
+        self.num_nodos = len(self.offsets) - 1
+        self._listas = None
+        self._transpuesto = None
+        self._huella = None
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Construye el grafo a partir de una matriz de adyacencia densa
+
+        Args:
+            matrix: Matriz de adyacencia (0 = sin conexión)
+
+        Returns:
+            CSRGraph equivalente
+        """
+        dense = _como_pesos(matrix)
+        if dense.ndim != 2 or dense.shape[0] != dense.shape[1]:
+            raise ValueError("La matriz de adyacencia debe ser cuadrada")
+        filas, columnas = np.nonzero(dense > 0)
+        offsets = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(filas, minlength=dense.shape[0]), out=offsets[1:])
+        return cls(offsets, columnas, dense[filas, columnas])
+
+    @classmethod
+    def from_edges(cls, num_nodos, origenes, destinos, pesos):
+        """
+        Construye el grafo a partir de listas de aristas dirigidas
+
+        Las aristas repetidas conservan el menor peso y las de peso no
+        positivo se descartan.
+
+        Args:
+            num_nodos: Número de nodos
+            origenes: Nodo origen de cada arista
+            destinos: Nodo destino de cada arista
+            pesos: Peso de cada arista
+
+        Returns:
+            CSRGraph con las filas ordenadas por destino
+        """
+        origenes = np.asarray(origenes, dtype=np.int64)
+        destinos = np.asarray(destinos, dtype=np.int64)
+        pesos = _como_pesos(pesos)
+
+        validas = pesos > 0
+        origenes, destinos, pesos = origenes[validas], destinos[validas], pesos[validas]
+
+        orden = np.lexsort((pesos, destinos, origenes))
+        origenes, destinos, pesos = origenes[orden], destinos[orden], pesos[orden]
+
+        # Tras ordenar, la primera aparición de cada (origen, destino) es la más barata
+        primeras = np.ones(len(origenes), dtype=bool)
+        primeras[1:] = (origenes[1:] != origenes[:-1]) | (destinos[1:] != destinos[:-1])
+        origenes, destinos, pesos = origenes[primeras], destinos[primeras], pesos[primeras]
+
+        offsets = np.zeros(num_nodos + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origenes, minlength=num_nodos), out=offsets[1:])
+        return cls(offsets, destinos, pesos)
+
+    @classmethod
+    def vacio(cls, num_nodos):
+        """Grafo de num_nodos nodos sin aristas (pesos enteros)"""
+        return cls(np.zeros(num_nodos + 1, dtype=np.int64), np.zeros(0, dtype=np.int32),
+                   np.zeros(0, dtype=np.int64))
+
+    @property
+    def num_aristas(self):
+        """Número de aristas dirigidas almacenadas"""
+        return len(self.targets)
+
+    def __len__(self):
+        return self.num_nodos
+
+    def listas(self):
+        """
+        Devuelve offsets, destinos y pesos como listas de Python
+
+        Los bucles de Dijkstra indexan estas listas mucho más rápido que los
+        arreglos de NumPy; se construyen una sola vez y se reutilizan.
+        """
+        if self._listas is None:
+            self._listas = (self.offsets.tolist(), self.targets.tolist(),
+                            self.weights.tolist())
+        return self._listas
+
+    def vecinos(self, u):
+        """
+        Itera sobre las aristas salientes de u
+
+        Yields:
+            Tuplas (vecino, peso)
+        """
+        offsets, targets, weights = self.listas()
+        for idx in range(offsets[u], offsets[u + 1]):
+            yield targets[idx], weights[idx]
+
+    def indice_arista(self, u, v):
+        """
+        Posición de la arista (u, v) dentro de targets/weights
+
+        Returns:
+            Índice de la arista o -1 si no existe
+        """
+        offsets, targets, _ = self.listas()
+        inicio, fin = offsets[u], offsets[u + 1]
+        idx = bisect_left(targets, v, inicio, fin)
+        if idx < fin and targets[idx] == v:
+            return idx
+        return -1
+
+    def peso(self, u, v):
+        """Peso de la arista (u, v), o 0 si no existe"""
+        idx = self.indice_arista(u, v)
+        if idx < 0:
+            return 0
+        return self.listas()[2][idx]
+
+    def aplicar_cambios(self, cambios):
+        """
+        Modifica aristas del grafo en su lugar
+
+        Cambiar el peso de una arista existente cuesta O(1). Insertar o
+        eliminar aristas reconstruye los arreglos una vez por lote, en O(n + m).
+
+        Args:
+            cambios: Iterable de tuplas (u, v, peso); peso 0 elimina la arista
+
+        Returns:
+            efectivos: Lista de (u, v, peso_anterior, peso_nuevo) de los cambios
+                que modificaron el grafo, en el orden recibido
+            estructural: True si se insertaron o eliminaron aristas
+        """
+        efectivos = []
+        pendientes = {}  # (u, v) -> peso de inserciones y eliminaciones del lote
+
+        for u, v, peso in cambios:
+            if not (0 <= u < self.num_nodos and 0 <= v < self.num_nodos) or u == v:
+                raise ValueError(f"Arista inválida: ({u}, {v})")
+            if peso < 0:
+                raise ValueError(f"Peso negativo en la arista ({u}, {v}): {peso}")
+            idx = self.indice_arista(u, v)
+            anterior = pendientes.get((u, v), self.listas()[2][idx] if idx >= 0 else 0)
+            if anterior == peso:
+                continue
+            efectivos.append((u, v, anterior, peso))
+            if idx >= 0 and peso > 0 and (u, v) not in pendientes:
+                self._cambiar_peso(idx, peso)
+            else:
+                pendientes[(u, v)] = peso
+
+        self._huella = None
+        if pendientes:
+            self._reconstruir(pendientes)
+        return efectivos, bool(pendientes)
+
+    def _cambiar_peso(self, idx, peso):
+        """Cambia el peso de una arista existente (y el de su inversa en el transpuesto)"""
+        if self.weights.dtype.kind != "f" and peso != int(peso):
+            self.weights = self.weights.astype(np.float64)
+            self._listas = None
+            self._transpuesto = None
+        elif not self.weights.flags.writeable:
+            # p. ej. proyectado en modo solo lectura: copiar antes de escribir
+            self.weights = self.weights.copy()
+        self.weights[idx] = peso
+        if self._listas is not None:
+            self._listas[2][idx] = self.weights[idx].item()
+        if self._transpuesto is not None:
+            u = int(np.searchsorted(self.offsets, idx, side="right")) - 1
+            v = self._listas[1][idx] if self._listas is not None else int(self.targets[idx])
+            self._transpuesto._cambiar_peso(self._transpuesto.indice_arista(v, u), peso)
+
+    def _reconstruir(self, pendientes):
+        """Reconstruye los arreglos aplicando inserciones y eliminaciones"""
+        origenes = np.repeat(np.arange(self.num_nodos), np.diff(self.offsets))
+        tipo = np.result_type(self.weights.dtype, np.asarray(list(pendientes.values())).dtype)
+        pesos = self.weights.astype(tipo)
+        nuevas = []
+        for (u, v), peso in pendientes.items():
+            idx = self.indice_arista(u, v)
+            if idx >= 0:
+                pesos[idx] = peso  # peso 0: from_edges la descarta
+            elif peso > 0:
+                nuevas.append((u, v, peso))
+        if nuevas:
+            nu, nv, npeso = zip(*nuevas)
+            origenes = np.concatenate([origenes, nu])
+            destinos = np.concatenate([self.targets, nv])
+            pesos = np.concatenate([pesos, np.asarray(npeso, dtype=tipo)])
+        else:
+            destinos = self.targets
+        nuevo = CSRGraph.from_edges(self.num_nodos, origenes, destinos, pesos)
+        self.offsets, self.targets, self.weights = nuevo.offsets, nuevo.targets, nuevo.weights
+        self._listas = None
+        self._transpuesto = None
+
+    def es_simetrico(self):
+        """Indica si cada arista (u, v) tiene su inversa (v, u) con el mismo peso"""
+        origenes = np.repeat(np.arange(self.num_nodos), np.diff(self.offsets))
+        directas = np.lexsort((self.targets, origenes))
+        inversas = np.lexsort((origenes, self.targets))
+        return (np.array_equal(origenes[directas], self.targets[inversas])
+                and np.array_equal(self.targets[directas], origenes[inversas])
+                and np.array_equal(self.weights[directas], self.weights[inversas]))
+
+    def huella(self):
+        """
+        Resumen hexadecimal del contenido del grafo (estructura y pesos).
+        Dos grafos con las mismas aristas y el mismo tipo de pesos tienen la
+        misma huella.
+        """
+        if self._huella is None:
+            resumen = hashlib.blake2b(digest_size=16)
+            for arreglo in (self.offsets, self.targets, self.weights):
+                resumen.update(arreglo.dtype.str.encode())
+                resumen.update(np.ascontiguousarray(arreglo).tobytes())
+            self._huella = resumen.hexdigest()
+        return self._huella
+
+    def copia(self):
+        """Copia independiente (p. ej. para entregarla a otro hilo)"""
+        return CSRGraph(self.offsets.copy(), self.targets.copy(), self.weights.copy())
+
+    def transpuesto(self):
+        """
+        Grafo con todas las aristas invertidas (se construye una sola vez)
+
+        Recorrerlo desde un nodo t da las distancias de cada nodo hacia t.
+        """
+        if self._transpuesto is None:
+            origenes = np.repeat(np.arange(self.num_nodos), np.diff(self.offsets))
+            self._transpuesto = CSRGraph.from_edges(self.num_nodos, self.targets,
+                                                    origenes, self.weights)
+        return self._transpuesto
+
+    def to_matrix(self):
+        """Convierte el grafo en una matriz de adyacencia densa (NumPy)"""
+        dense = np.zeros((self.num_nodos, self.num_nodos), dtype=self.weights.dtype)
+        origenes = np.repeat(np.arange(self.num_nodos), np.diff(self.offsets))
+        dense[origenes, self.targets] = self.weights
+        return dense
+
+
+def _como_pesos(valores):
+    """Convierte a arreglo numérico, manteniendo enteros como enteros"""
+    arreglo = np.asarray(valores)
+    if arreglo.dtype.kind not in "iuf":
+        arreglo = arreglo.astype(np.float64)
+    return arreglo
+
+
+def as_csr(graph):
+    """
+    Devuelve el grafo en formato CSR, convirtiéndolo si es una matriz densa
+
+    Args:
+        graph: CSRGraph o matriz de adyacencia
+
+    Returns:
+        CSRGraph
+    """
+    if isinstance(graph, CSRGraph):
+        return graph
+    return CSRGraph.from_matrix(graph)
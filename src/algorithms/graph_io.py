@@ -0,0 +1,171 @@
+"""
+Lectura y escritura de grafos CSR en un formato binario compacto
+
+Formato del archivo (little-endian):
+    cabecera de 64 bytes: firma b"CSRGRAF1", num_nodos (int64),
+        num_aristas (int64) y el dtype de los pesos (texto ASCII de 16 bytes)
+    offsets: num_nodos + 1 enteros int64
+    targets: num_aristas enteros int32
+    weights: num_aristas pesos del dtype indicado
+Cada arreglo empieza en una posición múltiplo de 64 bytes.
+
+load_csr abre los arreglos con mmap: el tiempo de carga no depende del tamaño
+del grafo, las páginas se leen del disco solo al usarse y varios procesos que
+abren el mismo archivo comparten las mismas páginas en memoria.
+"""
+
+import csv
+
+import numpy as np
+
+from .csr import CSRGraph, as_csr
+
+FIRMA = b"CSRGRAF1"
+_CABECERA = 64
+_ALINEACION = 64
+
+
+def _alinear(posicion):
+    return -(-posicion // _ALINEACION) * _ALINEACION
+
+
+def _disposicion(num_nodos, num_aristas, dtype_pesos):
+    """Posición y forma de cada arreglo dentro del archivo"""
+    disposicion = []
+    posicion = _CABECERA
+    for dtype, cantidad in ((np.dtype("<i8"), num_nodos + 1),
+                            (np.dtype("<i4"), num_aristas),
+                            (dtype_pesos, num_aristas)):
+        disposicion.append((posicion, dtype, cantidad))
+        posicion = _alinear(posicion + dtype.itemsize * cantidad)
+    return disposicion
+
+
+def save_csr(grafo, ruta):
+    """
+    Guarda un grafo en el formato binario CSR
+
+    Args:
+        grafo: CSRGraph o matriz de adyacencia
+        ruta: Archivo de salida (por convención con extensión .csr)
+    """
+    grafo = as_csr(grafo)
+    dtype_pesos = grafo.weights.dtype.newbyteorder("<")
+    cabecera = bytearray(_CABECERA)
+    cabecera[:8] = FIRMA
+    cabecera[8:24] = np.array([grafo.num_nodos, grafo.num_aristas], dtype="<i8").tobytes()
+    cabecera[24:40] = dtype_pesos.str.encode("ascii").ljust(16, b"\0")
+
+    arreglos = (grafo.offsets, grafo.targets, grafo.weights)
+    with open(ruta, "wb") as archivo:
+        archivo.write(cabecera)
+        for (posicion, dtype, _), arreglo in zip(
+                _disposicion(grafo.num_nodos, grafo.num_aristas, dtype_pesos), arreglos):
+            archivo.seek(posicion)
+            archivo.write(np.ascontiguousarray(arreglo, dtype=dtype).tobytes())
+        # Rellenar hasta el final del último arreglo alineado
+        archivo.truncate(max(archivo.tell(), _CABECERA))
+
+
+def load_csr(ruta, mmap=True):
+    """
+    Carga un grafo guardado con save_csr
+
+    Args:
+        ruta: Archivo .csr
+        mmap: Si es True los arreglos se proyectan en memoria (copy-on-write:
+            modificar el grafo no altera el archivo). Si es False se leen
+            completos a memoria.
+
+    Returns:
+        CSRGraph
+    """
+    with open(ruta, "rb") as archivo:
+        cabecera = archivo.read(_CABECERA)
+    if len(cabecera) < _CABECERA or cabecera[:8] != FIRMA:
+        raise ValueError(f"{ruta} no es un archivo de grafo CSR")
+    num_nodos, num_aristas = np.frombuffer(cabecera[8:24], dtype="<i8").tolist()
+    dtype_pesos = np.dtype(cabecera[24:40].rstrip(b"\0").decode("ascii"))
+
+    arreglos = []
+    for posicion, dtype, cantidad in _disposicion(num_nodos, num_aristas, dtype_pesos):
+        if cantidad == 0:
+            arreglos.append(np.empty(0, dtype=dtype))
+        elif mmap:
+            arreglos.append(np.memmap(ruta, dtype=dtype, mode="c",
+                                      offset=posicion, shape=(cantidad,)))
+        else:
+            arreglos.append(np.fromfile(ruta, dtype=dtype, count=cantidad, offset=posicion))
+    return CSRGraph(*arreglos)
+
+
+def csv_to_csr(ruta_csv, ruta_salida=None, num_nodos=None, no_dirigido=False,
+               delimitador=",", bloque=1_000_000):
+    """
+    Convierte una lista de aristas CSV en un grafo CSR sin pasar por una
+    matriz densa
+
+    Cada línea es "origen,destino[,peso]" (peso 1 si falta). Las líneas que
+    no empiezan por un número (cabecera, comentarios) se ignoran. El archivo
+    se lee por bloques de filas que se convierten a arreglos NumPy, así la
+    memoria es O(m) y no hay una lista de Python por arista.
+
+    Args:
+        ruta_csv: Archivo de entrada (ruta o archivo de texto ya abierto,
+            p. ej. sys.stdin)
+        ruta_salida: Si se indica, el grafo se guarda ahí con save_csr
+        num_nodos: Número de nodos (por defecto, el mayor índice + 1)
+        no_dirigido: Si cada arista se agrega en ambos sentidos
+        delimitador: Separador de columnas
+        bloque: Filas que se acumulan antes de convertirlas
+
+    Returns:
+        CSRGraph
+    """
+    partes = []  # (origenes, destinos, pesos) por bloque
+
+    def volcar(filas):
+        if filas:
+            datos = np.asarray(filas, dtype=np.float64)
+            partes.append((datos[:, 0].astype(np.int64), datos[:, 1].astype(np.int64),
+                           datos[:, 2]))
+            filas.clear()
+
+    def leer(archivo):
+        filas = []
+        for campos in csv.reader(archivo, delimiter=delimitador):
+            if not campos or not campos[0].strip().lstrip("-").isdigit():
+                continue
+            filas.append((campos[0], campos[1], campos[2] if len(campos) > 2 else 1))
+            if len(filas) >= bloque:
+                volcar(filas)
+        volcar(filas)
+
+    if hasattr(ruta_csv, "read"):
+        leer(ruta_csv)
+    else:
+        with open(ruta_csv, newline="", encoding="utf-8") as archivo:
+            leer(archivo)
+
+    if partes:
+        origenes, destinos, pesos = (np.concatenate(columna) for columna in zip(*partes))
+    else:
+        origenes = destinos = np.empty(0, dtype=np.int64)
+        pesos = np.empty(0)
+    if len(pesos) and np.all(pesos == np.round(pesos)):
+        pesos = pesos.astype(np.int64)
+
+    if num_nodos is None:
+        num_nodos = int(max(origenes.max(initial=-1), destinos.max(initial=-1))) + 1
+    if len(origenes) and (min(origenes.min(), destinos.min()) < 0
+                          or max(origenes.max(), destinos.max()) >= num_nodos):
+        raise ValueError("Hay aristas con nodos fuera de rango")
+    if no_dirigido:
+        origenes, destinos = (np.concatenate([origenes, destinos]),
+                              np.concatenate([destinos, origenes]))
+        pesos = np.concatenate([pesos, pesos])
+
+    grafo = CSRGraph.from_edges(num_nodos, origenes, destinos, pesos)
+    if ruta_salida is not None:
+        save_csr(grafo, ruta_salida)
+    return grafo
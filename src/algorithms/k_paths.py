@@ -2,70 +2,782 @@
 Clase para calcular los K caminos más cortos en un grafo ponderado.
 Basado en el algoritmo de Dijkstra y de Yen para k = 1 , k = 2 , k = 3.
 
-
-
+Motores disponibles para las búsquedas spur:
+    "yen":  Dijkstra desde cada spur node hasta el destino (algoritmo
+            clásico), o A* con un índice ALT si se preparó uno.
+    "lazy": Usa el árbol de caminos mínimos hacia el destino (calculado en el
+            grafo invertido). Si el camino del árbol desde el spur node no toca
+            nada prohibido se usa directamente; si no, se busca con A* usando
+            esas distancias como cota inferior exacta.
 """
 
 import heapq
-import copy
+import time
+from itertools import islice
+
 import numpy as np
 
+from . import backends
+from .alt import IndiceALT
+from .cache import CacheLRU
+from .contraction import JerarquiaContraccion
+from .csr import CSRGraph, as_csr
+from .shortest_path import bidirectional_dijkstra
+from .stats import fase
+
+
+METODOS = ("yen", "lazy")
+
 
 class KPaths:
     """Clase que implementa el algoritmo de K caminos más cortos"""
 
-    def __init__(self):
-        self.matriz = None
+    def __init__(self, metodo="yen", cache=True, estadisticas=None, backend=None):
+        """
+        Args:
+            metodo: Motor de búsqueda spur ("yen" o "lazy")
+            cache: True para una CacheLRU por defecto, una CacheLRU propia o
+                None/False para no guardar resultados
+            estadisticas: Objeto Estadisticas (algorithms.stats) donde contar
+                operaciones y medir fases, o None para no instrumentar
+            backend: Nombre del backend de caminos mínimos para compute con
+                k=1 (ver algorithms.backends); None lo elige según el grafo
+        """
+        if metodo not in METODOS:
+            raise ValueError(f"Método desconocido: {metodo!r} (opciones: {', '.join(METODOS)})")
+        self.metodo = metodo
+        if cache is True:
+            cache = CacheLRU()
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        self.estadisticas = estadisticas
+        if backend is not None:
+            backends.obtener(backend)  # falla pronto si no existe o no está disponible
+        self.backend = backend
+        # Nombre del backend que calculó el último compute/compute_tensor
+        # (None si se calculó por filas con Yen o salió de la caché)
+        self.backend_usado = None
+        self.grafo = None
         self.num_nodos = 0
+        self._arboles_inversos = {}
+        # Índice ALT opcional (ver preparar_alt) y potencial del último destino
+        self.alt = None
+        self._potencial_alt = (None, None)
+        # Jerarquía de contracción opcional para el primer camino
+        self.contraccion = None
+        # Árboles y caminos guardados por compute(..., incremental=True)
+        self._incremental = None
+        # Máscara de aristas y nodos prohibidos en las búsquedas spur de Yen.
+        # Un elemento está prohibido si su marca coincide con la generación
+        # actual, así que "limpiar" la máscara es solo incrementar el contador.
+        self._marca_nodo = []
+        self._marca_arista = []
+        self._generacion = 0
+
+    def cargar_grafo(self, grafo):
+        """
+        Carga el grafo sobre el que se harán las consultas.
+        Acepta una matriz de adyacencia densa o un CSRGraph; la matriz se
+        convierte a CSR una sola vez.
+        """
+        if self.estadisticas is not None and not isinstance(grafo, CSRGraph):
+            self.estadisticas.sumar(bytes_copiados=np.asarray(grafo).nbytes)
+        self.grafo = as_csr(grafo)
+        self.num_nodos = self.grafo.num_nodos
+        self._marca_nodo = [0] * self.num_nodos
+        self._marca_arista = [0] * self.grafo.num_aristas
+        self._generacion = 0
+        self._arboles_inversos = {}
+        self._potencial_alt = (None, None)
+        self._incremental = None
+        if self.alt is not None and self.alt.huella != self.grafo.huella():
+            self.alt = None
+        if self.contraccion is not None and self.contraccion.huella != self.grafo.huella():
+            self.contraccion = None
+
+    def preparar_alt(self, num_landmarks=8, semilla=None):
+        """
+        Construye un índice ALT para el grafo cargado. Desde entonces las
+        consultas de un solo par (primer camino y búsquedas spur del motor
+        "yen") usan A* con las cotas de los landmarks. Conviene cuando el
+        grafo no cambia y se hacen muchas consultas.
+
+        Returns:
+            El IndiceALT construido (puede guardarse con indice.guardar)
+        """
+        if self.grafo is None:
+            raise ValueError("No hay ningún grafo cargado")
+        return self.usar_alt(IndiceALT.construir(self.grafo, num_landmarks, semilla))
+
+    def usar_alt(self, indice):
+        """
+        Usa un índice ALT ya construido (p. ej. cargado con IndiceALT.cargar).
+        None lo desactiva.
+
+        Returns:
+            El índice
+        """
+        if indice is not None and (self.grafo is None or indice.huella != self.grafo.huella()):
+            raise ValueError("El índice ALT no corresponde al grafo cargado")
+        self.alt = indice
+        self._potencial_alt = (None, None)
+        return indice
 
-    def compute(self, matriz, k=1):
+    def preparar_contraccion(self, limite_testigos=64):
+        """
+        Construye una jerarquía de contracción para el grafo cargado. Desde
+        entonces el primer camino de cada consulta se obtiene con ella, en
+        una fracción mínima del tiempo de Dijkstra. El preprocesamiento es
+        costoso: solo conviene con grafos estáticos y muchas consultas.
+
+        Returns:
+            La JerarquiaContraccion construida (puede guardarse)
+        """
+        if self.grafo is None:
+            raise ValueError("No hay ningún grafo cargado")
+        return self.usar_contraccion(JerarquiaContraccion.construir(self.grafo, limite_testigos))
+
+    def usar_contraccion(self, jerarquia):
+        """
+        Usa una jerarquía de contracción ya construida (p. ej. cargada con
+        JerarquiaContraccion.cargar). None la desactiva.
+
+        Returns:
+            La jerarquía
+        """
+        if jerarquia is not None and (self.grafo is None
+                                      or jerarquia.huella != self.grafo.huella()):
+            raise ValueError("La jerarquía de contracción no corresponde al grafo cargado")
+        self.contraccion = jerarquia
+        return jerarquia
+
+    def compute(self, matriz, k=1, workers=None, incremental=False):
         """
         Calcula la matriz de los k caminos más cortos entre todos los pares de nodos.
         Retorna una matriz donde cada posición [i][j] representa el costo del k-ésimo
         camino más corto entre el nodo i y el nodo j.
+        El grafo puede ser una matriz de adyacencia o un CSRGraph.
+        Con workers > 1 las filas se reparten entre varios procesos; el
+        resultado es idéntico al del cálculo secuencial.
+        Para k=1 la matriz es la de distancias mínimas, que calcula el
+        backend de todos los pares (ver algorithms.backends).
+        Con k > 1 se ejecuta Yen para cada uno de los n² pares (un árbol por
+        origen ahorra el primer Dijkstra de cada par): el tiempo crece aprox.
+        con n³ y con 1000 nodos son horas. Si solo interesan algunos pares,
+        consultar_lote es mucho más barato; compute_tensor da varios k en una
+        sola pasada.
+        Con incremental=True se guardan los árboles de caminos mínimos y los
+        caminos de cada par para poder usar después actualizar_aristas.
+        Si k es una secuencia de valores (p. ej. [1, 2, 3]) se delega en
+        compute_tensor y se retorna un arreglo (n, n, len(k)).
+        """
+        if not isinstance(k, (int, np.integer)):
+            return self.compute_tensor(matriz, k, workers=workers)
+        est = self.estadisticas
+        with fase(est, "carga"):
+            self.cargar_grafo(matriz)
+        if incremental:
+            return self._compute_incremental(k)
+
+        self.backend_usado = None
+        clave = ("matriz", self.grafo.huella(), k)
+        if self.cache is not None:
+            guardada = self.cache.obtener(clave)
+            if guardada is not None:
+                if est is not None:
+                    est.sumar(bytes_copiados=guardada.nbytes)
+                return guardada.tolist()
+
+        backend = self._backend_minimos(k) if not workers or workers <= 1 else None
+        if backend is not None:
+            # El primer camino de cada par es el camino mínimo
+            self.backend_usado = backend.nombre
+            with fase(est, f"todos_los_pares_{backend.nombre}"):
+                matriz_k = np.array(backend.todos_los_pares(self.grafo), dtype=np.float64)
+            np.fill_diagonal(matriz_k, np.inf)
+            return self._guardar_matriz(clave, matriz_k)
+
+        # En un grafo no dirigido los caminos de j a i son los de i a j invertidos
+        simetrico = self.grafo.es_simetrico()
+
+        if workers is not None and workers > 1:
+            from .parallel import compute_parallel
+            with fase(est, "paralelo"):
+                matriz_k = compute_parallel(self.grafo, k, workers, simetrico, self.metodo, est)
+        else:
+            with fase(est, "filas"):
+                matriz_k = np.full((self.num_nodos, self.num_nodos), np.inf)
+                for _ in self._filas(k, simetrico, matriz_k):
+                    pass
+
+        if simetrico:
+            inferior = np.tril_indices(self.num_nodos, -1)
+            matriz_k[inferior] = matriz_k.T[inferior]
+
+        return self._guardar_matriz(clave, matriz_k)
+
+    def compute_tensor(self, matriz, k=3, workers=None, caminos=False):
+        """
+        Calcula en una sola pasada los costos de varios k para todos los pares.
+        Yen produce los caminos en orden, así que al buscar max(k) caminos por
+        par ya se tienen los costos de todos los k menores.
+
+        Args:
+            matriz: Matriz de adyacencia o CSRGraph
+            k: Máximo k (se calculan 1..k) o secuencia de valores de k
+                (se ordenan y se descartan los repetidos)
+            workers: Procesos entre los que repartir las filas (como en compute)
+            caminos: Si también se retornan los caminos como índices de nodos
+
+        Returns:
+            costos: Arreglo float32 (n, n, K) con el costo del ks[t]-ésimo
+                camino de i a j en [i, j, t] (mismo criterio que compute: si
+                hay menos caminos se repite el último; infinito si no hay
+                ninguno, y en la diagonal)
+            indices: Solo si caminos=True. Arreglo int32 (n, n, K, L) con los
+                nodos de cada camino, rellenado con -1 hasta la longitud L del
+                camino más largo. Ocupa n²·K·L enteros: pensado para grafos
+                medianos
+
+        Los arreglos se marcan como de solo lectura porque se comparten con
+        la caché.
+        """
+        ks = _valores_k(k)
+        est = self.estadisticas
+        with fase(est, "carga"):
+            self.cargar_grafo(matriz)
+
+        self.backend_usado = None
+        clave = ("tensor", self.grafo.huella(), ks, bool(caminos))
+        guardado = self._tensor_guardado(ks, caminos)
+        if guardado is not None:
+            return guardado
+
+        n = self.num_nodos
+        costos = np.full((n, n, len(ks)), np.inf, dtype=np.float32)
+        por_par = {} if caminos else None
+        backend = None
+        if ks == (1,) and not caminos and (not workers or workers <= 1):
+            backend = self._backend_minimos(1)
+        if backend is not None:
+            self.backend_usado = backend.nombre
+            with fase(est, f"todos_los_pares_{backend.nombre}"):
+                costos[:, :, 0] = backend.todos_los_pares(self.grafo)
+            np.fill_diagonal(costos[:, :, 0], np.inf)
+        else:
+            simetrico = self.grafo.es_simetrico()
+            if workers is not None and workers > 1:
+                from .parallel import compute_parallel_tensor
+                with fase(est, "paralelo"):
+                    compute_parallel_tensor(self.grafo, ks, workers, simetrico, self.metodo,
+                                            costos, por_par, est)
+                if simetrico:
+                    _espejar(costos)
+            else:
+                with fase(est, "filas"):
+                    for _ in self._filas_tensor(ks, simetrico, costos, por_par):
+                        pass
+
+        arreglos = (costos,)
+        if caminos:
+            with fase(est, "salida"):
+                arreglos += (_indices_caminos(por_par, n, len(ks)),)
+        for arreglo in arreglos:
+            arreglo.setflags(write=False)
+            if est is not None:
+                est.sumar(bytes_copiados=arreglo.nbytes)
+        resultado = arreglos if caminos else costos
+        if self.cache is not None:
+            self.cache.guardar(clave, resultado, sum(arreglo.size for arreglo in arreglos))
+        return resultado
+
+    def iter_filas(self, matriz, k=1, cancelado=None):
+        """
+        Generador de las filas de la matriz de compute a medida que se
+        terminan, en orden. Permite mostrar resultados parciales o cancelar
+        el cálculo entre filas (basta con dejar de consumir el generador).
+        Al terminar, la matriz completa se guarda en la caché como en compute.
+
+        Con k como secuencia de valores (ver compute_tensor) cada fila es un
+        arreglo float32 (n, K) y al terminar se guarda el tensor completo.
+
+        cancelado es una función opcional sin argumentos que se consulta antes
+        de cada par (origen, destino): si retorna True el generador termina
+        sin entregar la fila en curso ni guardar nada en la caché. Sirve para
+        cancelar desde otro hilo sin esperar a que termine una fila larga.
+
+        Yields:
+            Tuplas (i, fila) con la fila i completa como lista
         """
-        self.matriz = np.array(matriz)
-        self.num_nodos = len(matriz)
+        if not isinstance(k, (int, np.integer)):
+            yield from self._iter_filas_tensor(matriz, _valores_k(k), cancelado)
+            return
+        self.cargar_grafo(matriz)
+        clave = ("matriz", self.grafo.huella(), k)
+        if (self.cache is not None and clave in self.cache) or self._backend_minimos(k):
+            # Resultado inmediato: caché o todos los pares de una vez
+            yield from enumerate(self.compute(matriz, k))
+            return
+
+        simetrico = self.grafo.es_simetrico()
         matriz_k = np.full((self.num_nodos, self.num_nodos), np.inf)
+        completas = 0
+        for i in self._filas(k, simetrico, matriz_k, cancelado):
+            completas += 1
+            yield i, matriz_k[i].tolist()
+        if self.cache is not None and completas == self.num_nodos:
+            self.cache.guardar(clave, matriz_k, matriz_k.size)
+
+    def _iter_filas_tensor(self, matriz, ks, cancelado=None):
+        """iter_filas para varios valores de k (filas de compute_tensor)"""
+        self.cargar_grafo(matriz)
+        clave = ("tensor", self.grafo.huella(), ks, False)
+        guardado = self._tensor_guardado(ks)
+        if guardado is None and ks == (1,) and self._backend_minimos(1):
+            # Solo k=1: la matriz de distancias mínimas sale de una vez
+            guardado = self.compute_tensor(matriz, ks)
+        if guardado is not None:
+            yield from enumerate(guardado)
+            return
+        n = self.num_nodos
+        costos = np.full((n, n, len(ks)), np.inf, dtype=np.float32)
+        completas = 0
+        for i in self._filas_tensor(ks, self.grafo.es_simetrico(), costos, cancelado=cancelado):
+            completas += 1
+            yield i, costos[i].copy()
+        if completas < n:
+            return
+        costos.setflags(write=False)
+        if self.cache is not None:
+            self.cache.guardar(clave, costos, costos.size)
+
+    def _tensor_guardado(self, ks, caminos=False):
+        """
+        Tensor de compute_tensor para ks sacado de la caché: el guardado con
+        esos mismos valores o, si no está, uno calculado con más valores de k
+        (p. ej. 1..3 sirve para 1..2) del que se toman las capas de ks.
+
+        Returns:
+            Lo mismo que compute_tensor, o None si no hay ninguno que sirva
+        """
+        if self.cache is None:
+            return None
+        huella = self.grafo.huella()
+        exacta = ("tensor", huella, ks, bool(caminos))
+        candidatas = [exacta] if exacta in self.cache else []
+        candidatas += [clave for clave in self.cache.claves()
+                       if clave[0] == "tensor" and clave[1] == huella and clave != exacta
+                       and (clave[3] or not caminos) and set(ks) <= set(clave[2])]
+        for clave in candidatas:
+            guardado = self.cache.obtener(clave)
+            if guardado is None:
+                continue
+            if clave == exacta:
+                return guardado
+            capas = [clave[2].index(k) for k in ks]
+            arreglos = guardado if clave[3] else (guardado,)
+            arreglos = tuple(arreglo[:, :, capas] for arreglo in arreglos[:2 if caminos else 1])
+            for arreglo in arreglos:
+                arreglo.setflags(write=False)
+            return arreglos if caminos else arreglos[0]
+        return None
+
+    def _backend_minimos(self, k):
+        """
+        Backend de todos los pares para compute con k=1, o None si conviene
+        calcular por filas: la elección automática "python" es lo mismo que
+        las filas con Yen, que además aprovechan la simetría y cuentan
+        operaciones en las estadísticas.
+        """
+        if k != 1:
+            return None
+        backend = backends.elegir(self.grafo, "todos_los_pares", self.backend)
+        if backend.nombre == "python" and self.backend is None:
+            return None
+        return backend
+
+    def _filas(self, k, simetrico, matriz_k, cancelado=None):
+        """
+        Calcula en matriz_k las filas en orden y entrega el índice de cada
+        una al terminarla. En grafos simétricos la parte j < i de la fila i
+        se copia de las filas anteriores, así cada fila entregada está completa.
+        Si cancelado() retorna True termina sin entregar la fila en curso.
+        """
+        for i in range(self.num_nodos):
+            inicio = i + 1 if simetrico else 0
+            fila = self._calcular_fila(i, k, simetrico, cancelado=cancelado)
+            if fila is None:
+                return
+            matriz_k[i, inicio:] = fila
+            if simetrico:
+                matriz_k[i, :i] = matriz_k[:i, i]
+            yield i
 
+    def _filas_tensor(self, ks, simetrico, costos, por_par=None, cancelado=None):
+        """Como _filas, pero llenando el tensor costos (n, n, K) de compute_tensor"""
         for i in range(self.num_nodos):
-            for j in range(self.num_nodos):
-                if i != j:
-                    caminos = self.find_k_shortest_paths(i, j, k)
-                    if len(caminos) >= k:
-                        matriz_k[i][j] = caminos[k - 1][0]
-                    elif caminos:
-                        matriz_k[i][j] = caminos[-1][0]
+            inicio = i + 1 if simetrico else 0
+            fila, caminos = self._fila_tensor(i, ks, simetrico, por_par is not None, cancelado)
+            if fila is None:
+                return
+            costos[i, inicio:] = fila
+            if por_par is not None:
+                por_par.update(caminos)
+            if simetrico:
+                costos[i, :i] = costos[:i, i]
+            yield i
 
+    def _fila_tensor(self, i, ks, simetrico, con_caminos=False, cancelado=None):
+        """
+        Costos de los caminos ks desde i hacia cada destino (solo j > i si el
+        grafo es simétrico) con una sola búsqueda de Yen de max(ks) caminos
+
+        Returns:
+            costos: Arreglo float32 (destinos, K)
+            caminos: Diccionario {(i, j): [camino de cada k]} si con_caminos;
+                en grafos simétricos incluye también (j, i) con los caminos
+                invertidos
+            (None, None) si cancelado() retornó True antes de terminar
+        """
+        arbol = self.arbol_minimo(i)
+        inicio = i + 1 if simetrico else 0
+        k_max = max(ks)
+        costos = np.full((self.num_nodos - inicio, len(ks)), np.inf, dtype=np.float32)
+        caminos = {}
+        for j in range(inicio, self.num_nodos):
+            if i == j:
+                continue
+            if cancelado is not None and cancelado():
+                return None, None
+            encontrados = self._yen(i, j, k_max, arbol)
+            if not encontrados:
+                continue
+            # Con menos de k caminos se repite el último (como _costo_k)
+            elegidos = [encontrados[min(k, len(encontrados)) - 1] for k in ks]
+            costos[j - inicio] = [costo for costo, _ in elegidos]
+            if con_caminos:
+                caminos[(i, j)] = [camino for _, camino in elegidos]
+                if simetrico:
+                    caminos[(j, i)] = [camino[::-1] for _, camino in elegidos]
+        return costos, caminos
+
+    def _guardar_matriz(self, clave, matriz_k):
+        """Guarda la matriz en la caché (si hay) y la retorna como listas"""
+        if self.cache is not None:
+            self.cache.guardar(clave, matriz_k, matriz_k.size)
+        if self.estadisticas is not None:
+            self.estadisticas.sumar(bytes_copiados=matriz_k.nbytes)
+        with fase(self.estadisticas, "salida"):
+            return matriz_k.tolist()
+
+    def _calcular_fila(self, i, k, simetrico, estado=None, cancelado=None):
+        """
+        Costos del k-ésimo camino desde i hacia cada destino j (solo j > i si
+        el grafo es simétrico; la diagonal queda en infinito).
+        Si se pasa el estado incremental, guarda en él el árbol y los caminos.
+        Retorna None si cancelado() retorna True antes de terminar la fila.
+        """
+        # Un único árbol de caminos mínimos por origen para toda la fila
+        arbol = self.arbol_minimo(i)
+        if estado is not None:
+            estado["arboles"][i] = arbol
+        inicio = i + 1 if simetrico else 0
+        fila = []
+        for j in range(inicio, self.num_nodos):
+            costo = np.inf
+            if i != j:
+                if cancelado is not None and cancelado():
+                    return None
+                caminos = self._yen(i, j, k, arbol)
+                costo = _costo_k(caminos, k)
+                if estado is not None:
+                    self._registrar_par(estado, i, j, caminos)
+            fila.append(costo)
+        return fila
+
+    def _compute_incremental(self, k):
+        """compute secuencial que guarda el estado para actualizar_aristas"""
+        n = self.num_nodos
+        simetrico = self.grafo.es_simetrico()
+        estado = {
+            "k": k,
+            "simetrico": simetrico,
+            "matriz": np.full((n, n), np.inf),
+            # Costo que debe superar un camino nuevo para entrar en el par
+            # (infinito si el par tiene menos de k caminos)
+            "umbral": np.full((n, n), np.inf),
+            "arboles": {},
+            "caminos": {},
+            "uso": {},  # (u, v) -> pares cuyos caminos usan la arista
+        }
+        for i in range(n):
+            inicio = i + 1 if simetrico else 0
+            estado["matriz"][i, inicio:] = self._calcular_fila(i, k, simetrico, estado)
+        self._incremental = estado
+        return self._matriz_incremental()
+
+    def _registrar_par(self, estado, i, j, caminos):
+        """Guarda los caminos de un par y los indexa por arista"""
+        for _, camino in estado["caminos"].get((i, j), ()):
+            for arista in zip(camino, camino[1:]):
+                estado["uso"][arista].discard((i, j))
+        estado["caminos"][(i, j)] = caminos
+        for _, camino in caminos:
+            for arista in zip(camino, camino[1:]):
+                estado["uso"].setdefault(arista, set()).add((i, j))
+        estado["umbral"][i, j] = caminos[-1][0] if len(caminos) >= estado["k"] else np.inf
+
+    def _expandir_incremental(self, estado):
+        """
+        Convierte un estado incremental simétrico (solo pares i < j) en el de
+        un grafo dirigido: los caminos de j a i son los de i a j invertidos
+        """
+        for (i, j), caminos in list(estado["caminos"].items()):
+            if i < j:
+                self._registrar_par(estado, j, i,
+                                    [(costo, camino[::-1]) for costo, camino in caminos])
+        inferior = np.tril_indices(self.num_nodos, -1)
+        estado["matriz"][inferior] = estado["matriz"].T[inferior]
+        estado["simetrico"] = False
+
+    def _matriz_incremental(self):
+        """Matriz de costos del estado incremental (con el espejo si es simétrico)"""
+        matriz_k = self._incremental["matriz"].copy()
+        if self._incremental["simetrico"]:
+            inferior = np.tril_indices(self.num_nodos, -1)
+            matriz_k[inferior] = matriz_k.T[inferior]
         return matriz_k.tolist()
 
+    def actualizar_aristas(self, cambios, no_dirigido=None):
+        """
+        Aplica un lote de inserciones, eliminaciones y cambios de peso al
+        grafo cargado.
+
+        Si antes se llamó a compute(..., incremental=True), solo se recalculan
+        los árboles de caminos mínimos y los pares afectados:
+          - Los árboles se reparan a partir de los subárboles que colgaban de
+            aristas encarecidas o eliminadas y de las aristas abaratadas o
+            nuevas (Dijkstra dinámico).
+          - Un par se recalcula si alguno de sus caminos usa una arista que
+            cambió, o si una arista abaratada (u, v) permite una cota
+            d(i, u) + peso + d(v, j) menor que su k-ésimo costo.
+
+        Args:
+            cambios: Iterable de (u, v, peso); peso 0 elimina la arista
+            no_dirigido: Si cada cambio se aplica también a (v, u). Por defecto,
+                si el grafo es simétrico; un grafo dirigido cuyos pesos son
+                simétricos debe pasar False. Con False sobre un estado que se
+                calculó como no dirigido, el estado se expande a todos los
+                pares antes de aplicar los cambios
+
+        Returns:
+            La matriz de k caminos actualizada, o None si no hay estado
+            incremental
+        """
+        if self.grafo is None:
+            raise ValueError("No hay ningún grafo cargado")
+        estado = self._incremental
+        if no_dirigido is None:
+            no_dirigido = estado["simetrico"] if estado else self.grafo.es_simetrico()
+        if estado and estado["simetrico"] and not no_dirigido:
+            # Un cambio en un solo sentido rompe la simetría: se deja de
+            # calcular solo j > i
+            self._expandir_incremental(estado)
+
+        lote = []
+        for u, v, peso in cambios:
+            lote.append((u, v, peso))
+            if no_dirigido:
+                lote.append((v, u, peso))
+        efectivos, estructural = self.grafo.aplicar_cambios(lote)
+        # Un mismo lote puede tocar varias veces la misma arista: solo importa
+        # el peso inicial y el final
+        netos = {}
+        for u, v, anterior, nuevo in efectivos:
+            netos[(u, v)] = (netos.get((u, v), (anterior,))[0], nuevo)
+        efectivos = [(u, v, anterior, nuevo)
+                     for (u, v), (anterior, nuevo) in netos.items() if anterior != nuevo]
+        if estructural:
+            # La generación sigue avanzando: las marcas de nodos siguen valiendo
+            self._marca_arista = [0] * self.grafo.num_aristas
+        self._arboles_inversos = {}
+        self._potencial_alt = (None, None)
+        if any(nuevo > 0 and (anterior <= 0 or nuevo < anterior)
+               for _, _, anterior, nuevo in efectivos):
+            # Las cotas del índice ALT solo siguen valiendo si nada se abarata
+            self.alt = None
+        if efectivos:
+            # Los atajos dependen de todos los pesos
+            self.contraccion = None
+
+        if estado is None:
+            return None
+        if not efectivos:
+            return self._matriz_incremental()
+
+        for arbol in estado["arboles"].values():
+            self._reparar_arbol(arbol, efectivos)
+
+        pendientes = set()
+        for u, v, anterior, nuevo in efectivos:
+            pendientes |= estado["uso"].get((u, v), set())
+            if nuevo > 0 and (anterior <= 0 or nuevo < anterior):
+                # Cota inferior de cualquier camino i -> u -> v -> j
+                hasta_u = np.array([estado["arboles"][i][0].get(u, np.inf)
+                                    for i in range(self.num_nodos)])
+                desde_v = np.full(self.num_nodos, np.inf)
+                for j, valor in estado["arboles"][v][0].items():
+                    desde_v[j] = valor
+                cota = hasta_u[:, None] + nuevo + desde_v[None, :]
+                mejora = cota < estado["umbral"]
+                np.fill_diagonal(mejora, False)
+                if estado["simetrico"]:
+                    mejora = np.triu(mejora, 1)
+                pendientes.update(zip(*(indices.tolist() for indices in np.nonzero(mejora))))
+
+        for i, j in pendientes:
+            caminos = self._yen(i, j, estado["k"], estado["arboles"][i])
+            self._registrar_par(estado, i, j, caminos)
+            estado["matriz"][i, j] = _costo_k(caminos, estado["k"])
+
+        return self._matriz_incremental()
+
+    def _reparar_arbol(self, arbol, cambios):
+        """
+        Actualiza en su lugar un árbol de caminos mínimos (diccionarios de
+        distancias y predecesores) tras cambios de peso ya aplicados al grafo.
+        Solo se visitan los nodos cuya distancia o predecesor puede cambiar.
+        """
+        distancias, predecesores = arbol
+        cola = []
+
+        # Los subárboles que colgaban de una arista encarecida o eliminada
+        # pierden su distancia y se reenganchan desde sus vecinos de entrada
+        raices = [v for u, v, anterior, nuevo in cambios
+                  if (nuevo <= 0 or nuevo > anterior) and predecesores.get(v, -1) == u]
+        if raices:
+            hijos = {}
+            for nodo, padre in predecesores.items():
+                if padre is not None:
+                    hijos.setdefault(padre, []).append(nodo)
+            afectados = []
+            pila = raices
+            while pila:
+                nodo = pila.pop()
+                if nodo in distancias:
+                    del distancias[nodo]
+                    del predecesores[nodo]
+                    afectados.append(nodo)
+                    pila.extend(hijos.get(nodo, ()))
+
+            offsets, targets, weights = self.grafo.transpuesto().listas()
+            for nodo in afectados:
+                mejor, padre = np.inf, None
+                for idx in range(offsets[nodo], offsets[nodo + 1]):
+                    vecino = targets[idx]
+                    if vecino in distancias and distancias[vecino] + weights[idx] < mejor:
+                        mejor, padre = distancias[vecino] + weights[idx], vecino
+                if padre is not None:
+                    distancias[nodo] = mejor
+                    predecesores[nodo] = padre
+                    heapq.heappush(cola, (mejor, nodo))
+
+        # Aristas nuevas o abaratadas pueden acortar caminos
+        for u, v, anterior, nuevo in cambios:
+            if nuevo > 0 and u in distancias:
+                nueva_dist = distancias[u] + nuevo
+                if nueva_dist < distancias.get(v, np.inf):
+                    distancias[v] = nueva_dist
+                    predecesores[v] = u
+                    heapq.heappush(cola, (nueva_dist, v))
+
+        # Propagar las mejoras como en Dijkstra
+        offsets, targets, weights = self.grafo.listas()
+        while cola:
+            dist, actual = heapq.heappop(cola)
+            if distancias.get(actual, np.inf) < dist:
+                continue
+            for idx in range(offsets[actual], offsets[actual + 1]):
+                vecino = targets[idx]
+                nueva_dist = dist + weights[idx]
+                if nueva_dist < distancias.get(vecino, np.inf):
+                    distancias[vecino] = nueva_dist
+                    predecesores[vecino] = actual
+                    heapq.heappush(cola, (nueva_dist, vecino))
+
     def dijkstra(self, origen):
         """
         Aplica el algoritmo de Dijkstra desde un nodo origen.
         Retorna las distancias mínimas a todos los demás nodos y los predecesores
         para poder reconstruir los caminos.
+        Cada nodo visitado solo recorre sus aristas salientes (O(grado)).
         """
+        dist, pred = self._explorar(origen)
         distancias = [np.inf] * self.num_nodos
         predecesores = [None] * self.num_nodos
-        distancias[origen] = 0
+        for nodo, valor in dist.items():
+            distancias[nodo] = valor
+            predecesores[nodo] = pred[nodo]
+        return distancias, predecesores
+
+    def arbol_minimo(self, origen):
+        """
+        Árbol de caminos mínimos desde un origen, como diccionarios de
+        distancias y predecesores de los nodos alcanzables. Puede pasarse a
+        find_k_shortest_paths para no repetir el Dijkstra inicial.
+        """
+        return self._explorar(origen)
+
+    def _explorar(self, origen, generacion=-1, grafo=None, destino=None):
+        """
+        Núcleo de Dijkstra. Ignora los nodos y aristas cuya marca sea igual a
+        `generacion` (ninguno con el valor por defecto). Solo reserva memoria
+        para los nodos alcanzados. `grafo` permite recorrer otro grafo con los
+        mismos nodos (p. ej. el transpuesto) sin máscara. Con `destino` la
+        búsqueda se detiene en cuanto se fija su distancia.
+        Retorna diccionarios de distancias y predecesores.
+        """
+        if grafo is None:
+            grafo = self.grafo
+        offsets, targets, weights = grafo.listas()
+        marca_nodo = self._marca_nodo
+        marca_arista = self._marca_arista
+        distancias = {origen: 0}
+        predecesores = {origen: None}
         visitados = set()
         cola = [(0, origen)]
+        extracciones = 0
 
         while cola:
             dist, actual = heapq.heappop(cola)
+            extracciones += 1
             if actual in visitados:
                 continue
             visitados.add(actual)
+            if actual == destino:
+                break
 
-            for vecino in range(self.num_nodos):
-                peso = self.matriz[actual][vecino]
-                if peso > 0 and vecino not in visitados:
+            for idx in range(offsets[actual], offsets[actual + 1]):
+                vecino = targets[idx]
+                peso = weights[idx]
+                if (peso > 0 and vecino not in visitados
+                        and marca_arista[idx] != generacion
+                        and marca_nodo[vecino] != generacion):
                     nueva_dist = dist + peso
-                    if nueva_dist < distancias[vecino]:
+                    if nueva_dist < distancias.get(vecino, np.inf):
                         distancias[vecino] = nueva_dist
                         predecesores[vecino] = actual
                         heapq.heappush(cola, (nueva_dist, vecino))
 
+        if self.estadisticas is not None:
+            # Totales derivados al final: el bucle no cuenta nada más
+            examinadas = sum(offsets[u + 1] - offsets[u] for u in visitados)
+            if destino in visitados:
+                examinadas -= offsets[destino + 1] - offsets[destino]
+            self.estadisticas.busqueda("spur" if generacion != -1 else "dijkstra",
+                                       len(visitados), examinadas,
+                                       extracciones + len(cola), extracciones)
         return distancias, predecesores
 
     def reconstruir_camino(self, predecesores, destino):
@@ -80,63 +792,284 @@ class KPaths:
             nodo = predecesores[nodo]
         return list(reversed(camino))
 
-    def find_k_shortest_paths(self, origen, destino, k=3):
+    def find_k_shortest_paths(self, origen, destino, k=3, arbol=None):
         """
         Encuentra los K caminos más cortos entre dos nodos usando el algoritmo de Yen.
-        El primer camino se obtiene con Dijkstra, y los siguientes se generan
-        modificando temporalmente el grafo para encontrar rutas alternativas.
+        El primer camino se obtiene con Dijkstra bidireccional, A* (índice ALT)
+        o la jerarquía de contracción si se preparó una (o del árbol de caminos
+        mínimos `arbol` del origen, si se proporciona), y los siguientes se generan
+        prohibiendo temporalmente aristas y nodos (sin copiar el grafo) para
+        encontrar rutas alternativas.
+        Los resultados se guardan en la caché: una consulta con k mayor sirve
+        también para cualquier k menor del mismo par.
         """
-        distancias, predecesores = self.dijkstra(origen)
-        if np.isinf(distancias[destino]):
-            return []
+        if self.cache is None:
+            return self._yen(origen, destino, k, arbol)
+
+        clave = ("caminos", self.grafo.huella(), self.metodo, origen, destino)
+        guardada = self.cache.obtener(clave)
+        if guardada is not None:
+            k_guardado, caminos = guardada
+            # Con menos caminos que k_guardado ya no existen más caminos
+            if k <= k_guardado or len(caminos) < k_guardado:
+                return [(costo, list(camino)) for costo, camino in caminos[:k]]
 
-        primer_camino = self.reconstruir_camino(predecesores, destino)
-        A = [(distancias[destino], primer_camino)]  # Caminos confirmados
-        B = []  # Caminos candidatos
+        caminos = self._yen(origen, destino, k, arbol)
+        self.cache.guardar(clave, (k, [(costo, tuple(camino)) for costo, camino in caminos]),
+                           sum(len(camino) for _, camino in caminos) + 1)
+        return caminos
+
+    def consultar_lote(self, consultas, bloque=None):
+        """
+        Resuelve muchas consultas (origen, destino, k) sobre el grafo cargado.
+        Las consultas se agrupan por origen: cada origen con varios destinos
+        calcula un único árbol de caminos mínimos y lo comparte, y un mismo
+        par pedido con distintos k se resuelve una sola vez con el k mayor.
 
-        for i in range(1, k):
-            for j in range(len(A[i - 1][1]) - 1):
-                spur_node = A[i - 1][1][j]
-                root_path = A[i - 1][1][:j + 1]
+        Args:
+            consultas: Arreglo (q, 3) o iterable de tuplas (origen, destino, k)
+            bloque: Si se indica, retorna un generador que resuelve y entrega
+                los resultados de `bloque` consultas a la vez (los árboles se
+                comparten dentro de cada bloque), para lotes que no caben en
+                memoria de una vez
 
-                # Hacer una copia del grafo para modificar
-                matriz_copia = copy.deepcopy(self.matriz)
+        Returns:
+            Lista con el resultado de cada consulta en el orden de entrada
+            (lista de (costo, camino), como find_k_shortest_paths), o un
+            generador de esas listas por bloques
+        """
+        if self.grafo is None:
+            raise ValueError("No hay ningún grafo cargado")
+        consultas = np.asarray(consultas, dtype=np.int64).reshape(-1, 3)
+        if bloque is None:
+            return self._resolver_lote(consultas)
+        return (self._resolver_lote(consultas[inicio:inicio + bloque])
+                for inicio in range(0, len(consultas), bloque))
+
+    def _resolver_lote(self, consultas):
+        """Resuelve un bloque de consultas (ver consultar_lote)"""
+        resultados = [None] * len(consultas)
+        orden = np.argsort(consultas[:, 0], kind="stable")
+        cortes = np.flatnonzero(np.diff(consultas[orden, 0])) + 1
+
+        for grupo in np.split(orden, cortes):
+            if len(grupo) == 0:
+                continue
+            origen = int(consultas[grupo[0], 0])
+            por_destino = {}
+            for q in grupo.tolist():
+                por_destino.setdefault(int(consultas[q, 1]), []).append(q)
+            # Con un solo destino basta una búsqueda punto a punto
+            arbol = self.arbol_minimo(origen) if len(por_destino) > 1 else None
 
-                # Eliminar aristas que ya fueron usadas en caminos anteriores
+            for destino, indices in por_destino.items():
+                k_max = max(int(consultas[q, 2]) for q in indices)
+                caminos = self.find_k_shortest_paths(origen, destino, k_max, arbol)
+                for q in indices:
+                    k = max(int(consultas[q, 2]), 1)
+                    resultados[q] = [(costo, list(camino)) for costo, camino in caminos[:k]]
+        return resultados
+
+    def _yen(self, origen, destino, k, arbol=None):
+        """Algoritmo de Yen sin caché (ver find_k_shortest_paths)"""
+        return list(islice(self.iter_shortest_paths(origen, destino, arbol), max(k, 1)))
+
+    def iter_shortest_paths(self, origen, destino, arbol=None):
+        """
+        Generador de los caminos más cortos entre dos nodos en orden de costo
+        no decreciente, sin fijar k de antemano. Entre llamadas a next() se
+        conserva el estado de Yen (caminos confirmados y candidatos), así que
+        cada camino adicional solo cuesta sus propias búsquedas spur y se puede
+        parar con cualquier criterio (umbral de costo, predicado, etc.).
+        El grafo cargado no debe modificarse mientras se consume el generador.
+
+        Yields:
+            Tuplas (costo, camino)
+        """
+        est = self.estadisticas
+        inicio = time.perf_counter() if est is not None else 0
+        if arbol is None:
+            # Solo interesa un destino: la jerarquía de contracción, A* con el
+            # índice ALT o la búsqueda bidireccional no recorren todo el grafo
+            # como el árbol completo
+            if self.contraccion is not None:
+                _, primer_camino = self.contraccion.consulta(origen, destino)
+            elif self.alt is not None:
+                primer_camino = self._a_estrella(origen, destino, -1,
+                                                 self._potencial_destino(destino))
+            else:
+                _, primer_camino = bidirectional_dijkstra(self.grafo, origen, destino,
+                                                          self.estadisticas)
+            if primer_camino is None:
+                return
+            primer_costo = self.calcular_costo(primer_camino)
+        else:
+            distancias, predecesores = arbol
+            if destino not in distancias:
+                return
+            primer_camino = self.reconstruir_camino(predecesores, destino)
+            primer_costo = distancias[destino]
+
+        A = [(primer_costo, primer_camino)]  # Caminos confirmados
+        # Caminos candidatos: montículo de (costo, orden de llegada, camino).
+        # El orden de llegada desempata costos iguales sin comparar listas.
+        B = []
+        vistos = {tuple(primer_camino)}  # Firmas de todos los caminos generados
+        llegada = 0
+        if est is not None:
+            est.sumar_tiempo("primer_camino", time.perf_counter() - inicio)
+        yield primer_costo, list(primer_camino)
+
+        while True:
+            ultimo = A[-1][1]
+            if est is not None:
+                inicio = time.perf_counter()
+                llegada_inicial, duplicados = llegada, 0
+            for j in range(len(ultimo) - 1):
+                spur_node = ultimo[j]
+                root_path = ultimo[:j + 1]
+
+                # Nueva generación de la máscara: nada se copia ni se reserva
+                self._generacion += 1
+                generacion = self._generacion
+
+                # Prohibir aristas que ya fueron usadas en caminos anteriores
                 for costo, camino in A:
                     if len(camino) > j and camino[:j + 1] == root_path:
-                        n1 = camino[j]
-                        n2 = camino[j + 1]
-                        matriz_copia[n1][n2] = 0
+                        idx = self.grafo.indice_arista(camino[j], camino[j + 1])
+                        if idx >= 0:
+                            self._marca_arista[idx] = generacion
 
-                # Eliminar nodos del camino raíz excepto el spur_node
+                # Prohibir nodos del camino raíz excepto el spur_node
                 for nodo in root_path[:-1]:
-                    for vecino in range(self.num_nodos):
-                        matriz_copia[nodo][vecino] = 0
-                        matriz_copia[vecino][nodo] = 0
+                    self._marca_nodo[nodo] = generacion
 
                 # Calcular el camino desde el spur_node al destino
-                temp = KPaths()
-                temp.matriz = matriz_copia
-                temp.num_nodos = self.num_nodos
-                dist_spur, pred_spur = temp.dijkstra(spur_node)
+                spur_path = self._buscar_spur(spur_node, destino, generacion)
 
-                if not np.isinf(dist_spur[destino]):
-                    spur_path = temp.reconstruir_camino(pred_spur, destino)
+                if spur_path is not None:
                     total_path = root_path[:-1] + spur_path
-                    total_cost = self.calcular_costo(total_path)
-                    if (total_cost, total_path) not in B:
-                        B.append((total_cost, total_path))
+                    firma = tuple(total_path)
+                    if firma not in vistos:
+                        vistos.add(firma)
+                        total_cost = self.calcular_costo(total_path)
+                        heapq.heappush(B, (total_cost, llegada, total_path))
+                        llegada += 1
+                    elif est is not None:
+                        duplicados += 1
 
+            if est is not None:
+                est.sumar(busquedas_spur=len(ultimo) - 1,
+                          candidatos=llegada - llegada_inicial + duplicados,
+                          candidatos_duplicados=duplicados)
+                est.sumar_tiempo("spur", time.perf_counter() - inicio)
             if not B:
-                break
+                return
 
             # Seleccionar el candidato más corto y agregarlo a la lista de caminos confirmados
-            B.sort(key=lambda x: x[0])
-            A.append(B[0])
-            B.pop(0)
+            total_cost, _, total_path = heapq.heappop(B)
+            A.append((total_cost, total_path))
+            yield total_cost, list(total_path)
 
-        return A
+    def _buscar_spur(self, spur_node, destino, generacion):
+        """
+        Camino mínimo desde spur_node hasta destino evitando lo prohibido en
+        la generación indicada, o None si no existe.
+        """
+        if self.metodo == "yen":
+            if self.alt is not None:
+                return self._a_estrella(spur_node, destino, generacion,
+                                        self._potencial_destino(destino))
+            dist_spur, pred_spur = self._explorar(spur_node, generacion, destino=destino)
+            if destino not in dist_spur:
+                return None
+            return self.reconstruir_camino(pred_spur, destino)
+
+        potencial, sucesores = self._arbol_inverso(destino)
+        if potencial[spur_node] == np.inf:
+            return None
+
+        # Seguir el árbol hacia el destino: si nada está prohibido, es el
+        # camino mínimo y no hace falta ninguna búsqueda
+        camino = [spur_node]
+        nodo = spur_node
+        while nodo != destino:
+            siguiente = sucesores[nodo]
+            if (self._marca_nodo[siguiente] == generacion
+                    or self._marca_arista[self.grafo.indice_arista(nodo, siguiente)] == generacion):
+                return self._a_estrella(spur_node, destino, generacion, potencial)
+            camino.append(siguiente)
+            nodo = siguiente
+        return camino
+
+    def _arbol_inverso(self, destino):
+        """
+        Distancias de cada nodo hacia destino (lista, infinito si no llega) y
+        el siguiente nodo de su camino mínimo. Se calcula una vez por destino.
+        """
+        if destino not in self._arboles_inversos:
+            dist, pred = self._explorar(destino, grafo=self.grafo.transpuesto())
+            potencial = [np.inf] * self.num_nodos
+            for nodo, valor in dist.items():
+                potencial[nodo] = valor
+            self._arboles_inversos[destino] = (potencial, pred)
+        return self._arboles_inversos[destino]
+
+    def _potencial_destino(self, destino):
+        """Cotas ALT hacia destino (se guardan las del último destino usado)"""
+        if self._potencial_alt[0] != destino:
+            self._potencial_alt = (destino, self.alt.potencial(destino))
+        return self._potencial_alt[1]
+
+    def _a_estrella(self, origen, destino, generacion, potencial):
+        """
+        Búsqueda A* de origen a destino respetando la máscara. `potencial[u]`
+        debe ser una cota inferior de la distancia de u a destino; los nodos
+        con potencial infinito no pueden llegar y se descartan. Si la cota
+        no es consistente (p. ej. cotas ALT con margen de redondeo) un nodo
+        puede reabrirse, así el camino sigue siendo mínimo.
+        Retorna el camino o None.
+        """
+        offsets, targets, weights = self.grafo.listas()
+        marca_nodo = self._marca_nodo
+        marca_arista = self._marca_arista
+        distancias = {origen: 0}
+        predecesores = {origen: None}
+        cola = [(potencial[origen], origen, 0)]
+        camino = None
+        extracciones = fijados = examinadas = 0
+
+        while cola:
+            _, actual, dist = heapq.heappop(cola)
+            extracciones += 1
+            if dist > distancias[actual]:
+                continue  # entrada obsoleta
+            fijados += 1
+            if actual == destino:
+                camino = self.reconstruir_camino(predecesores, destino)
+                break
+
+            inicio, fin = offsets[actual], offsets[actual + 1]
+            examinadas += fin - inicio
+            for idx in range(inicio, fin):
+                vecino = targets[idx]
+                peso = weights[idx]
+                if (peso > 0
+                        and marca_arista[idx] != generacion
+                        and marca_nodo[vecino] != generacion):
+                    cota = potencial[vecino]
+                    if cota == np.inf:
+                        continue
+                    nueva_dist = dist + peso
+                    if nueva_dist < distancias.get(vecino, np.inf):
+                        distancias[vecino] = nueva_dist
+                        predecesores[vecino] = actual
+                        heapq.heappush(cola, (nueva_dist + cota, vecino, nueva_dist))
+
+        if self.estadisticas is not None:
+            self.estadisticas.busqueda("a_estrella", fijados, examinadas,
+                                       extracciones + len(cola), extracciones)
+        return camino
 
     def calcular_costo(self, camino):
         """
@@ -146,8 +1079,44 @@ class KPaths:
         costo = 0
         for i in range(len(camino) - 1):
             a, b = camino[i], camino[i + 1]
-            peso = self.matriz[a][b]
+            peso = self.grafo.peso(a, b)
             if peso == 0:
                 return np.inf
             costo += peso
         return costo
+
+
+def _valores_k(k):
+    """Tupla ordenada de valores de k a partir de un máximo o de una secuencia"""
+    if isinstance(k, (int, np.integer)):
+        ks = tuple(range(1, int(k) + 1))
+    else:
+        ks = tuple(sorted({int(valor) for valor in k}))
+    if not ks or ks[0] < 1:
+        raise ValueError(f"Los valores de k deben ser enteros positivos: {k!r}")
+    return ks
+
+
+def _espejar(costos):
+    """Copia la parte superior de un tensor (n, n, K) sobre la inferior"""
+    inferior = np.tril_indices(costos.shape[0], -1)
+    costos[inferior] = costos.transpose(1, 0, 2)[inferior]
+
+
+def _indices_caminos(por_par, n, num_k):
+    """Tensor int32 (n, n, K, L) de caminos rellenado con -1 (ver compute_tensor)"""
+    largo = max((len(camino) for caminos in por_par.values() for camino in caminos), default=0)
+    indices = np.full((n, n, num_k, largo), -1, dtype=np.int32)
+    for (i, j), caminos in por_par.items():
+        for t, camino in enumerate(caminos):
+            indices[i, j, t, :len(camino)] = camino
+    return indices
+
+
+def _costo_k(caminos, k):
+    """Costo del k-ésimo camino (o del último si hay menos de k; infinito si no hay)"""
+    if len(caminos) >= k:
+        return caminos[k - 1][0]
+    if caminos:
+        return caminos[-1][0]
+    return np.inf
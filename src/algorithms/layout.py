@@ -0,0 +1,222 @@
+"""
+Disposición de nodos por fuerzas (Fruchterman–Reingold)
+
+Las aristas atraen a sus extremos (f = d² / k) y todos los nodos se repelen
+entre sí (f = k² / d). La repulsión entre todos los pares es O(n²); aquí se
+aproxima con un quadtree al estilo Barnes–Hut: en cada nivel l, los nodos
+de una celda interactúan con el centro de masas de las celdas que no son
+vecinas suyas pero cuyo padre sí es vecino del padre de la celda (su lista
+de interacción). Así cada par de nodos se cuenta una sola vez: lejos, como
+centro de masas de la celda más grande posible; en celdas vecinas del
+nivel más fino, de forma exacta.
+
+Todo el cálculo está vectorizado con NumPy: por nivel son 27 operaciones
+sobre arreglos de n elementos, y el campo cercano se calcula sobre listas
+de pares de celdas vecinas. Cada paso cuesta O(n log n + m).
+"""
+
+import math
+
+import numpy as np
+
+from .csr import as_csr
+
+
+class DisposicionFuerzas:
+    """
+    Disposición incremental: cada llamada a paso() avanza unas iteraciones y
+    deja las posiciones actuales en `posiciones`, para poder mostrarlas
+    mientras el cálculo continúa.
+    """
+
+    ENFRIAMIENTO = 0.99      # factor de la temperatura en cada iteración
+    TEMPERATURA_MINIMA = 0.01  # en unidades de k; por debajo se da por terminada
+    GRAVEDAD = 0.1           # atracción hacia el centro (f = GRAVEDAD · d)
+
+    def __init__(self, grafo, posiciones=None, ancho=None, alto=None, semilla=None):
+        """
+        Args:
+            grafo: Matriz de adyacencia o CSRGraph (se ignora la dirección
+                de las aristas y su peso)
+            posiciones: Arreglo (n, 2) inicial; si falta, posiciones aleatorias
+            ancho, alto: Tamaño mínimo del área de partida (crece con la
+                raíz de n); fija la distancia ideal k entre nodos. Los nodos
+                no se limitan a esta área: un marco fijo los amontona en los
+                bordes y pliega la disposición.
+            semilla: Semilla para las posiciones aleatorias
+        """
+        csr = as_csr(grafo)
+        n = csr.num_nodos
+        self.num_nodos = n
+
+        # Aristas no dirigidas sin repetir ni lazos
+        origenes = np.repeat(np.arange(n, dtype=np.int64), np.diff(csr.offsets))
+        destinos = csr.targets.astype(np.int64)
+        distintos = origenes != destinos
+        menor = np.minimum(origenes, destinos)[distintos]
+        mayor = np.maximum(origenes, destinos)[distintos]
+        claves = np.unique(menor * max(n, 1) + mayor)
+        self.origenes = claves // max(n, 1)
+        self.destinos = claves % max(n, 1)
+
+        lado = 50.0 * math.sqrt(max(n, 1))
+        self.ancho = max(float(ancho or 0), lado)
+        self.alto = max(float(alto or 0), lado)
+        self.k = math.sqrt(self.ancho * self.alto / max(n, 1))
+        if posiciones is None:
+            rng = np.random.default_rng(semilla)
+            posiciones = rng.random((n, 2)) * (self.ancho, self.alto)
+        self.posiciones = np.array(posiciones, dtype=np.float64).reshape(n, 2)
+        self.temperatura = max(self.ancho, self.alto) / 10
+        self.iteraciones = 0
+
+        # Niveles del quadtree: unos pocos nodos por celda en el más fino
+        self.profundidad = int(min(9, max(2, math.ceil(math.log(max(n, 2) / 2, 4)))))
+
+    @property
+    def terminado(self):
+        """True cuando la temperatura ya no mueve los nodos de forma apreciable"""
+        return self.num_nodos < 2 or self.temperatura < self.TEMPERATURA_MINIMA * self.k
+
+    def paso(self, iteraciones=1):
+        """
+        Avanza la disposición
+
+        Args:
+            iteraciones: Número de iteraciones a realizar
+
+        Returns:
+            Arreglo (n, 2) con las posiciones actuales (el mismo objeto en
+            cada llamada; cópielo si otro hilo lo va a leer)
+        """
+        for _ in range(iteraciones):
+            if self.terminado:
+                break
+            desplazamiento = self._repulsion() + self._atraccion()
+            # Gravedad: sin ella los nodos aislados y las componentes
+            # sueltas se alejan sin límite
+            desplazamiento -= self.GRAVEDAD * (self.posiciones - self.posiciones.mean(axis=0))
+            norma = np.hypot(desplazamiento[:, 0], desplazamiento[:, 1])
+            escala = np.minimum(norma, self.temperatura) / np.maximum(norma, 1e-12)
+            self.posiciones += desplazamiento * escala[:, None]
+            self.temperatura *= self.ENFRIAMIENTO
+            self.iteraciones += 1
+        return self.posiciones
+
+    def _atraccion(self):
+        pos = self.posiciones
+        n = self.num_nodos
+        delta = pos[self.origenes] - pos[self.destinos]
+        distancia = np.hypot(delta[:, 0], delta[:, 1])
+        fuerza = delta * (distancia / self.k)[:, None]
+        resultado = np.empty((n, 2))
+        for eje in range(2):
+            resultado[:, eje] = (np.bincount(self.destinos, fuerza[:, eje], n)
+                                 - np.bincount(self.origenes, fuerza[:, eje], n))
+        return resultado
+
+    def _repulsion(self):
+        x, y = self.posiciones[:, 0], self.posiciones[:, 1]
+        n = self.num_nodos
+        k2 = self.k * self.k
+        minimo = (0.01 * self.k) ** 2  # evita fuerzas enormes entre nodos casi coincidentes
+        # El quadtree cubre el 99 % central de los nodos; los pocos que quedan
+        # fuera (nodos aislados, componentes sueltas) van a las celdas del
+        # borde, así no dejan al resto concentrado en unas pocas celdas
+        x0, x1 = np.quantile(x, (0.005, 0.995))
+        y0, y1 = np.quantile(y, (0.005, 0.995))
+        tamano = max(x1 - x0, y1 - y0, 1e-9) * 1.1
+        x0, y0 = (x0 + x1 - tamano) / 2, (y0 + y1 - tamano) / 2
+        rx = np.clip((x - x0) / tamano, 0, 1 - 1e-9)
+        ry = np.clip((y - y0) / tamano, 0, 1 - 1e-9)
+        fx = np.zeros(n)
+        fy = np.zeros(n)
+
+        # Campo lejano: listas de interacción de cada nivel. Las 36 celdas
+        # hijas de los vecinos del padre se leen de tablas con un borde de dos
+        # celdas vacías (sin comprobar límites); según la posición del nodo
+        # dentro de su padre, 9 de ellas son vecinas y se saltan.
+        for nivel in range(2, self.profundidad + 1):
+            lado = 1 << nivel
+            ancho_tabla = lado + 4
+            cx = np.minimum((rx * lado).astype(np.int64), lado - 1)
+            cy = np.minimum((ry * lado).astype(np.int64), lado - 1)
+            ident = (cx + 2) * ancho_tabla + cy + 2
+            celdas = ancho_tabla * ancho_tabla
+            masa = np.bincount(ident, minlength=celdas).astype(np.float64)
+            ocupada = np.maximum(masa, 1)
+            centro_x = np.bincount(ident, x, celdas) / ocupada
+            centro_y = np.bincount(ident, y, celdas) / ocupada
+            base = (cx // 2 * 2) * ancho_tabla + cy // 2 * 2  # esquina del bloque 6x6
+            paridad = (cx % 2) * 2 + cy % 2
+            for px in (0, 1):
+                for py in (0, 1):
+                    grupo = np.flatnonzero(paridad == px * 2 + py)
+                    if len(grupo) == 0:
+                        continue
+                    gx, gy, gbase = x[grupo], y[grupo], base[grupo]
+                    gfx = np.zeros(len(grupo))
+                    gfy = np.zeros(len(grupo))
+                    for a in range(6):
+                        for b in range(6):
+                            if abs(a - 2 - px) <= 1 and abs(b - 2 - py) <= 1:
+                                continue  # celda vecina: nivel siguiente
+                            indice = gbase + (a * ancho_tabla + b)
+                            dx = gx - centro_x[indice]
+                            dy = gy - centro_y[indice]
+                            w = masa[indice] / np.maximum(dx * dx + dy * dy, minimo)
+                            gfx += dx * w
+                            gfy += dy * w
+                    fx[grupo] += k2 * gfx
+                    fy[grupo] += k2 * gfy
+
+        # Campo cercano exacto: pares de nodos en la misma celda o en celdas
+        # vecinas del nivel más fino. Cada par se genera una vez (la celda
+        # propia y cuatro de las ocho vecinas) y se aplica a ambos extremos.
+        lado = 1 << self.profundidad
+        cx = np.minimum((rx * lado).astype(np.int64), lado - 1)
+        cy = np.minimum((ry * lado).astype(np.int64), lado - 1)
+        ident = cx * lado + cy
+        orden = np.argsort(ident, kind="stable")
+        inicio = np.searchsorted(ident[orden], np.arange(lado * lado + 1))
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            vx, vy = cx + dx, cy + dy
+            sel = np.flatnonzero((vx < lado) & (vy >= 0) & (vy < lado))
+            indice = vx[sel] * lado + vy[sel]
+            primero = inicio[indice]
+            cuantos = inicio[indice + 1] - primero
+            total = int(cuantos.sum())
+            if total == 0:
+                continue
+            propio = np.repeat(sel, cuantos)
+            desplazamiento = np.arange(total) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+            otro = orden[np.repeat(primero, cuantos) + desplazamiento]
+            if dx == 0 and dy == 0:
+                unico = propio < otro  # misma celda: cada par una sola vez
+                propio, otro = propio[unico], otro[unico]
+            ddx = x[propio] - x[otro]
+            ddy = y[propio] - y[otro]
+            w = k2 / np.maximum(ddx * ddx + ddy * ddy, minimo)
+            ddx *= w
+            ddy *= w
+            fx += np.bincount(propio, ddx, n) - np.bincount(otro, ddx, n)
+            fy += np.bincount(propio, ddy, n) - np.bincount(otro, ddy, n)
+        return np.column_stack([fx, fy])
+
+
+def fruchterman_reingold(grafo, iteraciones=None, **opciones):
+    """
+    Calcula una disposición completa
+
+    Args:
+        grafo: Matriz de adyacencia o CSRGraph
+        iteraciones: Máximo de iteraciones (por defecto, hasta que se enfríe)
+        **opciones: Argumentos de DisposicionFuerzas (posiciones, ancho, alto, semilla)
+
+    Returns:
+        Arreglo (n, 2) con la posición de cada nodo
+    """
+    disposicion = DisposicionFuerzas(grafo, **opciones)
+    while not disposicion.terminado and (iteraciones is None or disposicion.iteraciones < iteraciones):
+        disposicion.paso()
+    return disposicion.posiciones
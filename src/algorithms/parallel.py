@@ -0,0 +1,165 @@
+"""
+Cálculo paralelo de la matriz de k caminos más cortos
+
+Las filas de la matriz son independientes entre sí, así que se reparten entre
+un grupo de procesos. Los arreglos CSR del grafo se publican una sola vez en
+memoria compartida; cada proceso los adjunta sin copiarlos ni recibirlos
+serializados.
+
+La memoria compartida evita serializar el grafo, pero no que cada proceso
+tenga su propia copia: los bucles de Dijkstra recorren listas de Python
+(CSRGraph.listas), que son varias veces más rápidas de indexar que los
+arreglos, y cada trabajador las construye en su primera búsqueda junto con
+las máscaras de Yen. Son unos 60 bytes por arista y por trabajador (frente
+a 13 en los arreglos compartidos), así que la memoria total crece como
+O(workers * m).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .csr import CSRGraph
+
+# Estado de cada proceso trabajador (se inicializa en _iniciar_trabajador)
+_kpaths = None
+_bloques = []
+
+
+def _compartir(arreglo):
+    """
+    Copia un arreglo a un bloque de memoria compartida
+
+    Returns:
+        bloque: SharedMemory creado (el llamador debe liberarlo)
+        descriptor: Tupla (nombre, forma, dtype) para adjuntarlo en otro proceso
+    """
+    bloque = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+    vista = np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=bloque.buf)
+    vista[...] = arreglo
+    return bloque, (bloque.name, arreglo.shape, arreglo.dtype.str)
+
+
+def _adjuntar(descriptor):
+    """
+    Adjunta un bloque de memoria compartida creado por el proceso principal
+
+    Returns:
+        bloque: SharedMemory adjuntado
+        arreglo: Vista NumPy sobre el bloque (sin copia)
+    """
+    nombre, forma, dtype = descriptor
+    # Los trabajadores comparten el resource_tracker del proceso principal,
+    # que es quien libera el bloque al terminar
+    bloque = shared_memory.SharedMemory(name=nombre)
+    return bloque, np.ndarray(forma, dtype=np.dtype(dtype), buffer=bloque.buf)
+
+
+def _iniciar_trabajador(descriptores, metodo):
+    """
+    Construye el KPaths del trabajador sobre los arreglos compartidos. La
+    primera búsqueda copia el grafo a listas privadas del proceso (ver el
+    docstring del módulo)
+    """
+    global _kpaths, _bloques
+    from .k_paths import KPaths
+
+    vistas = []
+    for descriptor in descriptores:
+        bloque, arreglo = _adjuntar(descriptor)
+        _bloques.append(bloque)
+        vistas.append(arreglo)
+
+    _kpaths = KPaths(metodo)
+    _kpaths.cargar_grafo(CSRGraph(*vistas))
+
+
+def _calcular_fila(tarea):
+    """Calcula una fila de la matriz en el proceso trabajador"""
+    i, k, simetrico = tarea
+    return i, _kpaths._calcular_fila(i, k, simetrico)
+
+
+def _repartir(grafo, tareas, funcion, workers, metodo, estadisticas):
+    """
+    Publica el grafo en memoria compartida y reparte las tareas entre procesos
+
+    Yields:
+        El resultado de funcion(tarea) para cada tarea, en orden
+    """
+    n = grafo.num_nodos
+    bloques = []
+    descriptores = []
+    try:
+        for arreglo in (grafo.offsets, grafo.targets, grafo.weights):
+            bloque, descriptor = _compartir(arreglo)
+            if estadisticas is not None:
+                estadisticas.sumar(bytes_copiados=arreglo.nbytes)
+            bloques.append(bloque)
+            descriptores.append(descriptor)
+
+        # Bloques pequeños para equilibrar carga: en grafos no dirigidos las
+        # primeras filas tienen mucho más trabajo que las últimas
+        tamano_bloque = max(1, n // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_iniciar_trabajador,
+                                 initargs=(descriptores, metodo)) as pool:
+            yield from pool.map(funcion, tareas, chunksize=tamano_bloque)
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+
+
+def compute_parallel(grafo, k, workers, simetrico, metodo="yen", estadisticas=None):
+    """
+    Calcula la matriz de k caminos repartiendo las filas entre procesos
+
+    Args:
+        grafo: CSRGraph del que se calculan los caminos
+        k: Posición del camino cuyo costo se reporta
+        workers: Número de procesos
+        simetrico: Si el grafo es no dirigido (solo se calcula j > i)
+        metodo: Motor de KPaths que usará cada trabajador
+        estadisticas: Estadisticas opcionales; solo se cuentan los bytes
+            publicados en memoria compartida (las búsquedas ocurren en los
+            trabajadores)
+
+    Returns:
+        Matriz NumPy n x n con los costos (la diagonal queda en infinito)
+    """
+    n = grafo.num_nodos
+    matriz_k = np.full((n, n), np.inf)
+    tareas = [(i, k, simetrico) for i in range(n)]
+    for i, fila in _repartir(grafo, tareas, _calcular_fila, workers, metodo, estadisticas):
+        inicio = i + 1 if simetrico else 0
+        matriz_k[i, inicio:] = fila
+    return matriz_k
+
+
+def _calcular_fila_tensor(tarea):
+    """Calcula una fila del tensor de compute_tensor en el proceso trabajador"""
+    i, ks, simetrico, con_caminos = tarea
+    return (i, *_kpaths._fila_tensor(i, ks, simetrico, con_caminos))
+
+
+def compute_parallel_tensor(grafo, ks, workers, simetrico, metodo, costos, por_par=None,
+                            estadisticas=None):
+    """
+    Versión de compute_parallel para KPaths.compute_tensor: llena en su lugar
+    la parte calculada (j > i si el grafo es simétrico) del tensor costos
+
+    Args:
+        ks: Tupla ordenada de valores de k
+        costos: Arreglo (n, n, K) a llenar
+        por_par: Diccionario donde guardar los caminos de cada par, o None
+            para no transferirlos desde los trabajadores
+    """
+    tareas = [(i, ks, simetrico, por_par is not None) for i in range(grafo.num_nodos)]
+    for i, fila, caminos in _repartir(grafo, tareas, _calcular_fila_tensor, workers, metodo,
+                                      estadisticas):
+        inicio = i + 1 if simetrico else 0
+        costos[i, inicio:] = fila
+        if por_par is not None:
+            por_par.update(caminos)
@@ -4,20 +4,30 @@ Implementación de algoritmos de camino más corto
 
 import heapq
 
+import numpy as np
 
-def dijkstra(matrix, start):
+from .csr import as_csr
+
+
+def dijkstra(matrix, start, target=None, stats=None):
     """
     Algoritmo de Dijkstra para encontrar el camino más corto desde un nodo origen
     
     Args:
-        matrix: Matriz de adyacencia del grafo
+        matrix: Matriz de adyacencia del grafo o CSRGraph
         start: Nodo de inicio
+        target: Nodo destino opcional; la búsqueda termina en cuanto se fija
+            su distancia. Solo las distancias de los nodos ya fijados son
+            exactas: las del resto quedan en infinito (y su predecesor en -1)
+        stats: Estadisticas opcionales donde registrar la búsqueda
         
     Returns:
         distances: Lista de distancias mínimas desde start a cada nodo
         predecessors: Lista de predecesores para reconstruir caminos
     """
-    n = len(matrix)
+    graph = as_csr(matrix)
+    offsets, targets, weights = graph.listas()
+    n = graph.num_nodos
     distances = [float('inf')] * n
     predecessors = [-1] * n
     distances[start] = 0
@@ -25,29 +35,128 @@ def dijkstra(matrix, start):
     # Cola de prioridad: (distancia, nodo)
     pq = [(0, start)]
     visited = set()
+    pops = 0
     
     while pq:
         current_dist, u = heapq.heappop(pq)
+        pops += 1
         
         if u in visited:
             continue
             
         visited.add(u)
+        if u == target:
+            break
         
-        # Explorar vecinos
-        for v in range(n):
-            if matrix[u][v] > 0:  # Hay arista
-                weight = matrix[u][v]
+        # Explorar vecinos (solo las aristas salientes de u)
+        for idx in range(offsets[u], offsets[u + 1]):
+            weight = weights[idx]
+            if weight > 0:  # Hay arista
+                v = targets[idx]
                 distance = current_dist + weight
                 
                 if distance < distances[v]:
                     distances[v] = distance
                     predecessors[v] = u
                     heapq.heappush(pq, (distance, v))
+    
+    if stats is not None:
+        # Los totales se derivan al final para no contar dentro del bucle
+        scanned = sum(offsets[u + 1] - offsets[u] for u in visited)
+        if target in visited:
+            scanned -= offsets[target + 1] - offsets[target]
+        stats.busqueda("dijkstra", len(visited), scanned, pops + len(pq), pops)
+
+    if target in visited and len(visited) < n:
+        # Parada anticipada: las distancias provisionales de los nodos no
+        # fijados son solo cotas superiores y podrían tomarse por exactas
+        for v in range(n):
+            if v not in visited:
+                distances[v] = float('inf')
+                predecessors[v] = -1
                     
     return distances, predecessors
 
 
+def bidirectional_dijkstra(matrix, start, end, stats=None):
+    """
+    Dijkstra bidireccional para un único par de nodos
+    
+    Avanza a la vez desde start (sobre el grafo) y desde end (sobre el grafo
+    transpuesto), siempre por el lado con menor distancia pendiente, y se
+    detiene cuando la suma de ambos frentes ya no puede mejorar el mejor
+    camino encontrado. Suele visitar muchos menos nodos que una búsqueda
+    desde un solo extremo.
+    
+    Args:
+        matrix: Matriz de adyacencia del grafo o CSRGraph
+        start: Nodo inicial
+        end: Nodo final
+        stats: Estadisticas opcionales donde registrar la búsqueda
+        
+    Returns:
+        distance: Distancia mínima (inf si no hay camino)
+        path: Lista con el camino [start, ..., end] o None si no existe
+    """
+    graph = as_csr(matrix)
+    if start == end:
+        return 0, [start]
+    
+    sides = (graph.listas(), graph.transpuesto().listas())
+    distances = ({start: 0}, {end: 0})
+    parents = ({start: None}, {end: None})
+    visited = (set(), set())
+    pqs = ([(0, start)], [(0, end)])
+    best, meeting = float('inf'), None
+    pops = 0
+    
+    while pqs[0] and pqs[1]:
+        if pqs[0][0][0] + pqs[1][0][0] >= best:
+            break
+        # Avanzar el frente con menor distancia pendiente
+        side = 0 if pqs[0][0][0] <= pqs[1][0][0] else 1
+        current_dist, u = heapq.heappop(pqs[side])
+        pops += 1
+        if u in visited[side]:
+            continue
+        visited[side].add(u)
+        
+        offsets, targets, weights = sides[side]
+        own, other = distances[side], distances[1 - side]
+        for idx in range(offsets[u], offsets[u + 1]):
+            weight = weights[idx]
+            if weight > 0:
+                v = targets[idx]
+                distance = current_dist + weight
+                if distance < own.get(v, float('inf')):
+                    own[v] = distance
+                    parents[side][v] = u
+                    heapq.heappush(pqs[side], (distance, v))
+                if v in other and own[v] + other[v] < best:
+                    best, meeting = own[v] + other[v], v
+    
+    if stats is not None:
+        scanned = sum(sides[side][0][u + 1] - sides[side][0][u]
+                      for side in (0, 1) for u in visited[side])
+        stats.busqueda("bidireccional", len(visited[0]) + len(visited[1]), scanned,
+                       pops + len(pqs[0]) + len(pqs[1]), pops)
+    
+    if meeting is None:
+        return float('inf'), None
+    
+    path = []
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+    node = parents[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    return best, path
+
+
 def reconstruct_path(predecessors, start, end):
     """
     Reconstruye el camino desde start hasta end usando los predecesores
@@ -76,38 +185,44 @@ def reconstruct_path(predecessors, start, end):
     return path if path[0] == start else None
 
 
-def floyd_warshall(matrix):
+def floyd_warshall(matrix, dtype=np.float64):
     """
     Algoritmo de Floyd-Warshall para encontrar todos los caminos más cortos
     
+    Cada pivote se procesa con una única operación vectorizada de NumPy sobre
+    la matriz completa, en lugar de un doble bucle de Python.
+    
     Args:
-        matrix: Matriz de adyacencia del grafo
+        matrix: Matriz de adyacencia del grafo o CSRGraph
+        dtype: Tipo de las distancias (np.float32 reduce la memoria a la mitad)
         
     Returns:
-        dist: Matriz de distancias mínimas entre todos los pares de nodos
-        next_node: Matriz para reconstruir caminos
+        dist: Matriz NumPy de distancias mínimas entre todos los pares de nodos
+        next_node: Matriz NumPy int32 con el siguiente nodo de cada camino (-1 si no hay)
     """
-    n = len(matrix)
+    graph = as_csr(matrix)
+    n = graph.num_nodos
     
     # Inicializar matrices
-    dist = [[float('inf')] * n for _ in range(n)]
-    next_node = [[-1] * n for _ in range(n)]
+    dist = np.full((n, n), np.inf, dtype=dtype)
+    next_node = np.full((n, n), -1, dtype=np.int32)
     
     # Configuración inicial
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                dist[i][j] = 0
-            elif matrix[i][j] > 0:
-                dist[i][j] = matrix[i][j]
-                next_node[i][j] = j
-                
-    # Algoritmo principal
+    sources = np.repeat(np.arange(n), np.diff(graph.offsets))
+    edges = (graph.weights > 0) & (sources != graph.targets)
+    sources, targets = sources[edges], graph.targets[edges]
+    dist[sources, targets] = graph.weights[edges]
+    next_node[sources, targets] = targets
+    np.fill_diagonal(dist, 0)
+    
+    # Algoritmo principal: la fila y la columna del pivote no cambian en su
+    # propia iteración, así que pueden leerse mientras se actualiza dist
+    candidate = np.empty_like(dist)
+    improves = np.empty((n, n), dtype=bool)
     for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                if dist[i][k] + dist[k][j] < dist[i][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
-                    next_node[i][j] = next_node[i][k]
+        np.add(dist[:, k, None], dist[None, k, :], out=candidate)
+        np.less(candidate, dist, out=improves)
+        np.copyto(next_node, next_node[:, k, None], where=improves)
+        np.minimum(dist, candidate, out=dist)
                     
     return dist, next_node
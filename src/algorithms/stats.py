@@ -0,0 +1,102 @@
+"""
+Instrumentación opcional de las búsquedas
+
+Un objeto Estadisticas acumula contadores de operaciones y tiempos por fase.
+Las funciones instrumentadas lo reciben como parámetro (o KPaths lo guarda
+en su atributo `estadisticas`); con None no se registra nada y el único
+costo es un contador local por extracción de la cola. Los totales de cada
+búsqueda se suman al terminarla, no dentro del bucle.
+"""
+
+import time
+from contextlib import contextmanager
+
+CONTADORES = (
+    "nodos_fijados",          # nodos extraídos de la cola por primera vez
+    "aristas_examinadas",     # aristas salientes recorridas de nodos fijados
+    "inserciones_cola",       # heappush (incluye el nodo inicial)
+    "extracciones_cola",      # heappop (incluye entradas obsoletas)
+    "busquedas",              # búsquedas de caminos mínimos completas
+    "busquedas_spur",         # búsquedas desde un spur node en Yen
+    "candidatos",             # caminos candidatos generados en Yen
+    "candidatos_duplicados",  # candidatos descartados por repetidos
+    "bytes_copiados",         # bytes de matrices y arreglos copiados
+)
+
+
+class Estadisticas:
+    """Contadores de operaciones y tiempos por fase"""
+
+    def __init__(self, callback=None):
+        """
+        Args:
+            callback: Función opcional callback(evento, datos) que se llama
+                al terminar cada búsqueda ("busqueda", con sus contadores) y
+                cada fase ("fase", con nombre y segundos)
+        """
+        self.callback = callback
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Pone todos los contadores y tiempos a cero"""
+        for nombre in CONTADORES:
+            setattr(self, nombre, 0)
+        self.tiempos = {}
+
+    def busqueda(self, tipo, fijados, examinadas, inserciones, extracciones):
+        """Registra los totales de una búsqueda de caminos mínimos"""
+        self.busquedas += 1
+        self.nodos_fijados += fijados
+        self.aristas_examinadas += examinadas
+        self.inserciones_cola += inserciones
+        self.extracciones_cola += extracciones
+        if self.callback is not None:
+            self.callback("busqueda", {"tipo": tipo, "nodos_fijados": fijados,
+                                       "aristas_examinadas": examinadas,
+                                       "inserciones_cola": inserciones,
+                                       "extracciones_cola": extracciones})
+
+    def sumar(self, **contadores):
+        """Suma valores a contadores por nombre (p. ej. bytes_copiados=...)"""
+        for nombre, valor in contadores.items():
+            setattr(self, nombre, getattr(self, nombre) + valor)
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el tiempo de un bloque y lo acumula en tiempos[nombre]"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sumar_tiempo(nombre, time.perf_counter() - inicio)
+
+    def sumar_tiempo(self, nombre, segundos):
+        """Acumula segundos medidos por fuera en tiempos[nombre]"""
+        self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + segundos
+        if self.callback is not None:
+            self.callback("fase", {"nombre": nombre, "segundos": segundos})
+
+    def como_dict(self):
+        """
+        Returns:
+            Diccionario con todos los contadores y los tiempos por fase
+        """
+        datos = {nombre: getattr(self, nombre) for nombre in CONTADORES}
+        datos["tiempos"] = dict(self.tiempos)
+        return datos
+
+    def __repr__(self):
+        contadores = ", ".join(f"{nombre}={getattr(self, nombre)}" for nombre in CONTADORES)
+        return f"Estadisticas({contadores})"
+
+
+@contextmanager
+def _sin_fase():
+    yield
+
+
+def fase(estadisticas, nombre):
+    """Contexto de fase que no hace nada si estadisticas es None"""
+    if estadisticas is None:
+        return _sin_fase()
+    return estadisticas.fase(nombre)
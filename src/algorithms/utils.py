@@ -2,6 +2,10 @@
 Funciones utilitarias para algoritmos de grafos
 """
 
+import numpy as np
+
+from .csr import CSRGraph
+
 
 def print_matrix(matrix, title="Matriz"):
     """
@@ -56,7 +60,7 @@ def validate_matrix(matrix):
     return True
 
 
-def generate_random_matrix(n, density=0.4, max_weight=15):
+def generate_random_matrix(n, density=0.4, max_weight=15, seed=None):
     """
     Genera una matriz de adyacencia aleatoria
     
@@ -64,14 +68,20 @@ def generate_random_matrix(n, density=0.4, max_weight=15):
         n: Número de nodos
         density: Probabilidad de conexión entre nodos (0.0 a 1.0)
         max_weight: Peso máximo de las aristas
+        seed: Semilla opcional para reproducir el grafo. Con una semilla se
+            usa generate_erdos_renyi (NumPy, O(n + m)); sin ella se sortea
+            cada par con el módulo random, así random.seed(...) sigue dando
+            las mismas matrices que antes
         
     Returns:
         Matriz de adyacencia aleatoria
     """
+    if seed is not None:
+        return generate_erdos_renyi(n, density, max_weight, seed).to_matrix().tolist()
+    
     import random
     
     matrix = [[0] * n for _ in range(n)]
-    
     for i in range(n):
         for j in range(i+1, n):
             if random.random() < density:
@@ -80,3 +90,245 @@ def generate_random_matrix(n, density=0.4, max_weight=15):
                 matrix[j][i] = weight
                 
     return matrix
+
+
+def generate_erdos_renyi(n, p, max_weight=15, seed=None, connected=False):
+    """
+    Genera un grafo aleatorio G(n, p) no dirigido en O(n + m)
+    
+    En lugar de sortear cada uno de los n(n-1)/2 pares, se sortean los saltos
+    geométricos entre aristas consecutivas (método de Batagelj y Brandes).
+    
+    Args:
+        n: Número de nodos
+        p: Probabilidad de conexión entre cada par de nodos
+        max_weight: Peso máximo de las aristas (pesos enteros desde 1)
+        seed: Semilla del generador
+        connected: Si es True, se agregan aristas hasta que el grafo sea conexo
+        
+    Returns:
+        CSRGraph no dirigido
+    """
+    rng = np.random.default_rng(seed)
+    total = n * (n - 1) // 2
+    
+    if p <= 0 or total == 0:
+        indices = np.empty(0, dtype=np.int64)
+    elif p >= 1:
+        indices = np.arange(total, dtype=np.int64)
+    else:
+        # Posiciones de las aristas dentro de la lista de pares (i < j)
+        bloques = []
+        ultimo = -1
+        tamano = max(16, int(total * p * 1.1) + 16)
+        while ultimo < total:
+            saltos = rng.geometric(p, tamano)
+            posiciones = ultimo + np.cumsum(saltos)
+            bloques.append(posiciones[posiciones < total])
+            ultimo = posiciones[-1]
+        indices = np.concatenate(bloques)
+    
+    # Convertir cada posición lineal en el par (i, j) del triángulo superior
+    origenes = np.floor(((2 * n - 1) - np.sqrt((2 * n - 1) ** 2 - 8.0 * indices)) / 2).astype(np.int64)
+    inicio_fila = origenes * (2 * n - origenes - 1) // 2
+    # Corregir redondeos de la raíz cuadrada
+    origenes -= indices < inicio_fila
+    inicio_fila = origenes * (2 * n - origenes - 1) // 2
+    siguiente_fila = (origenes + 1) * (2 * n - origenes - 2) // 2
+    origenes += indices >= siguiente_fila
+    inicio_fila = origenes * (2 * n - origenes - 1) // 2
+    destinos = indices - inicio_fila + origenes + 1
+    
+    pesos = rng.integers(1, max_weight + 1, len(origenes))
+    return _undirected_graph(n, origenes, destinos, pesos, rng, max_weight, connected)
+
+
+def generate_grid(rows, cols, max_weight=15, seed=None, diagonals=False):
+    """
+    Genera una malla 2-D (cada nodo conectado con sus vecinos)
+    
+    Args:
+        rows: Número de filas
+        cols: Número de columnas
+        max_weight: Peso máximo de las aristas
+        seed: Semilla del generador
+        diagonals: Si es True, también se conectan los vecinos diagonales
+        
+    Returns:
+        CSRGraph no dirigido con rows * cols nodos (nodo = fila * cols + columna)
+    """
+    rng = np.random.default_rng(seed)
+    nodos = np.arange(rows * cols).reshape(rows, cols)
+    pares = [(nodos[:, :-1], nodos[:, 1:]), (nodos[:-1, :], nodos[1:, :])]
+    if diagonals:
+        pares += [(nodos[:-1, :-1], nodos[1:, 1:]), (nodos[:-1, 1:], nodos[1:, :-1])]
+    origenes = np.concatenate([a.ravel() for a, _ in pares])
+    destinos = np.concatenate([b.ravel() for _, b in pares])
+    pesos = rng.integers(1, max_weight + 1, len(origenes))
+    return _undirected_graph(rows * cols, origenes, destinos, pesos)
+
+
+def generate_random_geometric(n, radius=None, avg_degree=6.0, max_weight=15, seed=None,
+                              connected=False):
+    """
+    Genera un grafo geométrico aleatorio (parecido a una red de carreteras)
+    
+    Los nodos son puntos uniformes en el cuadrado unidad; dos nodos se conectan
+    si están a distancia <= radius, con peso proporcional a esa distancia. Los
+    puntos se agrupan en celdas de lado radius, así que solo se comparan pares
+    de celdas vecinas (O(n + m) esperado).
+    
+    Args:
+        n: Número de nodos
+        radius: Radio de conexión (por defecto el que da avg_degree)
+        avg_degree: Grado medio deseado si no se indica radius
+        max_weight: Peso de una arista de longitud radius (pesos desde 1)
+        seed: Semilla del generador
+        connected: Si es True, se agregan aristas hasta que el grafo sea conexo
+        
+    Returns:
+        grafo: CSRGraph no dirigido
+        puntos: Arreglo (n, 2) con las coordenadas de los nodos
+    """
+    rng = np.random.default_rng(seed)
+    if radius is None:
+        radius = np.sqrt(avg_degree / (np.pi * max(n, 1)))
+    puntos = rng.random((n, 2))
+    
+    lado = max(1, int(1 / radius))
+    celda = np.minimum((puntos / (1 / lado)).astype(np.int64), lado - 1)
+    id_celda = celda[:, 0] * lado + celda[:, 1]
+    orden = np.argsort(id_celda, kind="stable")
+    conteo = np.bincount(id_celda, minlength=lado * lado)
+    inicio = np.concatenate([[0], np.cumsum(conteo)[:-1]])
+    posicion = np.empty(n, dtype=np.int64)
+    posicion[orden] = np.arange(n)
+    
+    origenes, destinos = [], []
+    # Misma celda y las cuatro celdas vecinas "hacia adelante" (sin repetir pares)
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        cx, cy = celda[:, 0] + dx, celda[:, 1] + dy
+        dentro = (cx >= 0) & (cx < lado) & (cy >= 0) & (cy < lado)
+        vecina = np.where(dentro, cx * lado + cy, 0)
+        cuantos = np.where(dentro, conteo[vecina], 0)
+        fuente = np.repeat(np.arange(n), cuantos)
+        desplazamiento = np.arange(cuantos.sum()) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+        destino = orden[np.repeat(inicio[vecina], cuantos) + desplazamiento]
+        if (dx, dy) == (0, 0):
+            validos = posicion[destino] > posicion[fuente]
+            fuente, destino = fuente[validos], destino[validos]
+        origenes.append(fuente)
+        destinos.append(destino)
+    origenes = np.concatenate(origenes)
+    destinos = np.concatenate(destinos)
+    
+    distancia = np.linalg.norm(puntos[origenes] - puntos[destinos], axis=1)
+    cerca = distancia <= radius
+    origenes, destinos, distancia = origenes[cerca], destinos[cerca], distancia[cerca]
+    pesos = np.maximum(1, np.ceil(distancia / radius * max_weight)).astype(np.int64)
+    grafo = _undirected_graph(n, origenes, destinos, pesos, rng, max_weight, connected)
+    return grafo, puntos
+
+
+def generate_barabasi_albert(n, m=2, max_weight=15, seed=None):
+    """
+    Genera un grafo de Barabási-Albert (conexión preferencial)
+    
+    Cada nodo nuevo se une a m nodos elegidos con probabilidad proporcional a
+    su grado. Se usa la lista de extremos de aristas: elegir un elemento al azar
+    de esa lista equivale a elegir un nodo según su grado. Cada elección apunta
+    a una posición anterior de la lista, y todas se resuelven a la vez con
+    saltos de punteros vectorizados.
+    
+    Args:
+        n: Número de nodos (n > m)
+        m: Aristas que aporta cada nodo nuevo
+        max_weight: Peso máximo de las aristas
+        seed: Semilla del generador
+        
+    Returns:
+        CSRGraph no dirigido (conexo)
+    """
+    if n <= m:
+        raise ValueError("Barabási-Albert necesita n > m")
+    rng = np.random.default_rng(seed)
+    
+    # Núcleo inicial: estrella del nodo m con los nodos 0..m-1
+    inicial = np.empty(2 * m, dtype=np.int64)
+    inicial[0::2] = m
+    inicial[1::2] = np.arange(m)
+    
+    nuevos = np.arange(m + 1, n)
+    pasos = len(nuevos)
+    largo_inicial = len(inicial)
+    largo = largo_inicial + 2 * m * pasos
+    
+    # Longitud de la lista antes de cada paso y elección uniforme dentro de ella
+    antes = largo_inicial + 2 * m * np.arange(pasos)
+    eleccion = (rng.random((pasos, m)) * antes[:, None]).astype(np.int64)
+    
+    valores = np.full(largo, -1, dtype=np.int64)
+    punteros = np.arange(largo)
+    valores[:largo_inicial] = inicial
+    posiciones = antes[:, None] + 2 * np.arange(m)[None, :]
+    valores[posiciones.ravel()] = np.repeat(nuevos, m)
+    punteros[(posiciones + 1).ravel()] = eleccion.ravel()
+    
+    pendientes = np.flatnonzero(valores < 0)
+    while len(pendientes):
+        apuntados = punteros[pendientes]
+        resueltos = valores[apuntados] >= 0
+        valores[pendientes[resueltos]] = valores[apuntados[resueltos]]
+        sin_resolver = pendientes[~resueltos]
+        punteros[sin_resolver] = punteros[punteros[sin_resolver]]
+        pendientes = sin_resolver
+    
+    origenes = valores[0::2]
+    destinos = valores[1::2]
+    pesos = rng.integers(1, max_weight + 1, len(origenes))
+    return _undirected_graph(n, origenes, destinos, pesos)
+
+
+def _undirected_graph(n, origenes, destinos, pesos, rng=None, max_weight=15, connected=False):
+    """
+    Construye un CSRGraph no dirigido a partir de aristas (i, j); con
+    connected=True une las componentes con aristas aleatorias
+    """
+    if connected and n > 1:
+        etiquetas = _components(n, origenes, destinos)
+        representantes = np.unique(etiquetas)
+        if len(representantes) > 1:
+            # Cada componente se une con un nodo al azar de alguna anterior
+            miembros = np.argsort(etiquetas, kind="stable")
+            inicio = np.searchsorted(etiquetas[miembros], representantes)
+            fin = np.append(inicio[1:], n)
+            elegido = miembros[inicio + (rng.random(len(inicio)) * (fin - inicio)).astype(np.int64)]
+            anterior = (rng.random(len(elegido) - 1) * np.arange(1, len(elegido))).astype(np.int64)
+            origenes = np.concatenate([origenes, elegido[1:]])
+            destinos = np.concatenate([destinos, elegido[anterior]])
+            pesos = np.concatenate([pesos, rng.integers(1, max_weight + 1, len(elegido) - 1)])
+    return CSRGraph.from_edges(n,
+                               np.concatenate([origenes, destinos]),
+                               np.concatenate([destinos, origenes]),
+                               np.concatenate([pesos, pesos]))
+
+
+def _components(n, origenes, destinos):
+    """
+    Etiqueta de componente conexa de cada nodo (el menor nodo de la componente),
+    por propagación de mínimos con saltos de punteros
+    """
+    etiquetas = np.arange(n)
+    while True:
+        anteriores = etiquetas.copy()
+        minimo = np.minimum(etiquetas[origenes], etiquetas[destinos])
+        np.minimum.at(etiquetas, origenes, minimo)
+        np.minimum.at(etiquetas, destinos, minimo)
+        # Saltos de punteros: cada nodo adopta la etiqueta de su etiqueta
+        while True:
+            saltadas = etiquetas[etiquetas]
+            if np.array_equal(saltadas, etiquetas):
+                break
+            etiquetas = saltadas
+        if np.array_equal(etiquetas, anteriores):
+            return etiquetas
@@ -0,0 +1,213 @@
+"""
+Herramienta de línea de comandos para los K caminos más cortos
+No importa PyQt5: sirve en servidores, contenedores y tareas programadas
+
+Uso:
+    python src/cli.py compute grafo.json -k 2
+    python src/cli.py par grafo.csr 0 4 -k 3 --formato csv
+    python src/cli.py lote grafo.csv --no-dirigido --consultas consultas.csv
+    cat grafo.json | python src/cli.py compute - -k 1
+
+Formatos de grafo:
+    .csr   Formato binario de algorithms.graph_io (se abre con mmap)
+    .json  Matriz de adyacencia (lista de filas)
+    otro   Lista de aristas "origen,destino[,peso]"
+    -      Entrada estándar: matriz JSON si empieza por "[", si no lista de aristas
+
+Los módulos se importan solo cuando hacen falta, así el arranque queda
+limitado por Python y NumPy.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+
+def cargar_grafo(ruta, no_dirigido=False):
+    """
+    Lee un grafo desde un archivo o desde la entrada estándar ("-")
+
+    Returns:
+        CSRGraph o matriz de adyacencia (lista de listas)
+    """
+    if ruta == "-":
+        texto = sys.stdin.read()
+        if texto.lstrip().startswith("["):
+            return json.loads(texto)
+        import io
+        from algorithms.graph_io import csv_to_csr
+        return csv_to_csr(io.StringIO(texto), no_dirigido=no_dirigido)
+    if ruta.endswith(".csr"):
+        from algorithms.graph_io import load_csr
+        return load_csr(ruta)
+    if ruta.endswith(".json"):
+        with open(ruta, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    from algorithms.graph_io import csv_to_csr
+    return csv_to_csr(ruta, no_dirigido=no_dirigido)
+
+
+def leer_consultas(ruta):
+    """Lee consultas "origen,destino[,k]" (k = 1 si falta) de un archivo o de "-" """
+    archivo = sys.stdin if ruta == "-" else open(ruta, newline="", encoding="utf-8")
+    try:
+        consultas = []
+        for campos in csv.reader(archivo):
+            if not campos or not campos[0].strip().isdigit():
+                continue  # cabecera o línea vacía
+            k = int(campos[2]) if len(campos) > 2 else 1
+            consultas.append((int(campos[0]), int(campos[1]), k))
+        return consultas
+    finally:
+        if archivo is not sys.stdin:
+            archivo.close()
+
+
+def validar_nodos(kpaths, consultas):
+    """
+    Comprueba que los nodos de cada consulta existan en el grafo cargado
+
+    Raises:
+        ValueError: Si algún origen o destino no está en [0, n)
+    """
+    n = kpaths.num_nodos
+    for origen, destino, _ in consultas:
+        for nodo in (origen, destino):
+            if not 0 <= nodo < n:
+                raise ValueError(f"nodo {nodo} fuera de rango "
+                                 f"(el grafo tiene {n} nodos: 0 a {n - 1})")
+
+
+def _numero(valor):
+    """
+    Costo en la forma que usan todos los subcomandos: int si es entero
+    (aunque venga como float de la matriz), float si no, y None si es
+    infinito (null en JSON, celda vacía en CSV)
+    """
+    valor = valor.item() if hasattr(valor, "item") else valor
+    if valor == float("inf"):
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _caminos_json(caminos):
+    return [{"costo": _numero(costo), "camino": [int(nodo) for nodo in camino]}
+            for costo, camino in caminos]
+
+
+def _filas_caminos(caminos):
+    """Filas CSV (rango, costo, camino) con el camino como "0-2-4" """
+    return [(rango, _numero(costo), "-".join(str(nodo) for nodo in camino))
+            for rango, (costo, camino) in enumerate(caminos, start=1)]
+
+
+def comando_compute(args, kpaths, grafo, salida):
+    matriz_k = kpaths.compute(grafo, args.k, workers=args.workers)
+    if args.formato == "json":
+        json.dump({"k": args.k, "matriz": [[_numero(c) for c in fila] for fila in matriz_k]},
+                  salida)
+        salida.write("\n")
+    else:
+        escritor = csv.writer(salida, lineterminator="\n")
+        escritor.writerows([_numero(c) for c in fila] for fila in matriz_k)
+
+
+def comando_par(args, kpaths, grafo, salida):
+    kpaths.cargar_grafo(grafo)
+    validar_nodos(kpaths, [(args.origen, args.destino, args.k)])
+    caminos = kpaths.find_k_shortest_paths(args.origen, args.destino, args.k)
+    if args.formato == "json":
+        json.dump({"origen": args.origen, "destino": args.destino, "k": args.k,
+                   "caminos": _caminos_json(caminos)}, salida)
+        salida.write("\n")
+    else:
+        escritor = csv.writer(salida, lineterminator="\n")
+        escritor.writerow(("rango", "costo", "camino"))
+        escritor.writerows(_filas_caminos(caminos))
+
+
+def comando_lote(args, kpaths, grafo, salida):
+    kpaths.cargar_grafo(grafo)
+    consultas = leer_consultas(args.consultas)
+    validar_nodos(kpaths, consultas)
+    escritor = csv.writer(salida, lineterminator="\n")
+    if args.formato == "csv":
+        escritor.writerow(("consulta", "origen", "destino", "rango", "costo", "camino"))
+
+    # Salida por bloques: cada bloque se escribe en cuanto se resuelve
+    numero = 0
+    for bloque in kpaths.consultar_lote(consultas, bloque=args.bloque):
+        for caminos in bloque:
+            origen, destino, k = consultas[numero]
+            if args.formato == "json":
+                # Una línea JSON por consulta (JSON Lines)
+                json.dump({"origen": origen, "destino": destino, "k": k,
+                           "caminos": _caminos_json(caminos)}, salida)
+                salida.write("\n")
+            else:
+                escritor.writerows((numero, origen, destino) + fila
+                                   for fila in _filas_caminos(caminos))
+            numero += 1
+        salida.flush()
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="K caminos más cortos desde la línea de comandos (sin interfaz gráfica)")
+    comunes = argparse.ArgumentParser(add_help=False)
+    comunes.add_argument("grafo", help="Archivo .csr, .json, lista de aristas o - (stdin)")
+    comunes.add_argument("-k", type=int, default=1, help="Número de caminos (por defecto 1)")
+    comunes.add_argument("--formato", choices=("json", "csv"), default="json")
+    comunes.add_argument("--salida", help="Archivo de salida (por defecto stdout)")
+    comunes.add_argument("--metodo", choices=("yen", "lazy"), default="yen",
+                         help="Motor de búsquedas spur")
+    comunes.add_argument("--no-dirigido", action="store_true",
+                         help="Las listas de aristas se leen como no dirigidas")
+
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    compute = comandos.add_parser("compute", parents=[comunes],
+                                  help="Matriz de costos del k-ésimo camino")
+    compute.add_argument("--workers", type=int, help="Procesos para el cálculo en paralelo")
+
+    par = comandos.add_parser("par", parents=[comunes], help="K caminos entre dos nodos")
+    par.add_argument("origen", type=int)
+    par.add_argument("destino", type=int)
+
+    lote = comandos.add_parser("lote", parents=[comunes],
+                               help="Consultas (origen, destino, k) desde un archivo")
+    lote.add_argument("--consultas", default="-",
+                      help="CSV origen,destino[,k] (por defecto stdin)")
+    lote.add_argument("--bloque", type=int, default=10_000,
+                      help="Consultas que se resuelven y escriben a la vez")
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.comando == "lote" and args.grafo == "-" and args.consultas == "-":
+        print("error: el grafo y las consultas no pueden leerse ambos de stdin", file=sys.stderr)
+        return 2
+
+    from algorithms.k_paths import KPaths
+
+    try:
+        grafo = cargar_grafo(args.grafo, args.no_dirigido)
+        kpaths = KPaths(args.metodo, cache=None)
+        salida = open(args.salida, "w", newline="", encoding="utf-8") if args.salida else sys.stdout
+        try:
+            {"compute": comando_compute, "par": comando_par,
+             "lote": comando_lote}[args.comando](args, kpaths, grafo, salida)
+        finally:
+            if salida is not sys.stdout:
+                salida.close()
+    except (OSError, ValueError, IndexError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,19 @@ Basado en el código original de Alexander Narváez
 """
 
 import sys
-import random
 import numpy as np
 from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtWidgets import (
     QGraphicsScene, QGraphicsEllipseItem, QGraphicsLineItem,
     QGraphicsTextItem, QGraphicsItem, QMainWindow, QVBoxLayout,
-    QHBoxLayout, QPushButton, QTableWidget, QWidget, QLabel,
-    QSpinBox, QComboBox, QTextEdit, QGroupBox
+    QHBoxLayout, QPushButton, QTableView, QTabWidget, QWidget, QLabel,
+    QSpinBox, QComboBox, QTextEdit, QGroupBox, QProgressBar
 )
 from algorithms.k_paths import KPaths
+from models import ModeloMatriz, ModeloAristas
+from graph import BATCH_THRESHOLD, GraphView, LayerNode, circle_positions, draw_batched
+from worker import CalculoKPaths, CalculoDisposicion, ESPERA_MS, MAX_NODOS_K
+from algorithms.utils import generate_erdos_renyi
 
 
 class Nodo(QGraphicsEllipseItem):
@@ -92,6 +95,16 @@ class Arista(QGraphicsLineItem):
         super().mousePressEvent(event)
 
 
+class NodoLigero(LayerNode):
+    """Nodo de los grafos grandes, cuyas aristas se dibujan en una EdgeLayer"""
+
+    def resaltar(self, color="#E74C3C"):
+        self.highlight(color)
+
+    def restaurar(self):
+        self.restore()
+
+
 class GrafoApp(QMainWindow):
     """Aplicación principal para visualizar grafos y calcular k-caminos"""
 
@@ -101,8 +114,14 @@ class GrafoApp(QMainWindow):
         self.setGeometry(100, 100, 1400, 800)
         self.nodos = []
         self.aristas = []
+        self.capa = None  # EdgeLayer de los grafos grandes
         self.kpaths = KPaths()
+        self.calculo = None  # Cálculo en segundo plano en curso
+        self.k_mostrado = 1  # K cuya capa del tensor se muestra
+        self.disposicion = None  # Disposición por fuerzas en curso
         self.matrix = []
+        self.modelo_matriz = ModeloMatriz()
+        self.modelo_aristas = ModeloAristas(self.modelo_matriz)
         self.init_ui()
 
     def init_ui(self):
@@ -129,14 +148,23 @@ class GrafoApp(QMainWindow):
         layout_tam = QHBoxLayout()
         layout_tam.addWidget(QLabel("Tamaño:"))
         self.spin_tamano = QSpinBox()
-        self.spin_tamano.setRange(3, 10)
+        self.spin_tamano.setRange(3, 5000)
         self.spin_tamano.setValue(5)
         self.spin_tamano.valueChanged.connect(self.cambiar_tamano_matriz)
         layout_tam.addWidget(self.spin_tamano)
         layout_matriz.addLayout(layout_tam)
 
-        self.tabla_matriz = QTableWidget(5, 5)
-        layout_matriz.addWidget(self.tabla_matriz)
+        # Las vistas solo piden al modelo las celdas visibles
+        self.modelo_matriz.redimensionar(5)
+        self.tabla_matriz = QTableView()
+        self.tabla_matriz.setModel(self.modelo_matriz)
+        self.tabla_matriz.horizontalHeader().setDefaultSectionSize(40)
+        self.tabla_aristas = QTableView()
+        self.tabla_aristas.setModel(self.modelo_aristas)
+        pestanas = QTabWidget()
+        pestanas.addTab(self.tabla_matriz, "Matriz")
+        pestanas.addTab(self.tabla_aristas, "Aristas")
+        layout_matriz.addWidget(pestanas)
         btn_aleatorio = QPushButton("Generar Matriz Aleatoria")
         btn_aleatorio.clicked.connect(self.llenar_matriz_aleatoria)
         layout_matriz.addWidget(btn_aleatorio)
@@ -167,10 +195,19 @@ class GrafoApp(QMainWindow):
         self.combo_k.setCurrentText("2")
         layout_k_sel.addWidget(self.combo_k)
         layout_k.addLayout(layout_k_sel)
-        btn_calcular = QPushButton("Calcular Matriz K-Paths")
-        btn_calcular.setStyleSheet("background-color: #3498DB; color: white; font-weight: bold; padding: 10px;")
-        btn_calcular.clicked.connect(self.calcular_k_paths)
-        layout_k.addWidget(btn_calcular)
+        self.btn_calcular = QPushButton("Calcular Matriz K-Paths")
+        self.btn_calcular.setStyleSheet("background-color: #3498DB; color: white; font-weight: bold; padding: 10px;")
+        self.btn_calcular.clicked.connect(self.calcular_k_paths)
+        layout_k.addWidget(self.btn_calcular)
+        layout_progreso = QHBoxLayout()
+        self.barra_progreso = QProgressBar()
+        self.barra_progreso.setValue(0)
+        layout_progreso.addWidget(self.barra_progreso)
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.setEnabled(False)
+        self.btn_cancelar.clicked.connect(self.cancelar_calculo)
+        layout_progreso.addWidget(self.btn_cancelar)
+        layout_k.addLayout(layout_progreso)
         layout_nodos = QHBoxLayout()
         layout_nodos.addWidget(QLabel("Origen:"))
         self.spin_origen = QSpinBox()
@@ -203,7 +240,7 @@ class GrafoApp(QMainWindow):
         titulo.setStyleSheet("font-size: 18px; font-weight: bold; color: #2C3E50;")
         titulo.setAlignment(QtCore.Qt.AlignCenter)
         layout.addWidget(titulo)
-        self.graphics_view = QtWidgets.QGraphicsView()
+        self.graphics_view = GraphView()
         self.scene = QGraphicsScene()
         self.graphics_view.setScene(self.scene)
         self.graphics_view.setRenderHint(QtGui.QPainter.Antialiasing)
@@ -212,8 +249,6 @@ class GrafoApp(QMainWindow):
         return panel
 
     def cambiar_tamano_matriz(self, tamano):
-        self.tabla_matriz.setRowCount(tamano)
-        self.tabla_matriz.setColumnCount(tamano)
         self.spin_origen.setRange(0, tamano - 1)
         self.spin_destino.setRange(0, tamano - 1)
         self.spin_destino.setValue(tamano - 1)
@@ -221,8 +256,7 @@ class GrafoApp(QMainWindow):
 
     def llenar_matriz_aleatoria(self):
         """Llena la matriz con valores aleatorios y asegura que todos los nodos estén conectados"""
-        filas = self.tabla_matriz.rowCount()
-        columnas = self.tabla_matriz.columnCount()
+        filas = self.modelo_matriz.rowCount()
 
         # Ajustar la probabilidad según el tamaño (más grande = menos conexiones)
         if filas <= 4:
@@ -232,66 +266,47 @@ class GrafoApp(QMainWindow):
         elif filas <= 8:
             prob_conexion = 0.6
         else:
-            prob_conexion = 0.5
-
-        # Inicializar matriz con ceros
-        matriz = [[0 for _ in range(columnas)] for _ in range(filas)]
-
-        # Generar conexiones aleatorias según la probabilidad
-        for i in range(filas):
-            for j in range(i + 1, columnas):
-                if random.random() < prob_conexion:
-                    peso = random.randint(1, 20)
-                    matriz[i][j] = peso
-                    matriz[j][i] = peso  # grafo no dirigido
-
-        # Asegurar que todos los nodos estén conectados al menos una vez
-        for i in range(filas):
-            if all(matriz[i][j] == 0 for j in range(columnas) if j != i):
-                # Si el nodo está aislado, conéctalo a otro nodo aleatorio
-                j = random.choice([x for x in range(filas) if x != i])
-                peso = random.randint(1, 20)
-                matriz[i][j] = peso
-                matriz[j][i] = peso
-
-        # Mostrar en la tabla
-        for i in range(filas):
-            for j in range(columnas):
-                item = QtWidgets.QTableWidgetItem(str(matriz[i][j]))
-                item.setTextAlignment(QtCore.Qt.AlignCenter)
-                self.tabla_matriz.setItem(i, j, item)
+            prob_conexion = min(0.5, 6 / filas)  # grafos grandes: unas 6 aristas por nodo
+
+        # Generar conexiones aleatorias según la probabilidad (grafo no dirigido),
+        # agregando aristas hasta que todos los nodos estén conectados
+        self.modelo_matriz.cargar(generate_erdos_renyi(filas, prob_conexion, max_weight=20,
+                                                       connected=True))
 
         self.texto_resultados.append(
             f"Grafo aleatorio generado ({int(prob_conexion * 100)}% conectividad garantizada)\n"
         )
 
     def limpiar_matriz(self):
-        filas = self.tabla_matriz.rowCount()
-        columnas = self.tabla_matriz.columnCount()
-        for i in range(filas):
-            for j in range(columnas):
-                item = QtWidgets.QTableWidgetItem("0")
-                item.setTextAlignment(QtCore.Qt.AlignCenter)
-                self.tabla_matriz.setItem(i, j, item)
+        self.modelo_matriz.redimensionar(self.spin_tamano.value())
 
     def obtener_matriz(self):
-        filas = self.tabla_matriz.rowCount()
-        matriz = []
-        for i in range(filas):
-            fila = []
-            for j in range(filas):
-                item = self.tabla_matriz.item(i, j)
-                valor = int(item.text()) if item and item.text().isdigit() else 0
-                fila.append(valor)
-            matriz.append(fila)
-        return matriz
+        """Copia del CSRGraph del modelo (las ediciones ya están en él)"""
+        return self.modelo_matriz.grafo.copia()
 
     def dibujar_grafo(self):
+        self.detener_disposicion()
         self.scene.clear()
         self.nodos.clear()
         self.aristas.clear()
+        self.capa = None
         self.matrix = self.obtener_matriz()
         num_nodos = len(self.matrix)
+        origenes = np.repeat(np.arange(num_nodos), np.diff(self.matrix.offsets))
+        sin_lazos = origenes != self.matrix.targets
+        origenes = origenes[sin_lazos]
+        destinos = self.matrix.targets[sin_lazos]
+        pesos = self.matrix.weights[sin_lazos].tolist()
+        if len(origenes) > BATCH_THRESHOLD:
+            # Grafo grande: una capa de aristas y nodos ligeros
+            posiciones = circle_positions(num_nodos, self.graphics_view.width(),
+                                          self.graphics_view.height(), min_spacing=20)
+            self.capa, self.nodos = draw_batched(self.scene, posiciones, origenes, destinos,
+                                                 pesos,
+                                                 node_class=NodoLigero)
+            self.iniciar_disposicion()
+            self.texto_resultados.append("✓ Grafo dibujado exitosamente\n")
+            return
         radius = 20
         center_x = self.graphics_view.width() / 2
         center_y = self.graphics_view.height() / 2
@@ -304,40 +319,142 @@ class GrafoApp(QMainWindow):
             nodo.setPos(x, y)
             self.scene.addItem(nodo)
             self.nodos.append(nodo)
-        for i in range(num_nodos):
-            for j in range(num_nodos):
-                if self.matrix[i][j] > 0 and i != j:
-                    arista = Arista(self.nodos[i], self.nodos[j], self.matrix[i][j], self.scene)
-                    self.scene.addItem(arista)
-                    self.aristas.append(arista)
-                    self.nodos[i].agregar_arista(arista)
+        for i, j, peso in zip(origenes.tolist(), destinos.tolist(), pesos):
+            arista = Arista(self.nodos[i], self.nodos[j], peso, self.scene)
+            self.scene.addItem(arista)
+            self.aristas.append(arista)
+            self.nodos[i].agregar_arista(arista)
+        self.iniciar_disposicion()
         self.texto_resultados.append("✓ Grafo dibujado exitosamente\n")
 
+    def iniciar_disposicion(self):
+        """Reordena los nodos por fuerzas en segundo plano, partiendo del círculo"""
+        posiciones = np.array([(nodo.pos().x(), nodo.pos().y()) for nodo in self.nodos])
+        self.disposicion = CalculoDisposicion(self.matrix, posiciones.reshape(-1, 2),
+                                              self.graphics_view.width(),
+                                              self.graphics_view.height(), self)
+        self.disposicion.posiciones.connect(self.aplicar_disposicion)
+        self.disposicion.terminado.connect(self.disposicion_terminada)
+        self.disposicion.finished.connect(self.liberar_disposicion)
+        self.disposicion.start()
+
+    def aplicar_disposicion(self, posiciones):
+        if self.sender() is not self.disposicion:
+            return  # posiciones de un dibujo anterior
+        if self.capa is not None:
+            self.capa.set_positions(posiciones, self.nodos)
+            return
+        for nodo, (x, y) in zip(self.nodos, posiciones.tolist()):
+            nodo.setPos(x, y)
+        for arista in self.aristas:
+            arista.actualizar_posiciones()
+
+    def disposicion_terminada(self, cancelada):
+        if not cancelada and self.sender() is self.disposicion:
+            self.graphics_view.fit_scene()
+
+    def detener_disposicion(self):
+        if self.disposicion is not None:
+            disposicion, self.disposicion = self.disposicion, None
+            disposicion.cancelar()
+            if disposicion.wait(ESPERA_MS):
+                disposicion.deleteLater()
+            else:
+                disposicion.finished.connect(disposicion.deleteLater)
+
+    def liberar_disposicion(self):
+        if self.sender() is self.disposicion:
+            self.disposicion.deleteLater()
+            self.disposicion = None
+
     def restaurar_colores(self):
         for nodo in self.nodos:
             nodo.restaurar()
         for arista in self.aristas:
             arista.restaurar()
+        if self.capa is not None:
+            self.capa.set_highlighted([])
 
     def calcular_k_paths(self):
         if not self.matrix:
             self.texto_resultados.append("⚠ Primero debes dibujar el grafo\n")
             return
+        if self.calculo is not None:
+            return  # Ya hay un cálculo en curso
         k = int(self.combo_k.currentText())
-        matriz_k = self.kpaths.compute(self.matrix, k)
-        texto = f"\n=== MATRIZ DE {k}-CAMINOS ===\n"
-        for i in range(len(matriz_k)):
-            row = " ".join(f"{int(v) if v != float('inf') else '∞':>4}" for v in matriz_k[i])
-            texto += f"N{i}: {row}\n"
-        self.texto_resultados.append(texto)
+        if k > 1 and len(self.matrix) > MAX_NODOS_K:
+            self.texto_resultados.append(
+                f"⚠ La matriz con K > 1 se calcula para grafos de hasta {MAX_NODOS_K} "
+                f"nodos; usa K = 1 para grafos más grandes\n")
+            return
+        self.k_mostrado = k
+        self.texto_resultados.append(f"\n=== MATRIZ DE {self.k_mostrado}-CAMINOS ===")
+        # Las filas se muestran a medida que el hilo las termina. K = 1..K
+        # elegido sale de una sola pasada y queda en la caché de KPaths, así
+        # que pasar a un K menor sobre el mismo grafo no recalcula
+        ks = range(1, self.k_mostrado + 1)
+        self.calculo = CalculoKPaths(self.kpaths, self.matrix, ks, self)
+        self.calculo.fila_calculada.connect(self.mostrar_fila)
+        self.calculo.progreso.connect(self.actualizar_progreso)
+        self.calculo.terminado.connect(self.calculo_terminado)
+        self.calculo.error.connect(
+            lambda mensaje: self.texto_resultados.append(f"✗ Error al calcular: {mensaje}\n"))
+        self.calculo.finished.connect(self.liberar_calculo)
+        self.barra_progreso.setValue(0)
+        self.btn_calcular.setEnabled(False)
+        self.btn_cancelar.setEnabled(True)
+        self.calculo.start()
+
+    def mostrar_fila(self, i, fila):
+        row = " ".join(f"{int(v) if v != float('inf') else '∞':>4}"
+                       for v in fila[:, self.k_mostrado - 1])
+        self.texto_resultados.append(f"N{i}: {row}")
+
+    def actualizar_progreso(self, hechas, total):
+        self.barra_progreso.setMaximum(max(total, 1))
+        self.barra_progreso.setValue(hechas)
+
+    def cancelar_calculo(self):
+        if self.calculo is not None:
+            self.btn_cancelar.setEnabled(False)
+            self.calculo.cancelar()
+
+    def calculo_terminado(self, cancelado):
+        if cancelado:
+            self.texto_resultados.append("⚠ Cálculo cancelado\n")
+
+    def liberar_calculo(self):
+        self.calculo.deleteLater()
+        self.calculo = None
+        self.btn_calcular.setEnabled(True)
+        self.btn_cancelar.setEnabled(False)
+
+    def closeEvent(self, event):
+        """Detiene el cálculo en curso antes de cerrar la ventana"""
+        if self.calculo is not None:
+            self.calculo.cancelar()
+            if not self.calculo.wait(ESPERA_MS):
+                # El par en curso aún no termina: la ventana se cierra cuando
+                # el hilo se detenga, sin bloquear la interfaz mientras tanto
+                self.hide()
+                self.calculo.finished.connect(self.close)
+                event.ignore()
+                return
+        self.detener_disposicion()
+        super().closeEvent(event)
 
     def encontrar_caminos_especificos(self):
         if not self.matrix:
             self.texto_resultados.append("⚠ Primero debes dibujar el grafo\n")
             return
+        if self.calculo is not None:
+            self.texto_resultados.append("⚠ Espera a que termine el cálculo de la matriz\n")
+            return
         origen = self.spin_origen.value()
         destino = self.spin_destino.value()
         k = int(self.combo_k.currentText())
+        # Las consultas repetidas sobre el mismo grafo se sirven desde la caché
+        self.kpaths.cargar_grafo(self.matrix)
         caminos = self.kpaths.find_k_shortest_paths(origen, destino, k)
         if not caminos:
             self.texto_resultados.append(f"✗ No hay caminos entre N{origen} y N{destino}\n")
@@ -356,6 +473,8 @@ class GrafoApp(QMainWindow):
                                 (arista.nodo2.id == camino[i] and arista.nodo1.id == camino[i + 1])):
                             arista.resaltar()
                 self.nodos[camino[-1]].resaltar("#2ECC71")
+                if self.capa is not None:
+                    self.capa.set_highlighted(zip(camino, camino[1:]))
         self.texto_resultados.append(texto)
 
 
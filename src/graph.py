@@ -2,12 +2,21 @@
 Clases para representar y visualizar grafos
 """
 
-from PyQt5.QtWidgets import QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsTextItem
-from PyQt5.QtCore import Qt, QPointF
-from PyQt5.QtGui import QPen, QBrush, QColor, QFont
+from PyQt5.QtWidgets import (QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsTextItem,
+                             QGraphicsItem, QGraphicsView)
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPen, QBrush, QColor, QFont, QPainter, QPainterPath
 import math
 import random
 
+import numpy as np
+
+from algorithms.csr import as_csr
+
+# A partir de este número de aristas se dibuja con EdgeLayer (un único
+# elemento por capa) en lugar de un QGraphicsLineItem por arista
+BATCH_THRESHOLD = 500
+
 
 class Node(QGraphicsEllipseItem):
     """Representa un nodo visual en el grafo"""
@@ -104,26 +113,321 @@ class Edge(QGraphicsLineItem):
                             mid_y - label_rect.height()/2)
 
 
+class EdgeLayer(QGraphicsItem):
+    """
+    Dibuja todas las aristas del grafo como un solo elemento de la escena
+
+    Las aristas se reparten en mosaicos según su punto medio y cada mosaico
+    se dibuja con un único QPainterPath, que se construye una vez y solo se
+    rehace cuando se mueve uno de sus nodos. Al pintar:
+      - se omiten los mosaicos fuera del área expuesta (recorte por vista),
+      - con poco zoom se dibujan aristas fusionadas (extremos redondeados a
+        una rejilla y sin repetidas) con una pluma de 1 px sin antialiasing,
+      - los pesos solo se muestran con zoom suficiente y pocas aristas visibles.
+    """
+
+    DETAIL_LOD = 0.35   # por debajo se dibujan las aristas fusionadas
+    LABEL_LOD = 1.0     # zoom mínimo para dibujar los pesos
+    MAX_LABELS = 300
+    TILES = 16          # mosaicos por lado
+
+    def __init__(self, positions, sources, targets, weights):
+        """
+        Args:
+            positions: Arreglo (n, 2) con la posición de cada nodo; se
+                comparte con los nodos y se actualiza con move_node
+            sources, targets, weights: Extremos y peso de cada arista
+        """
+        super().__init__()
+        self.positions = positions
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.weights = list(weights)
+        self.highlighted = []
+        self.pen = QPen(QColor(100, 100, 100), 2)
+        self.coarse_pen = QPen(QColor(100, 100, 100), 0)  # cosmética: 1 px
+        self.highlight_pen = QPen(Qt.red, 4)
+        self.label_color = QColor(255, 87, 34)
+        self.label_font = QFont("Arial", 10, QFont.Bold)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.setZValue(-1)
+        self._syncing = False
+
+        # Aristas de cada nodo (para rehacer solo lo que cambia al moverlo)
+        ends = np.concatenate([self.sources, self.targets])
+        edges = np.concatenate([np.arange(len(self.sources))] * 2)
+        order = np.argsort(ends, kind="stable")
+        self._node_edges = edges[order]
+        self._node_offsets = np.searchsorted(ends[order], np.arange(len(positions) + 1))
+        self._build_tiles()
+
+    def _build_tiles(self):
+        """Reparte las aristas en mosaicos según su punto medio"""
+        positions = self.positions
+        low = positions.min(axis=0) if len(positions) else np.zeros(2)
+        high = positions.max(axis=0) if len(positions) else np.ones(2)
+        self.tile_size = max(float((high - low).max()) / self.TILES, 1.0)
+        middle = (positions[self.sources] + positions[self.targets]) / 2
+        cells = np.floor((middle - low) / self.tile_size).astype(np.int64)
+        _, tile_of_edge = np.unique(cells, axis=0, return_inverse=True)
+        tile_of_edge = tile_of_edge.reshape(-1)
+        order = np.argsort(tile_of_edge, kind="stable")
+        cuts = np.flatnonzero(np.diff(tile_of_edge[order])) + 1
+        self._tiles = np.split(order, cuts) if len(order) else []
+        self._cache = {}  # (mosaico, fusionado) -> (QPainterPath, QRectF)
+        self._tile_of_edge = tile_of_edge
+        self._bounds = self._compute_bounds()
+
+    def _compute_bounds(self):
+        if len(self.positions) == 0:
+            return QRectF()
+        low = self.positions.min(axis=0)
+        high = self.positions.max(axis=0)
+        return QRectF(low[0], low[1], high[0] - low[0], high[1] - low[1]).adjusted(-20, -20, 20, 20)
+
+    def boundingRect(self):
+        return self._bounds
+
+    def _tile(self, tile, coarse):
+        """Camino y límites de un mosaico (se construyen al primer uso)"""
+        key = (tile, coarse)
+        if key not in self._cache:
+            edges = self._tiles[tile]
+            a = self.positions[self.sources[edges]]
+            b = self.positions[self.targets[edges]]
+            segments = np.hstack([a, b])
+            if coarse:
+                # Fusionar aristas cuyos extremos caen en las mismas celdas
+                cell = self.tile_size / 64
+                segments = np.round(segments / cell)
+                swap = (segments[:, 0] > segments[:, 2]) | (
+                    (segments[:, 0] == segments[:, 2]) & (segments[:, 1] > segments[:, 3]))
+                segments[swap] = segments[swap][:, [2, 3, 0, 1]]
+                segments = np.unique(segments, axis=0) * cell
+            path = QPainterPath()
+            for x1, y1, x2, y2 in segments.tolist():
+                path.moveTo(x1, y1)
+                path.lineTo(x2, y2)
+            self._cache[key] = (path, path.boundingRect().adjusted(-2, -2, 2, 2))
+        return self._cache[key]
+
+    def paint(self, painter, option, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        exposed = option.exposedRect
+        coarse = lod < self.DETAIL_LOD
+        painter.save()
+        if coarse:
+            painter.setRenderHint(QPainter.Antialiasing, False)
+        painter.setPen(self.coarse_pen if coarse else self.pen)
+        painter.setBrush(Qt.NoBrush)
+        for tile in range(len(self._tiles)):
+            path, bounds = self._tile(tile, coarse)
+            if bounds.intersects(exposed):
+                painter.drawPath(path)
+
+        if self.highlighted:
+            painter.setPen(self.highlight_pen)
+            for u, v in self.highlighted:
+                painter.drawLine(QPointF(*self.positions[u]), QPointF(*self.positions[v]))
+
+        if lod >= self.LABEL_LOD and len(self.sources):
+            middle = (self.positions[self.sources] + self.positions[self.targets]) / 2
+            visible = np.flatnonzero(
+                (middle[:, 0] >= exposed.left()) & (middle[:, 0] <= exposed.right())
+                & (middle[:, 1] >= exposed.top()) & (middle[:, 1] <= exposed.bottom()))
+            if len(visible) <= self.MAX_LABELS:
+                painter.setPen(self.label_color)
+                painter.setFont(self.label_font)
+                for edge in visible.tolist():
+                    painter.drawText(QPointF(*middle[edge]), str(self.weights[edge]))
+        painter.restore()
+
+    def move_node(self, node, x, y):
+        """Actualiza la posición de un nodo y rehace solo sus mosaicos"""
+        if self._syncing:
+            return
+        edges = self._node_edges[self._node_offsets[node]:self._node_offsets[node + 1]]
+        dirty = QRectF()
+        for tile in np.unique(self._tile_of_edge[edges]).tolist():
+            for coarse in (False, True):
+                old = self._cache.pop((tile, coarse), None)
+                if old is not None:
+                    dirty = dirty.united(old[1])
+        self.positions[node] = (x, y)
+        for edge in edges.tolist():
+            (x1, y1), (x2, y2) = self.positions[self.sources[edge]], self.positions[self.targets[edge]]
+            dirty = dirty.united(QRectF(QPointF(min(x1, x2), min(y1, y2)),
+                                        QPointF(max(x1, x2), max(y1, y2))).adjusted(-40, -20, 40, 20))
+        if not self._bounds.contains(x, y):
+            self.prepareGeometryChange()
+            self._bounds = self._compute_bounds()
+        self.update(dirty)
+
+    def set_positions(self, positions, nodes=()):
+        """
+        Mueve todos los nodos a la vez (p. ej. al avanzar una disposición)
+        y reconstruye los mosaicos una sola vez
+
+        Args:
+            positions: Arreglo (n, 2) con las nuevas posiciones
+            nodes: Elementos de los nodos, que se colocan sin avisar a la capa
+        """
+        self._syncing = True
+        try:
+            for node, (x, y) in zip(nodes, positions.tolist()):
+                node.setPos(x, y)
+        finally:
+            self._syncing = False
+        self.prepareGeometryChange()
+        self.positions[:] = positions
+        self._build_tiles()
+        self.update()
+
+    def set_highlighted(self, pairs):
+        """Resalta las aristas indicadas como pares (u, v); [] las restaura"""
+        self.highlighted = list(pairs)
+        self.update()
+
+
+class LayerNode(QGraphicsEllipseItem):
+    """
+    Nodo ligero para grafos grandes: no tiene elementos hijos y su etiqueta
+    solo se dibuja con zoom suficiente. Al moverse avisa a su EdgeLayer.
+    """
+
+    LABEL_LOD = 1.5
+    COLOR = QColor(66, 165, 245)
+
+    def __init__(self, node_id, layer, radius=8):
+        super().__init__(-radius, -radius, radius * 2, radius * 2)
+        self.node_id = node_id
+        self.layer = layer
+        self.radius = radius
+        self.restore()
+        self.setPos(*layer.positions[node_id])
+        self.setFlag(QGraphicsEllipseItem.ItemIsMovable)
+        self.setFlag(QGraphicsEllipseItem.ItemSendsGeometryChanges)
+
+    def paint(self, painter, option, widget=None):
+        super().paint(painter, option, widget)
+        if option.levelOfDetailFromTransform(painter.worldTransform()) >= self.LABEL_LOD:
+            painter.setPen(Qt.white)
+            painter.drawText(self.rect(), Qt.AlignCenter, str(self.node_id))
+
+    def itemChange(self, change, value):
+        if change == QGraphicsEllipseItem.ItemPositionHasChanged:
+            self.layer.move_node(self.node_id, self.pos().x(), self.pos().y())
+        return super().itemChange(change, value)
+
+    def highlight(self, color="#E74C3C"):
+        self.setBrush(QBrush(QColor(color)))
+        self.setPen(QPen(Qt.red, 3))
+
+    def restore(self):
+        self.setBrush(QBrush(self.COLOR))
+        self.setPen(QPen(QColor(33, 150, 243), 1))
+
+
+class GraphView(QGraphicsView):
+    """Vista con zoom con la rueda del ratón y desplazamiento arrastrando el fondo"""
+
+    def __init__(self, scene=None, parent=None):
+        super().__init__(parent)
+        if scene is not None:
+            self.setScene(scene)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+
+    def wheelEvent(self, event):
+        factor = 1.25 if event.angleDelta().y() > 0 else 1 / 1.25
+        self.scale(factor, factor)
+
+    def fit_scene(self):
+        """Aleja la vista lo necesario para que se vea toda la escena"""
+        rect = self.scene().itemsBoundingRect()
+        if not self.mapToScene(self.viewport().rect()).boundingRect().contains(rect):
+            self.fitInView(rect, Qt.KeepAspectRatio)
+
+
+def circle_positions(n, width, height, min_spacing=0):
+    """
+    Posiciones de n nodos en un círculo centrado en el área indicada. Con
+    min_spacing el radio crece lo necesario para separar los nodos.
+    """
+    radius = max(min(width, height) * 0.35, n * min_spacing / (2 * math.pi))
+    angles = 2 * np.pi * np.arange(n) / max(n, 1) - np.pi / 2
+    return np.column_stack([width / 2 + radius * np.cos(angles),
+                            height / 2 + radius * np.sin(angles)])
+
+
+def draw_batched(scene, positions, sources, targets, weights, node_class=LayerNode):
+    """
+    Dibuja un grafo grande con una EdgeLayer y nodos ligeros
+
+    Returns:
+        layer: EdgeLayer con las aristas
+        nodes: Lista de nodos (node_class) en orden de índice
+    """
+    layer = EdgeLayer(positions, sources, targets, weights)
+    scene.addItem(layer)
+    nodes = []
+    for i in range(len(positions)):
+        node = node_class(i, layer)
+        scene.addItem(node)
+        nodes.append(node)
+    return layer, nodes
+
+
 class Graph:
     """Representa la estructura del grafo y maneja su visualización"""
     
     def __init__(self):
         self.nodes = []
         self.edges = []
+        self.layer = None  # EdgeLayer de los grafos grandes
         self.matrix = []
         
     def load_from_matrix(self, matrix):
-        """Carga el grafo desde una matriz de adyacencia"""
+        """Carga el grafo desde una matriz de adyacencia o un CSRGraph"""
         self.matrix = matrix
+
+    def positions(self):
+        """Posiciones actuales de los nodos como arreglo (n, 2)"""
+        if self.layer is not None:
+            return self.layer.positions.copy()
+        return np.array([(node.pos().x(), node.pos().y()) for node in self.nodes]).reshape(-1, 2)
+
+    def set_positions(self, positions):
+        """Coloca todos los nodos (las aristas los siguen)"""
+        if self.layer is not None:
+            self.layer.set_positions(positions, self.nodes)
+            return
+        for node, (x, y) in zip(self.nodes, positions.tolist()):
+            node.setPos(x, y)
         
     def draw(self, scene, width=800, height=600):
         """Dibuja el grafo en la escena"""
         self.nodes.clear()
         self.edges.clear()
+        self.layer = None
         
         n = len(self.matrix)
         if n == 0:
             return
+        
+        # Aristas (i, j) con i < j, como la mitad superior de la matriz
+        graph = as_csr(self.matrix)
+        sources = np.repeat(np.arange(n), np.diff(graph.offsets))
+        upper = sources < graph.targets
+        sources, targets, weights = sources[upper], graph.targets[upper], graph.weights[upper]
+        if len(sources) > BATCH_THRESHOLD:
+            # Grafo grande: una capa de aristas y nodos ligeros
+            positions = circle_positions(n, width, height, min_spacing=24)
+            self.layer, self.nodes = draw_batched(scene, positions, sources, targets,
+                                                  weights.tolist())
+            return
             
         # Calcular posiciones en círculo
         center_x = width / 2
@@ -142,11 +446,8 @@ class Graph:
             scene.addItem(node.label)
             
         # Crear aristas
-        for i in range(n):
-            for j in range(i+1, n):
-                weight = self.matrix[i][j]
-                if weight > 0:
-                    edge = Edge(self.nodes[i], self.nodes[j], weight)
-                    self.edges.append(edge)
-                    scene.addItem(edge)
-                    scene.addItem(edge.label)
+        for i, j, weight in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+            edge = Edge(self.nodes[i], self.nodes[j], weight)
+            self.edges.append(edge)
+            scene.addItem(edge)
+            scene.addItem(edge.label)
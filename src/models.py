@@ -0,0 +1,197 @@
+"""
+Modelos de Qt para editar el grafo (matriz de adyacencia y lista de aristas)
+
+Ambos leen directamente de un CSRGraph: la vista solo pide las celdas
+visibles y cada edición se aplica al grafo con aplicar_cambios, así que no
+hay que volver a leer la tabla antes de calcular.
+"""
+
+import math
+from bisect import bisect_right
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from algorithms.csr import CSRGraph, as_csr
+
+
+def _leer_peso(valor):
+    """Convierte lo escrito en una celda en un peso válido, o None"""
+    if isinstance(valor, str):
+        texto = valor.strip() or "0"
+        try:
+            valor = int(texto)
+        except ValueError:
+            try:
+                valor = float(texto)
+            except ValueError:
+                return None
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    if not isinstance(valor, (int, float)) or valor < 0 or not math.isfinite(valor):
+        return None
+    return valor
+
+
+def _texto(valor):
+    """Texto de una celda (un peso real entero se muestra sin decimales)"""
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor)
+
+
+class ModeloMatriz(QAbstractTableModel):
+    """
+    Matriz de adyacencia editable respaldada por un CSRGraph
+
+    Señales:
+        arista_cambiada(u, v, estructural): Se editó el peso de (u, v);
+            estructural es True si la arista se insertó o se eliminó
+    """
+
+    arista_cambiada = pyqtSignal(int, int, bool)
+
+    def __init__(self, grafo=None, parent=None):
+        """
+        Args:
+            grafo: CSRGraph o matriz de adyacencia inicial (por defecto vacío)
+        """
+        super().__init__(parent)
+        self.grafo = CSRGraph.vacio(0) if grafo is None else as_csr(grafo)
+
+    def cargar(self, grafo):
+        """Reemplaza el grafo (CSRGraph o matriz de adyacencia)"""
+        self.beginResetModel()
+        self.grafo = as_csr(grafo)
+        self.endResetModel()
+
+    def redimensionar(self, num_nodos):
+        """Cambia el número de nodos y deja la matriz en ceros"""
+        self.cargar(CSRGraph.vacio(num_nodos))
+
+    def cambiar_peso(self, u, v, peso):
+        """
+        Escribe el peso de la arista (u, v) en el grafo; 0 la elimina
+
+        Returns:
+            True si el grafo cambió
+        """
+        efectivos, estructural = self.grafo.aplicar_cambios([(u, v, peso)])
+        if not efectivos:
+            return False
+        celda = self.index(u, v)
+        self.dataChanged.emit(celda, celda, [Qt.DisplayRole, Qt.EditRole])
+        self.arista_cambiada.emit(u, v, estructural)
+        return True
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.grafo.num_nodos
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.grafo.num_nodos
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            peso = self.grafo.peso(index.row(), index.column())
+            return _texto(peso) if role == Qt.DisplayRole else peso
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return str(seccion)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.row() == index.column():
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable  # sin lazos
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def setData(self, index, valor, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.row() == index.column():
+            return False
+        peso = _leer_peso(valor)
+        if peso is None:
+            return False
+        self.cambiar_peso(index.row(), index.column(), peso)
+        return True
+
+
+class ModeloAristas(QAbstractTableModel):
+    """
+    Lista de aristas (origen, destino, peso) del grafo de un ModeloMatriz,
+    más cómoda que la matriz en grafos grandes y dispersos. El peso se
+    puede editar; un peso 0 elimina la arista.
+    """
+
+    COLUMNAS = ("Origen", "Destino", "Peso")
+
+    def __init__(self, modelo_matriz, parent=None):
+        """
+        Args:
+            modelo_matriz: ModeloMatriz cuyo grafo se muestra y se edita
+        """
+        super().__init__(parent)
+        self.modelo_matriz = modelo_matriz
+        modelo_matriz.modelAboutToBeReset.connect(self.beginResetModel)
+        modelo_matriz.modelReset.connect(self.endResetModel)
+        modelo_matriz.arista_cambiada.connect(self._arista_cambiada)
+
+    def _arista_cambiada(self, u, v, estructural):
+        if estructural:
+            # Las filas (posiciones en el CSR) cambiaron
+            self.beginResetModel()
+            self.endResetModel()
+            return
+        fila = self.modelo_matriz.grafo.indice_arista(u, v)
+        celda = self.index(fila, 2)
+        self.dataChanged.emit(celda, celda, [Qt.DisplayRole, Qt.EditRole])
+
+    def arista(self, fila):
+        """Tupla (origen, destino, peso) de la fila indicada"""
+        offsets, destinos, pesos = self.modelo_matriz.grafo.listas()
+        return bisect_right(offsets, fila) - 1, destinos[fila], pesos[fila]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.modelo_matriz.grafo.num_aristas
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNAS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            valor = self.arista(index.row())[index.column()]
+            return _texto(valor) if role == Qt.DisplayRole else valor
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientacion == Qt.Horizontal:
+            return self.COLUMNAS[seccion]
+        return str(seccion)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 2:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def setData(self, index, valor, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() != 2:
+            return False
+        peso = _leer_peso(valor)
+        if peso is None:
+            return False
+        u, v, _ = self.arista(index.row())
+        self.modelo_matriz.cambiar_peso(u, v, peso)
+        return True
@@ -5,12 +5,15 @@ Maneja toda la interacción con el usuario y visualización
 
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QTableWidget, QTableWidgetItem, 
+                             QPushButton, QTableView, QTabWidget,
                              QLabel, QComboBox, QSpinBox, QTextEdit, QGroupBox,
-                             QGraphicsView, QGraphicsScene, QMessageBox)
+                             QGraphicsScene, QMessageBox, QProgressBar)
 from PyQt5.QtCore import Qt
-from graph import Graph
+from graph import Graph, GraphView
+from models import ModeloMatriz, ModeloAristas
+from worker import CalculoKPaths, CalculoDisposicion, ESPERA_MS, MAX_NODOS_K
 from algorithms.k_paths import KPaths
+from algorithms.utils import generate_erdos_renyi
 
 
 class GraphUI(QMainWindow):
@@ -20,7 +23,12 @@ class GraphUI(QMainWindow):
         super().__init__()
         self.graph = Graph()
         self.kpaths = KPaths()
+        self.worker = None  # Cálculo en segundo plano en curso
+        self.shown_k = 1  # K cuya capa del tensor se muestra
+        self.layout_worker = None  # Disposición del grafo en curso
         self.scene = QGraphicsScene()
+        self.matrix_model = ModeloMatriz()
+        self.edge_model = ModeloAristas(self.matrix_model)
         
         self.init_ui()
         self.setup_connections()
@@ -62,7 +70,7 @@ class GraphUI(QMainWindow):
         nodes_layout = QHBoxLayout()
         nodes_layout.addWidget(QLabel("Número de nodos:"))
         self.spin_nodes = QSpinBox()
-        self.spin_nodes.setRange(3, 10)
+        self.spin_nodes.setRange(3, 5000)
         self.spin_nodes.setValue(5)
         nodes_layout.addWidget(self.spin_nodes)
         config_layout.addLayout(nodes_layout)
@@ -79,9 +87,17 @@ class GraphUI(QMainWindow):
         matrix_group = QGroupBox("Matriz de Adyacencia")
         matrix_layout = QVBoxLayout()
         
-        self.table_matrix = QTableWidget()
-        self.table_matrix.setMaximumHeight(250)
-        matrix_layout.addWidget(self.table_matrix)
+        # La vista solo pide al modelo las celdas visibles
+        self.table_matrix = QTableView()
+        self.table_matrix.setModel(self.matrix_model)
+        self.table_matrix.horizontalHeader().setDefaultSectionSize(40)
+        self.table_edges = QTableView()
+        self.table_edges.setModel(self.edge_model)
+        self.matrix_tabs = QTabWidget()
+        self.matrix_tabs.setMaximumHeight(250)
+        self.matrix_tabs.addTab(self.table_matrix, "Matriz")
+        self.matrix_tabs.addTab(self.table_edges, "Aristas")
+        matrix_layout.addWidget(self.matrix_tabs)
         
         self.btn_draw = QPushButton("Dibujar Grafo")
         self.btn_draw.setStyleSheet("background-color: #2196F3; color: white; padding: 8px;")
@@ -106,6 +122,15 @@ class GraphUI(QMainWindow):
         self.btn_compute.setStyleSheet("background-color: #FF9800; color: white; padding: 8px;")
         kpaths_layout.addWidget(self.btn_compute)
         
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        progress_layout.addWidget(self.progress_bar)
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.setEnabled(False)
+        progress_layout.addWidget(self.btn_cancel)
+        kpaths_layout.addLayout(progress_layout)
+        
         kpaths_group.setLayout(kpaths_layout)
         layout.addWidget(kpaths_group)
         
@@ -134,8 +159,7 @@ class GraphUI(QMainWindow):
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
         
-        self.graphics_view = QGraphicsView()
-        self.graphics_view.setScene(self.scene)
+        self.graphics_view = GraphView(self.scene)
         self.graphics_view.setRenderHint(QtGui.QPainter.Antialiasing)
         self.graphics_view.setStyleSheet("background-color: #f5f5f5; border: 2px solid #ddd;")
         layout.addWidget(self.graphics_view)
@@ -147,100 +171,154 @@ class GraphUI(QMainWindow):
         self.btn_generate.clicked.connect(self.generate_random_graph)
         self.btn_draw.clicked.connect(self.draw_graph)
         self.btn_compute.clicked.connect(self.compute_kpaths)
+        self.btn_cancel.clicked.connect(self.cancel_compute)
         self.spin_nodes.valueChanged.connect(self.update_table_size)
         
         # Inicializar tabla
         self.update_table_size()
         
     def update_table_size(self):
-        """Actualiza el tamaño de la tabla según el número de nodos"""
-        n = self.spin_nodes.value()
-        self.table_matrix.setRowCount(n)
-        self.table_matrix.setColumnCount(n)
-        
-        # Headers
-        headers = [str(i) for i in range(n)]
-        self.table_matrix.setHorizontalHeaderLabels(headers)
-        self.table_matrix.setVerticalHeaderLabels(headers)
-        
-        # Inicializar con ceros
-        for i in range(n):
-            for j in range(n):
-                item = QTableWidgetItem("0")
-                item.setTextAlignment(Qt.AlignCenter)
-                self.table_matrix.setItem(i, j, item)
+        """Actualiza el tamaño de la tabla según el número de nodos (en ceros)"""
+        self.matrix_model.redimensionar(self.spin_nodes.value())
                 
     def generate_random_graph(self):
         """Genera un grafo aleatorio (no completamente conectado)"""
-        import random
         n = self.spin_nodes.value()
         
-        # Generar matriz con probabilidad de conexión del 40%
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    self.table_matrix.item(i, j).setText("0")
-                elif i < j:
-                    # 40% de probabilidad de conexión
-                    if random.random() < 0.4:
-                        peso = random.randint(1, 15)
-                        self.table_matrix.item(i, j).setText(str(peso))
-                        self.table_matrix.item(j, i).setText(str(peso))
-                    else:
-                        self.table_matrix.item(i, j).setText("0")
-                        self.table_matrix.item(j, i).setText("0")
+        # 40% de conectividad; en grafos grandes, unas 6 aristas por nodo
+        p = min(0.4, 6 / n)
+        self.matrix_model.cargar(generate_erdos_renyi(n, p, max_weight=15))
                         
-        self.text_results.append("Grafo aleatorio generado (40% conectividad)\n")
+        self.text_results.append(f"Grafo aleatorio generado ({p:.0%} conectividad)\n")
         
     def get_matrix_from_table(self):
-        """Obtiene la matriz de adyacencia desde la tabla"""
-        n = self.table_matrix.rowCount()
-        matrix = []
-        
-        for i in range(n):
-            row = []
-            for j in range(n):
-                try:
-                    value = int(self.table_matrix.item(i, j).text())
-                    row.append(value)
-                except:
-                    row.append(0)
-            matrix.append(row)
-            
-        return matrix
+        """
+        Obtiene el grafo de la tabla: una copia del CSRGraph del modelo (las
+        ediciones ya están en él), para que los hilos no vean cambios a medias
+        """
+        return self.matrix_model.grafo.copia()
         
     def draw_graph(self):
         """Dibuja el grafo en la escena"""
         matrix = self.get_matrix_from_table()
         self.graph.load_from_matrix(matrix)
         
+        self.stop_layout()
         self.scene.clear()
-        self.graph.draw(self.scene, self.graphics_view.width(), self.graphics_view.height())
+        width, height = self.graphics_view.width(), self.graphics_view.height()
+        self.graph.draw(self.scene, width, height)
+        
+        # Los nodos parten del círculo y se reordenan por fuerzas en segundo plano
+        self.layout_worker = CalculoDisposicion(matrix, self.graph.positions(), width, height, self)
+        self.layout_worker.posiciones.connect(self.apply_layout)
+        self.layout_worker.terminado.connect(self.layout_done)
+        self.layout_worker.finished.connect(self.layout_finished)
+        self.layout_worker.start()
         
         self.text_results.append("Grafo dibujado correctamente\n")
 
+    def apply_layout(self, positions):
+        """Coloca los nodos en las posiciones publicadas por la disposición"""
+        if self.sender() is self.layout_worker:  # ignora las de un dibujo anterior
+            self.graph.set_positions(positions)
+
+    def layout_done(self, cancelled):
+        if not cancelled and self.sender() is self.layout_worker:
+            self.graphics_view.fit_scene()
+
+    def stop_layout(self):
+        """Detiene la disposición en curso, si la hay"""
+        if self.layout_worker is not None:
+            worker, self.layout_worker = self.layout_worker, None
+            worker.cancelar()
+            if worker.wait(ESPERA_MS):
+                worker.deleteLater()
+            else:
+                worker.finished.connect(worker.deleteLater)
+
+    def layout_finished(self):
+        """Libera el hilo de la disposición al terminar"""
+        if self.sender() is self.layout_worker:
+            self.layout_worker.deleteLater()
+            self.layout_worker = None
+
     def compute_kpaths(self):
-        """Calcula y muestra los K-caminos"""
+        """Calcula los K-caminos en segundo plano, mostrando cada fila al terminarla"""
+        if self.worker is not None:
+            return  # Ya hay un cálculo en curso
         matrix = self.get_matrix_from_table()
         k = int(self.combo_k.currentText())
+        if k > 1 and matrix.num_nodos > MAX_NODOS_K:
+            QMessageBox.warning(self, "Grafo demasiado grande",
+                                f"La matriz con K > 1 se calcula para grafos de hasta "
+                                f"{MAX_NODOS_K} nodos; usa K = 1 para grafos más grandes.")
+            return
+        self.shown_k = k
+
+        self.text_results.clear()
+        self.text_results.append(f"=== MATRIZ DE {self.shown_k}-CAMINOS MÁS CORTOS ===\n")
+
+        # K = 1..K elegido en una sola pasada (k=1 usa el cálculo rápido de
+        # todos los pares). El tensor queda en la caché de KPaths: pasar a un
+        # K menor sobre el mismo grafo no recalcula
+        ks = range(1, self.shown_k + 1)
+        self.worker = CalculoKPaths(self.kpaths, matrix, ks, self)
+        self.worker.fila_calculada.connect(self.show_result_row)
+        self.worker.progreso.connect(self.update_progress)
+        self.worker.terminado.connect(self.compute_done)
+        self.worker.error.connect(self.compute_error)
+        self.worker.finished.connect(self.compute_finished)
+        self.progress_bar.setValue(0)
+        self.btn_compute.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.worker.start()
+
+    def show_result_row(self, i, row):
+        """Muestra la fila i de la matriz resultado (columna del K elegido)"""
+        row_str = " ".join([
+            f"{val:6.1f}" if val != float('inf') else "   ∞  "
+            for val in row[:, self.shown_k - 1]
+        ])
+        self.text_results.append(f"Nodo {i}: [{row_str}]")
 
-        try:
-            result_matrix = self.kpaths.compute(matrix, k)
+    def update_progress(self, done, total):
+        """Actualiza la barra de progreso"""
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
 
-            self.text_results.clear()
-            self.text_results.append(f"=== MATRIZ DE {k}-CAMINOS MÁS CORTOS ===\n")
+    def cancel_compute(self):
+        """Pide cancelar el cálculo en curso"""
+        if self.worker is not None:
+            self.btn_cancel.setEnabled(False)
+            self.worker.cancelar()
 
-            # Mostrar matriz resultado
-            n = len(result_matrix)
-            for i in range(n):
-                row_str = " ".join([
-                    f"{val:6.1f}" if val != float('inf') else "   ∞  "
-                    for val in result_matrix[i]
-                ])
-                self.text_results.append(f"Nodo {i}: [{row_str}]")
+    def compute_done(self, cancelled):
+        """Informa el final del cálculo"""
+        if cancelled:
+            self.text_results.append("\nCálculo cancelado")
+        else:
+            self.text_results.append(f"\nCálculo completado para K={self.shown_k}")
 
-            self.text_results.append(f"\nCálculo completado para K={k}")
+    def compute_error(self, message):
+        QMessageBox.warning(self, "Error", f"Error al calcular K-Paths: {message}")
 
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error al calcular K-Paths: {str(e)}")
+    def compute_finished(self):
+        """Libera el hilo y reactiva los controles"""
+        self.worker.deleteLater()
+        self.worker = None
+        self.btn_compute.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
 
+    def closeEvent(self, event):
+        """Detiene el cálculo en curso antes de cerrar la ventana"""
+        if self.worker is not None:
+            self.worker.cancelar()
+            if not self.worker.wait(ESPERA_MS):
+                # El par en curso aún no termina: la ventana se cierra cuando
+                # el hilo se detenga, sin bloquear la interfaz mientras tanto
+                self.hide()
+                self.worker.finished.connect(self.close)
+                event.ignore()
+                return
+        self.stop_layout()
+        super().closeEvent(event)
@@ -0,0 +1,129 @@
+"""
+Cálculos en segundo plano (matriz de k-caminos y disposición del grafo)
+Evitan que la ventana se congele mientras trabajan
+"""
+
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from algorithms.layout import DisposicionFuerzas
+
+# Máximo que la ventana espera (en ms) a que un hilo cancelado se detenga;
+# si no lo hace, se termina de cerrar cuando el hilo emita finished
+ESPERA_MS = 1000
+
+# Tamaño máximo de grafo para calcular la matriz con k > 1 desde la interfaz.
+# Yen para todos los pares crece aprox. con n³: con k=3 y grado medio 3-8,
+# scripts/benchmark.py mide 4-9 s con 100 nodos y 43-68 s con 200 (grafos
+# aleatorios), así que 1000 nodos llevarían horas y quedan fuera de alcance.
+# Los grafos más grandes se pueden dibujar y editar y admiten k=1, que usa el
+# cálculo rápido de todos los pares; para k > 1 sobre pares concretos está
+# KPaths.consultar_lote
+MAX_NODOS_K = 200
+
+
+class CalculoKPaths(QThread):
+    """
+    Hilo que calcula la matriz de k-caminos fila por fila
+
+    Señales:
+        fila_calculada(i, fila): Fila i terminada (lista de costos, o arreglo
+            (n, K) si se pidieron varios valores de k)
+        progreso(hechas, total): Filas terminadas hasta ahora
+        terminado(cancelado): Fin del cálculo (True si se canceló)
+        error(mensaje): El cálculo falló
+    """
+
+    fila_calculada = pyqtSignal(int, object)
+    progreso = pyqtSignal(int, int)
+    terminado = pyqtSignal(bool)
+    error = pyqtSignal(str)
+
+    def __init__(self, kpaths, matriz, k, parent=None):
+        """
+        Args:
+            kpaths: Instancia de KPaths (no debe usarse en otro hilo mientras
+                el cálculo esté en curso)
+            matriz: Matriz de adyacencia o CSRGraph
+            k: Posición del camino cuyo costo se calcula, o secuencia de
+                posiciones para calcularlas todas en una pasada (ver
+                KPaths.compute_tensor)
+        """
+        super().__init__(parent)
+        self.kpaths = kpaths
+        self.matriz = matriz
+        self.k = k
+
+    def cancelar(self):
+        """Pide detener el cálculo; se detiene antes del siguiente par de nodos"""
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            total = len(self.matriz)
+            self.progreso.emit(0, total)
+            # iter_filas consulta la cancelación en cada par, no solo entre filas
+            filas = self.kpaths.iter_filas(self.matriz, self.k,
+                                           cancelado=self.isInterruptionRequested)
+            hechas = 0
+            for i, fila in filas:
+                if self.isInterruptionRequested():
+                    filas.close()
+                    break
+                self.fila_calculada.emit(i, fila)
+                hechas += 1
+                self.progreso.emit(hechas, total)
+            self.terminado.emit(hechas < total)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class CalculoDisposicion(QThread):
+    """
+    Hilo que avanza una disposición por fuerzas y publica las posiciones
+    intermedias, de modo que el grafo se va ordenando en pantalla
+
+    Señales:
+        posiciones(arreglo): Posiciones actuales (copia de forma (n, 2)),
+            centradas en el mismo punto que las iniciales
+        terminado(cancelado): Fin de la disposición (True si se canceló)
+    """
+
+    posiciones = pyqtSignal(object)
+    terminado = pyqtSignal(bool)
+
+    INTERVALO = 0.05  # segundos mínimos entre publicaciones
+
+    def __init__(self, matriz, posiciones, ancho=None, alto=None, parent=None):
+        """
+        Args:
+            matriz: Matriz de adyacencia o CSRGraph
+            posiciones: Arreglo (n, 2) con las posiciones de partida
+            ancho, alto: Área mínima para la disposición (p. ej. la de la vista)
+        """
+        super().__init__(parent)
+        self.disposicion = DisposicionFuerzas(matriz, posiciones, ancho, alto)
+        self.centro = self.disposicion.posiciones.mean(axis=0) if len(posiciones) else None
+
+    def cancelar(self):
+        """Pide detener la disposición; se detiene al terminar la iteración en curso"""
+        self.requestInterruption()
+
+    def _publicar(self):
+        actuales = self.disposicion.posiciones
+        self.posiciones.emit(actuales - actuales.mean(axis=0) + self.centro)
+
+    def run(self):
+        ultima = time.perf_counter()
+        while not self.disposicion.terminado:
+            if self.isInterruptionRequested():
+                self.terminado.emit(True)
+                return
+            self.disposicion.paso()
+            if time.perf_counter() - ultima >= self.INTERVALO:
+                self._publicar()
+                ultima = time.perf_counter()
+        if self.centro is not None:
+            self._publicar()
+        self.terminado.emit(False)